@@ -0,0 +1 @@
+"""ChouseisanClient のオフラインベンチマーク"""
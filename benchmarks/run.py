@@ -0,0 +1,339 @@
+"""
+ChouseisanClient のオフラインベンチマーク。
+
+ローカルのスタンドインサーバー (``benchmarks.standin``) に対して操作を繰り返し実行し、
+同時実行数とイベントの規模 (日程数 × 回答者数) ごとにレイテンシ (p50/p95/p99)、
+スループット、サーバー側のフェーズ (ルート) ごとの処理時間と、クライアント側のフェーズ
+(``client.metrics`` が記録するページ遷移・解析・送信・待機キューなど) ごとの処理時間を計測します。
+外部ネットワークには接続しません。
+
+使い方:
+    PYTHONPATH=src python -m benchmarks.run --concurrency 1,4,16 --sizes 5x10,30x200 \\
+        --requests 50 --latency-ms 20 --output results.json
+
+    # 以前の結果と比較する
+    PYTHONPATH=src python -m benchmarks.run --output new.json --compare results.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from chouseisan.client import ChouseisanClient
+from chouseisan.metrics import CallRecord
+
+from .standin import StandinServer
+
+SCHEMA_VERSION = 1
+OPERATIONS = ("create_event", "get_event_info", "get_responses", "add_response")
+DEFAULT_OPERATIONS = ("create_event", "get_event_info", "add_response")
+
+logger = logging.getLogger("chouseisan-bench")
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """線形補間による百分位数 (q は 0〜100)。サンプルが空の場合は 0 を返します。"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    pos = (len(ordered) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def summarize_ms(samples: Sequence[float]) -> Dict[str, float]:
+    """秒単位のサンプルをミリ秒の要約統計に変換します。"""
+    if not samples:
+        return {"min": 0.0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "min": round(min(samples) * 1000, 3),
+        "mean": round(sum(samples) / len(samples) * 1000, 3),
+        "p50": round(percentile(samples, 50) * 1000, 3),
+        "p95": round(percentile(samples, 95) * 1000, 3),
+        "p99": round(percentile(samples, 99) * 1000, 3),
+        "max": round(max(samples) * 1000, 3),
+    }
+
+
+def parse_sizes(value: str) -> List[Tuple[int, int]]:
+    """"5x10,30x200" 形式の規模指定を (日程数, 回答者数) のリストに変換します。"""
+    sizes = []
+    for part in value.split(","):
+        dates, _, respondents = part.strip().lower().partition("x")
+        sizes.append((int(dates), int(respondents or 0)))
+    return sizes
+
+
+def _operation_factory(
+    client: ChouseisanClient,
+    operation: str,
+    event_url: str,
+    n_dates: int,
+    concurrency: int
+) -> Callable[[int], Awaitable[Any]]:
+    dates_text = "\n".join(f"{1 + i // 28}/{1 + i % 28}(日) 15:00-" for i in range(n_dates))
+    availability = [i % 3 for i in range(n_dates)]
+
+    if operation == "create_event":
+        return lambda i: client.create_event(f"ベンチマーク {i}", "", dates_text)
+    if operation == "get_event_info":
+        return lambda i: client.get_event_info(event_url)
+    if operation == "get_responses":
+        return lambda i: client.get_responses(event_url)
+    if operation == "add_response":
+        # 同じ名前の回答は上書きされるため、計測中も出欠表の規模はほぼ一定に保たれる
+        return lambda i: client.add_response(event_url, f"bench-{i % concurrency}", "", availability)
+    raise ValueError(f"未対応の操作です: {operation}")
+
+
+async def _run_level(call: Callable[[int], Awaitable[Any]], requests: int, concurrency: int) -> Tuple[List[float], int, float]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                await call(i)
+            except Exception as e:
+                errors += 1
+                logger.debug(f"Request {i} failed: {e}")
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    return latencies, errors, time.perf_counter() - started
+
+
+class PhaseRecorder:
+    """クライアントの各操作で計測されたフェーズごとの所要時間を集める"""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+
+    def __call__(self, record: CallRecord) -> None:
+        for name, seconds, _ in record.phases:
+            self.samples.setdefault(name, []).append(seconds)
+
+    def reset(self) -> None:
+        self.samples = {}
+
+
+def summarize_phases(samples: Dict[str, List[float]], requests: int) -> Tuple[Dict[str, Any], float]:
+    """フェーズごとのサンプル (秒) を、件数・1 リクエストあたりの回数・平均と百分位数 (ミリ秒) に要約します。"""
+    phases: Dict[str, Any] = {}
+    total = 0.0
+    for phase, values in sorted(samples.items()):
+        phase_total = sum(values)
+        total += phase_total
+        phases[phase] = {
+            "count": len(values),
+            "per_request": round(len(values) / requests, 3) if requests else 0.0,
+            "mean_ms": round(phase_total / len(values) * 1000, 3),
+            "p50_ms": round(percentile(values, 50) * 1000, 3),
+            "p95_ms": round(percentile(values, 95) * 1000, 3),
+            "p99_ms": round(percentile(values, 99) * 1000, 3),
+        }
+    return phases, total
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    with StandinServer(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000) as server:
+        client = ChouseisanClient(
+            base_url=server.base_url,
+            pool_size=max(args.concurrency),
+            read_mode=args.read_mode,
+            write_mode=args.write_mode,
+            cache_ttl=args.cache_ttl,
+        )
+        recorder = PhaseRecorder()
+        client.metrics.add_listener(recorder)
+        try:
+            for n_dates, n_respondents in args.sizes:
+                event_url = server.seed_event(n_dates, n_respondents)
+                for operation in args.operations:
+                    for concurrency in args.concurrency:
+                        call = _operation_factory(client, operation, event_url, n_dates, concurrency)
+                        if args.warmup:
+                            await _run_level(call, args.warmup, concurrency)
+                        server.phases.reset()
+                        recorder.reset()
+                        latencies, errors, wall = await _run_level(call, args.requests, concurrency)
+                        phases, server_total = summarize_phases(server.phase_stats(), args.requests)
+                        client_phases, _ = summarize_phases(recorder.samples, args.requests)
+                        latency_ms = summarize_ms(latencies)
+                        result = {
+                            "operation": operation,
+                            "concurrency": concurrency,
+                            "dates": n_dates,
+                            "respondents": n_respondents,
+                            "requests": args.requests,
+                            "errors": errors,
+                            "wall_seconds": round(wall, 4),
+                            "throughput_rps": round(len(latencies) / wall, 3) if wall > 0 else 0.0,
+                            "latency_ms": latency_ms,
+                            "server_phases": phases,
+                            # クライアント側のフェーズ (goto/parse/submit/queue_wait など) の内訳
+                            "client_phases": client_phases,
+                            # 1 リクエストあたりの (クライアント側の処理 + 通信) の時間
+                            "client_overhead_ms": round(
+                                latency_ms["mean"] - server_total / args.requests * 1000, 3
+                            ) if args.requests else 0.0,
+                        }
+                        results.append(result)
+                        _print_row(result)
+        finally:
+            await client.close()
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "started_at": args.started_at,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "revision": _git_revision(),
+            "config": {
+                "concurrency": args.concurrency,
+                "sizes": [f"{d}x{r}" for d, r in args.sizes],
+                "operations": list(args.operations),
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "read_mode": args.read_mode,
+                "write_mode": args.write_mode,
+                "cache_ttl": args.cache_ttl,
+            },
+        },
+        "results": results,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, check=True
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _print_row(result: Dict[str, Any]) -> None:
+    lat = result["latency_ms"]
+    phases = " ".join(f"{name}={p['mean_ms']:.1f}" for name, p in result["server_phases"].items())
+    client_phases = " ".join(
+        f"{name}={p['p50_ms']:.1f}/{p['p95_ms']:.1f}" for name, p in result["client_phases"].items()
+    )
+    print(
+        f"{result['operation']:<15} c={result['concurrency']:<3} "
+        f"{result['dates']}x{result['respondents']:<6} "
+        f"p50={lat['p50']:8.2f}ms p95={lat['p95']:8.2f}ms p99={lat['p99']:8.2f}ms "
+        f"{result['throughput_rps']:8.2f} req/s err={result['errors']} | server: {phases} "
+        f"| client p50/p95: {client_phases}",
+        file=sys.stderr
+    )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    同じ (操作, 同時実行数, 規模) の結果同士を比較し、変化率 (%) を返します。
+
+    正の値はレイテンシの悪化またはスループットの向上を表します。
+    """
+    def key(r: Dict[str, Any]) -> Tuple[Any, ...]:
+        return r["operation"], r["concurrency"], r["dates"], r["respondents"]
+
+    def change(new: float, old: float) -> Optional[float]:
+        return round((new - old) / old * 100, 1) if old else None
+
+    base = {key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for r in current["results"]:
+        old = base.get(key(r))
+        if old is None:
+            continue
+        rows.append({
+            "operation": r["operation"],
+            "concurrency": r["concurrency"],
+            "dates": r["dates"],
+            "respondents": r["respondents"],
+            **{f"{q}_change": change(r["latency_ms"][q], old["latency_ms"][q]) for q in ("p50", "p95", "p99")},
+            "throughput_change": change(r["throughput_rps"], old["throughput_rps"]),
+        })
+    return rows
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ChouseisanClient offline benchmark")
+    parser.add_argument("--concurrency", default="1,4,16",
+                        help="同時実行数 (カンマ区切り)")
+    parser.add_argument("--sizes", default="5x10,30x200",
+                        help="イベントの規模 (日程数x回答者数, カンマ区切り)")
+    parser.add_argument("--operations", default=",".join(DEFAULT_OPERATIONS),
+                        help=f"計測する操作 (カンマ区切り。{', '.join(OPERATIONS)})")
+    parser.add_argument("--requests", type=int, default=50,
+                        help="同時実行数・規模ごとのリクエスト数")
+    parser.add_argument("--warmup", type=int, default=3,
+                        help="計測前に実行するリクエスト数")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="サーバー応答ごとに加える遅延 (ミリ秒)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0,
+                        help="遅延に加える一様乱数の幅 (ミリ秒)")
+    parser.add_argument("--read-mode", choices=ChouseisanClient.READ_MODES, default="http")
+    parser.add_argument("--write-mode", choices=ChouseisanClient.WRITE_MODES, default="http")
+    parser.add_argument("--cache-ttl", type=float, default=0.0,
+                        help="イベント情報キャッシュの TTL (秒)。既定では無効化して毎回取得します")
+    parser.add_argument("--output", help="結果の JSON を書き出すファイル (省略時は標準出力)")
+    parser.add_argument("--compare", help="比較対象とする以前の結果 JSON")
+    args = parser.parse_args(argv)
+
+    args.concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    args.sizes = parse_sizes(args.sizes)
+    args.operations = [o.strip() for o in args.operations.split(",") if o.strip()]
+    unknown = set(args.operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"未対応の操作です: {', '.join(sorted(unknown))}")
+    args.started_at = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    args = _parse_args(argv)
+    report = asyncio.run(run_benchmark(args))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f))
+        for row in report["comparison"]:
+            print(
+                f"{row['operation']:<15} c={row['concurrency']:<3} {row['dates']}x{row['respondents']:<6} "
+                f"p50 {row['p50_change']}% p95 {row['p95_change']}% p99 {row['p99_change']}% "
+                f"throughput {row['throughput_change']}%",
+                file=sys.stderr
+            )
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""
+ベンチマーク用の調整さんスタンドインサーバー。
+
+調整さんのトップページ (作成フォーム)・作成完了ページ・イベントページ (出欠表と出欠フォーム) と
+フォームの送信先を、実サイトと同じ HTML 構造でローカルに提供します。
+外部ネットワークには一切接続せず、応答ごとに人工的な遅延を加えることができます。
+
+各リクエストの処理時間はルート (フェーズ) ごとに記録され、``phase_stats`` で取得できます。
+"""
+import hashlib
+import html
+import itertools
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# 出欠フォームのボタン値 (1: ○, 2: △, 3: ×) と出欠表の記号
+_VALUE_MARKS = {"1": "○", "2": "△", "3": "×"}
+_MARKS = ("○", "△", "×")
+
+_STYLESHEET = b"body { font-family: sans-serif; }\n"
+
+# ブラウザ経由の操作で使うボタンの動作 (出欠フォームの表示・出欠ボタン・保存ボタン)
+_PAGE_SCRIPT = """
+document.addEventListener('click', (ev) => {
+  const el = ev.target;
+  if (el.id === 'add_btn') {
+    document.getElementById('member-form').style.display = '';
+  } else if (el.matches && el.matches('.oax-buttons button')) {
+    el.parentElement.querySelector('input[type=hidden]').value = el.dataset.value;
+  } else if (el.id === 'memUpdBtn') {
+    document.getElementById('member-form').submit();
+  }
+});
+"""
+
+
+class Event:
+    """スタンドインサーバー上のイベント"""
+
+    def __init__(self, key: str, title: str, memo: str, dates: List[str]):
+        self.key = key
+        self.title = title
+        self.memo = memo
+        self.dates = dates
+        # 名前 -> (コメント, 日程ごとの記号)
+        self.respondents: Dict[str, Tuple[str, List[str]]] = {}
+
+
+def render_top_page(token: str) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="ja">
+<head>
+  <meta charset="utf-8">
+  <meta name="csrf-token" content="{token}">
+  <title>調整さん - 出欠表を作成</title>
+</head>
+<body>
+  <form id="newEventForm" action="/schedule/newEvent/create" method="post">
+    <input type="hidden" name="_token" value="{token}">
+    <input type="text" name="name" placeholder="例：送別会">
+    <textarea name="comment"></textarea>
+    <textarea name="kouho"></textarea>
+    <select name="timezone"><option value="Asia/Tokyo" selected>東京</option></select>
+    <button type="submit" id="createBtn">出欠表をつくる</button>
+  </form>
+</body>
+</html>
+"""
+
+
+def render_complete_page(event_url: str) -> str:
+    return f"""<!DOCTYPE html>
+<html lang="ja">
+<head><meta charset="utf-8"><title>出欠表を作成しました | 調整さん</title></head>
+<body>
+  <p>出欠表を作成しました。</p>
+  <input type="text" class="new-event-url-input" value="{html.escape(event_url)}" readonly>
+  <a href="{html.escape(event_url)}">出欠表を見る</a>
+</body>
+</html>
+"""
+
+
+def render_event_page(event: Event, token: str) -> str:
+    esc = html.escape
+    parts = [f"""<!DOCTYPE html>
+<html lang="ja">
+<head>
+  <meta charset="utf-8">
+  <meta name="csrf-token" content="{token}">
+  <title>{esc(event.title)} | 調整さん</title>
+  <link rel="stylesheet" href="/css/style.css">
+</head>
+<body>
+  <div class="container">
+    <h1 class="event-title">{esc(event.title)}</h1>
+    <p class="event-memo">{esc(event.memo)}</p>
+    <table id="nittei" class="table">
+      <tr><th>日程</th><th>○</th><th>△</th><th>×</th></tr>
+"""]
+    marks_by_date = list(zip(*(marks for _, marks in event.respondents.values()))) or [()] * len(event.dates)
+    for date, column in zip(event.dates, marks_by_date):
+        counts = "".join(f"<td>{column.count(m)}</td>" for m in _MARKS)
+        parts.append(f"      <tr><td>{esc(date)}</td>{counts}</tr>\n")
+    parts.append("""    </table>
+    <table id="attendance-table" class="table">
+      <thead>
+        <tr>
+          <th class="valign-middle">名前</th>
+          <th class="valign-middle">コメント</th>
+""")
+    for date in event.dates:
+        parts.append(f'          <th class="valign-middle">{esc(date)}</th>\n')
+    parts.append("        </tr>\n      </thead>\n      <tbody>\n")
+    for name, (comment, marks) in event.respondents.items():
+        cells = "".join(f"<td>{m}</td>" for m in marks)
+        parts.append(f'        <tr><td><a href="#">{esc(name)}</a></td><td>{esc(comment)}</td>{cells}</tr>\n')
+    parts.append(f"""      </tbody>
+    </table>
+    <button id="add_btn" type="button">出欠を入力する</button>
+    <form id="member-form" action="/schedule/memberUpdate" method="post" style="display: none">
+      <input type="hidden" name="h" value="{event.key}">
+      <input type="hidden" name="_token" value="{token}">
+      <input type="text" name="name" value="">
+      <input type="text" name="hitokoto" value="">
+""")
+    for i in range(len(event.dates)):
+        parts.append(f"""      <div class="oax-buttons">
+        <input type="hidden" name="kouho{i + 1}" value="">
+        <button type="button" class="oax-0" data-value="1">○</button>
+        <button type="button" class="oax-1" data-value="2">△</button>
+        <button type="button" class="oax-2" data-value="3">×</button>
+      </div>
+""")
+    parts.append(f"""      <input type="button" id="memUpdBtn" value="入力する">
+    </form>
+  </div>
+  <script>{_PAGE_SCRIPT}</script>
+</body>
+</html>
+""")
+    return "".join(parts)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # 期限切れ等でクライアントが先に切断した場合は想定内のため出力しない
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class _PhaseRecorder:
+    """ルートごとの処理時間 (秒) をスレッドセーフに記録する"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(phase, []).append(seconds)
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        with self._lock:
+            return {k: list(v) for k, v in self._samples.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+class StandinServer:
+    """
+    調整さんのスタンドインサーバー。
+
+    ``with StandinServer(latency=0.02) as server:`` のように使用し、
+    ``server.base_url`` を ChouseisanClient の ``base_url`` に指定します。
+
+    Args:
+        latency: 各応答に加える人工的な遅延 (秒)
+        jitter: 遅延に加える一様乱数の幅 (秒)
+        host: 待機するアドレス
+        port: 待機ポート (0 の場合は空いているポートを自動で選択)
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.events: Dict[str, Event] = {}
+        self.phases = _PhaseRecorder()
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+        self._random = random.Random(0)
+        self._httpd = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def event_url(self, key: str) -> str:
+        return f"{self.base_url}/s?h={key}"
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="chouseisan-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def create_event(self, title: str, memo: str = "", dates: Optional[List[str]] = None) -> Event:
+        with self._lock:
+            n = next(self._counter)
+            key = hashlib.sha1(f"{n}:{title}".encode("utf-8")).hexdigest()[:32]
+            event = Event(key, title, memo, list(dates or []))
+            self.events[key] = event
+        return event
+
+    def seed_event(self, n_dates: int, n_respondents: int, title: str = "ベンチマーク") -> str:
+        """
+        日程数 × 回答者数を指定したイベントを作成し、その URL を返します。
+
+        出欠は乱数 (固定シード) で埋めるため、同じ引数からは同じ出欠表が生成されます。
+        """
+        rng = random.Random(n_dates * 100003 + n_respondents)
+        dates = [f"{1 + i // 28}/{1 + i % 28}(土) 19:00-" for i in range(n_dates)]
+        event = self.create_event(f"{title} {n_dates}x{n_respondents}", "", dates)
+        for r in range(n_respondents):
+            event.respondents[f"回答者{r + 1}"] = ("", [rng.choice(_MARKS) for _ in dates])
+        return self.event_url(event.key)
+
+    def phase_stats(self) -> Dict[str, List[float]]:
+        """ルート (フェーズ) ごとの処理時間 (秒) のサンプルを返します。"""
+        return self.phases.snapshot()
+
+    def _delay(self) -> None:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(_Handler):
+            standin = server
+
+        return Handler
+
+
+class _Handler(BaseHTTPRequestHandler):
+    standin: StandinServer
+    protocol_version = "HTTP/1.1"
+    # ヘッダーと本文を別々に書き込むため、Nagle による遅延を計測に含めない
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        form: Dict[str, str] = {}
+        if method == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8")
+            form = {k: v[-1] for k, v in parse_qs(body, keep_blank_values=True).items()}
+
+        route = {
+            ("GET", "/"): ("top", self._top),
+            ("POST", "/schedule/newEvent/create"): ("create", self._create),
+            ("GET", "/schedule/newEvent/complete"): ("complete", self._complete),
+            ("GET", "/s"): ("event", self._event),
+            ("POST", "/schedule/memberUpdate"): ("member_update", self._member_update),
+            ("GET", "/css/style.css"): ("asset", self._stylesheet),
+        }.get((method, url.path))
+
+        if route is None:
+            phase = "not_found"
+            self._send(404, "text/plain; charset=utf-8", b"not found")
+        else:
+            phase, handler = route
+            self.standin._delay()
+            handler(query, form)
+        self.standin.phases.record(phase, time.perf_counter() - started)
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_html(self, markup: str) -> None:
+        self._send(200, "text/html; charset=utf-8", markup.encode("utf-8"))
+
+    def _redirect(self, location: str) -> None:
+        self._send(302, "text/html; charset=utf-8", b"", {"Location": location})
+
+    def _top(self, query: Dict[str, str], form: Dict[str, str]) -> None:
+        self._send_html(render_top_page("standin-token"))
+
+    def _create(self, query: Dict[str, str], form: Dict[str, str]) -> None:
+        title = form.get("name", "").strip()
+        if not title:
+            self._send(422, "text/plain; charset=utf-8", "イベント名は必須です".encode("utf-8"))
+            return
+        dates = [d.strip() for d in form.get("kouho", "").splitlines() if d.strip()]
+        event = self.standin.create_event(title, form.get("comment", ""), dates)
+        self._redirect(f"/schedule/newEvent/complete?h={event.key}")
+
+    def _complete(self, query: Dict[str, str], form: Dict[str, str]) -> None:
+        event = self.standin.events.get(query.get("h", ""))
+        if event is None:
+            self._send(404, "text/plain; charset=utf-8", b"not found")
+            return
+        self._send_html(render_complete_page(self.standin.event_url(event.key)))
+
+    def _event(self, query: Dict[str, str], form: Dict[str, str]) -> None:
+        event = self.standin.events.get(query.get("h", ""))
+        if event is None:
+            self._send(404, "text/plain; charset=utf-8", b"not found")
+            return
+        with self.standin._lock:
+            markup = render_event_page(event, "standin-token")
+        self._send_html(markup)
+
+    def _member_update(self, query: Dict[str, str], form: Dict[str, str]) -> None:
+        event = self.standin.events.get(form.get("h", ""))
+        name = form.get("name", "").strip()
+        if event is None or not name:
+            self._send(422, "text/plain; charset=utf-8", b"invalid form")
+            return
+        marks = [_VALUE_MARKS.get(form.get(f"kouho{i + 1}", ""), "×") for i in range(len(event.dates))]
+        with self.standin._lock:
+            event.respondents[name] = (form.get("hitokoto", ""), marks)
+        self._redirect(f"/s?h={event.key}")
+
+    def _stylesheet(self, query: Dict[str, str], form: Dict[str, str]) -> None:
+        self._send(200, "text/css", _STYLESHEET)
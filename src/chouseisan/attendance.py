@@ -0,0 +1,276 @@
+import html
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .parser import extract_event_info, parse_html
+
+# parse_availability_status と同じ出欠の数値表現 (2: ○, 1: △, 0: ×) に未回答を加えたもの
+OK = 2
+MAYBE = 1
+NG = 0
+NO_ANSWER = 3
+
+_MARK_TEXT = {
+    "○": OK, "◯": OK, "〇": OK,
+    "△": MAYBE,
+    "×": NG, "✕": NG, "✖": NG,
+}
+
+# 出欠ボタン・アイコンのクラス (oax-0: ○, oax-1: △, oax-2: ×)
+_MARK_CLASSES = {"oax-0": OK, "oax-1": MAYBE, "oax-2": NG}
+
+_SYMBOLS = {OK: "○", MAYBE: "△", NG: "×", NO_ANSWER: "-"}
+
+
+class AttendanceMatrix:
+    """
+    出欠表 (回答者 × 日程) を 1 バイト/セルで保持する行列。
+
+    セルは日程ごとの列優先で 1 つの bytearray に格納するため、
+    日程ごとの集計は列スライスに対する ``count`` (C 実装) だけで完了します。
+    """
+    __slots__ = ("title", "url", "dates", "respondents", "comments", "_cells")
+
+    def __init__(
+        self,
+        dates: Sequence[str],
+        respondents: Sequence[str],
+        comments: Sequence[str],
+        cells: bytearray,
+        title: str = "",
+        url: str = ""
+    ):
+        if len(cells) != len(dates) * len(respondents):
+            raise ValueError("セル数が日程数 × 回答者数と一致しません。")
+        self.title = title
+        self.url = url
+        self.dates = list(dates)
+        self.respondents = list(respondents)
+        self.comments = list(comments)
+        self._cells = cells
+
+    @classmethod
+    def from_rows(
+        cls,
+        dates: Sequence[str],
+        rows: Sequence[Tuple[str, str, Sequence[int]]],
+        title: str = "",
+        url: str = ""
+    ) -> "AttendanceMatrix":
+        """
+        回答者ごとの行 (名前, コメント, 出欠リスト) から行列を生成します。
+
+        出欠リストが日程数より短い場合、不足分は未回答として扱います。
+        """
+        n_rows = len(rows)
+        cells = bytearray([NO_ANSWER]) * (len(dates) * n_rows)
+        for i, (_, _, statuses) in enumerate(rows):
+            for j, status in enumerate(statuses[:len(dates)]):
+                cells[j * n_rows + i] = status
+        return cls(dates, [r[0] for r in rows], [r[1] for r in rows], cells, title=title, url=url)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(回答者数, 日程数)"""
+        return len(self.respondents), len(self.dates)
+
+    def status(self, respondent: int, date: int) -> int:
+        return self._cells[date * len(self.respondents) + respondent]
+
+    def column(self, date: int) -> bytes:
+        """日程 1 つ分の全回答者の出欠"""
+        n = len(self.respondents)
+        return bytes(self._cells[date * n:(date + 1) * n])
+
+    def row(self, respondent: int) -> List[int]:
+        """回答者 1 人分の全日程の出欠"""
+        return list(self._cells[respondent::len(self.respondents)]) if self.respondents else []
+
+    def totals(self) -> List[Dict[str, Any]]:
+        """
+        日程ごとの ○/△/×/未回答 の人数を返します。
+
+        Returns:
+            List[Dict[str, Any]]: 日程順の集計 (index, date, ok, maybe, ng, no_answer)
+        """
+        result = []
+        for j, date in enumerate(self.dates):
+            col = self.column(j)
+            result.append({
+                "index": j,
+                "date": date,
+                "ok": col.count(OK),
+                "maybe": col.count(MAYBE),
+                "ng": col.count(NG),
+                "no_answer": col.count(NO_ANSWER),
+            })
+        return result
+
+    def rank_dates(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        候補日程を参加しやすい順に並べます。
+
+        ○ の人数が多い順、同数の場合は △ が多い順、× が少ない順、日程順で並べます。
+
+        Args:
+            top: 上位何件を返すか (None の場合はすべて)
+        """
+        ranked = sorted(self.totals(), key=lambda t: (-t["ok"], -t["maybe"], t["ng"], t["index"]))
+        return ranked if top is None else ranked[:top]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON などに変換しやすい辞書形式を返します。"""
+        return {
+            "title": self.title,
+            "url": self.url,
+            "dates": list(self.dates),
+            "respondents": [
+                {"name": name, "comment": comment, "availability": self.row(i)}
+                for i, (name, comment) in enumerate(zip(self.respondents, self.comments))
+            ],
+        }
+
+    def format_table(self) -> str:
+        """回答者ごとに ○/△/× を並べたテキスト表を返します。"""
+        lines = []
+        for i, (name, comment) in enumerate(zip(self.respondents, self.comments)):
+            marks = " ".join(_SYMBOLS[s] for s in self.row(i))
+            line = f"  - {name}: {marks}"
+            if comment:
+                line += f" ({comment})"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def __len__(self) -> int:
+        return len(self.respondents)
+
+    def __repr__(self) -> str:
+        return f"<AttendanceMatrix respondents={len(self.respondents)} dates={len(self.dates)}>"
+
+
+_TABLE_START_RE = re.compile(r"""<table\b[^>]*\bid\s*=\s*["']?attendance-table["'\s>]""", re.IGNORECASE)
+_TABLE_END_RE = re.compile(r"</table\s*>", re.IGNORECASE)
+_ROW_RE = re.compile(r"<tr\b[^>]*>", re.IGNORECASE)
+_CELL_RE = re.compile(
+    r"<(td|th)\b([^>]*)>(.*?)(?:</t[dh]\s*>)?\s*(?=<(?:td|th)\b|</tr|</thead|</tbody|</tfoot|</table|$)",
+    re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(r"<[^>]*>")
+_ALT_RE = re.compile(r"""\balt\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+_CLASS_RE = re.compile(r"""\bclass\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _cell_text(inner: str) -> str:
+    if "<" not in inner and "&" not in inner:
+        stripped = inner.strip()
+        if " " not in stripped and "\n" not in stripped:
+            return stripped
+    if "<" in inner:
+        inner = _TAG_RE.sub(" ", inner)
+    if "&" in inner:
+        inner = html.unescape(inner)
+    return _WHITESPACE_RE.sub(" ", inner).strip()
+
+
+def _cell_status(attrs: str, inner: str, text: str) -> int:
+    status = _MARK_TEXT.get(text)
+    if status is not None:
+        return status
+    for alt in _ALT_RE.findall(inner):
+        status = _MARK_TEXT.get(alt.strip())
+        if status is not None:
+            return status
+    for classes in _CLASS_RE.findall(attrs + " " + inner):
+        for cls in classes.split():
+            status = _MARK_CLASSES.get(cls)
+            if status is not None:
+                return status
+    return NO_ANSWER
+
+
+def extract_attendance(markup: str) -> Optional[AttendanceMatrix]:
+    """
+    ``#attendance-table`` 全体を 1 回の走査で解析し、出欠行列を返します。
+
+    見出し行の 3 列目以降 (「コメント」列を除く) を候補日程、1 列目を回答者名として扱います。
+    回答者数 × 日程数に比例してセル数が増えるため、出欠表の部分は要素ツリーを作らずに
+    正規表現で直接走査し、タイトルはそれ以外の部分を軽量パーサーで解析して取得します。
+
+    Args:
+        markup: イベントページの HTML 文字列
+
+    Returns:
+        Optional[AttendanceMatrix]: 出欠表が見つからない場合は None
+    """
+    start_match = _TABLE_START_RE.search(markup)
+    if start_match is None:
+        return None
+    end_match = _TABLE_END_RE.search(markup, start_match.end())
+    end = end_match.end() if end_match else len(markup)
+    table = markup[start_match.start():end]
+
+    header: List[str] = []
+    date_columns: List[int] = []
+    comment_column: Optional[int] = None
+    rows: List[Tuple[str, str, List[int]]] = []
+
+    for chunk in _ROW_RE.split(table)[1:]:
+        cells = _CELL_RE.findall(chunk)
+        if not cells:
+            continue
+        if not header and all(tag.lower() == "th" for tag, _, _ in cells):
+            header = [_cell_text(inner) for _, _, inner in cells]
+            for i, label in enumerate(header):
+                if label == "コメント":
+                    comment_column = i
+                elif i >= 2 and label:
+                    date_columns.append(i)
+            continue
+        if not header or cells[0][0].lower() != "td":
+            continue
+
+        name = _cell_text(cells[0][2])
+        if not name:
+            continue
+        comment = ""
+        if comment_column is not None and comment_column < len(cells):
+            comment = _cell_text(cells[comment_column][2])
+        statuses = []
+        for c in date_columns:
+            if c < len(cells):
+                _, attrs, inner = cells[c]
+                statuses.append(_cell_status(attrs, inner, _cell_text(inner)))
+            else:
+                statuses.append(NO_ANSWER)
+        rows.append((name, comment, statuses))
+
+    rest = parse_html(markup[:start_match.start()] + markup[end:])
+    title = extract_event_info(rest)["title"]
+    return AttendanceMatrix.from_rows([header[c] for c in date_columns], rows, title=title)
+
+
+def extract_event_info_markup(markup: str) -> Dict[str, Any]:
+    """
+    イベントページの HTML からタイトルと候補日程を抽出します (結果は extract_event_info と同じ)。
+
+    ページの大部分を占める ``#attendance-table`` は回答者の行を読み飛ばし、見出し行だけを残して
+    要素ツリーを作るため、解析にかかる時間は回答者数に比例しません。
+
+    Args:
+        markup: イベントページの HTML 文字列
+
+    Returns:
+        Dict[str, Any]: title と dates を含む辞書
+    """
+    start_match = _TABLE_START_RE.search(markup)
+    if start_match is None:
+        return extract_event_info(parse_html(markup))
+    end_match = _TABLE_END_RE.search(markup, start_match.end())
+    end = end_match.end() if end_match else len(markup)
+    # 候補日程が #nittei にない場合に備えて、出欠表は最初の行 (見出し) まで残す
+    rows = _ROW_RE.finditer(markup, start_match.end(), end)
+    next(rows, None)
+    second_row = next(rows, None)
+    head_end = second_row.start() if second_row is not None else end
+    return extract_event_info(parse_html(markup[:head_end] + "</table>" + markup[end:]))
@@ -0,0 +1,145 @@
+import logging
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Response, Route
+
+logger = logging.getLogger(__name__)
+
+# 自動操作では使用しないため既定で中断するリソース種別
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font", "stylesheet")
+
+# 既定で中断する広告・解析系のドメイン (サブドメインを含む)
+DEFAULT_BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "criteo.com",
+    "criteo.net",
+    "adsrvr.org",
+    "facebook.net",
+    "scorecardresearch.com",
+    "hotjar.com",
+    "clarity.ms",
+    "yads.yahoo.co.jp",
+)
+
+
+def _split_env(name: str) -> Optional[Tuple[str, ...]]:
+    value = os.environ.get(name)
+    if value is None:
+        return None
+    return tuple(v.strip().lower() for v in value.split(",") if v.strip())
+
+
+def _domain_matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class ContextTracker:
+    """貸し出し中の BrowserContext がどの操作に使われているかを保持する"""
+    __slots__ = ("operation",)
+
+    def __init__(self) -> None:
+        self.operation = "idle"
+
+
+class ResourceBlocker:
+    """
+    BrowserContext のリクエストを横取りし、不要なリソースを種別とドメインで中断します。
+
+    メインのドキュメントと許可ドメインへのリクエストは中断しません。
+    中断したリクエスト数と、読み込んだレスポンスの転送量 (Content-Length) を操作ごとに集計します。
+    """
+
+    def __init__(
+        self,
+        blocked_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        blocked_domains: Iterable[str] = DEFAULT_BLOCKED_DOMAINS,
+        allowed_domains: Iterable[str] = ()
+    ):
+        self.blocked_types = frozenset(t.lower() for t in blocked_types)
+        self.blocked_domains = tuple(d.lower() for d in blocked_domains)
+        self.allowed_domains = tuple(d.lower() for d in allowed_domains)
+        self.blocked: "Counter[Tuple[str, str]]" = Counter()
+        self.allowed: "Counter[str]" = Counter()
+        self.bytes_loaded: "Counter[str]" = Counter()
+
+    @classmethod
+    def from_env(cls) -> "ResourceBlocker":
+        """
+        環境変数から設定を読み込みます。
+
+        - BLOCK_RESOURCE_TYPES: 中断するリソース種別 (カンマ区切り。空文字で種別による中断なし)
+        - BLOCK_DOMAINS: 既定の一覧に追加して中断するドメイン (カンマ区切り)
+        - ALLOW_DOMAINS: 種別・ドメインにかかわらず中断しないドメイン (カンマ区切り)
+        """
+        blocked_types = _split_env("BLOCK_RESOURCE_TYPES")
+        extra_domains = _split_env("BLOCK_DOMAINS") or ()
+        allowed_domains = _split_env("ALLOW_DOMAINS") or ()
+        return cls(
+            blocked_types=DEFAULT_BLOCKED_RESOURCE_TYPES if blocked_types is None else blocked_types,
+            blocked_domains=DEFAULT_BLOCKED_DOMAINS + extra_domains,
+            allowed_domains=allowed_domains,
+        )
+
+    def should_block(self, url: str, resource_type: str) -> Optional[str]:
+        """
+        リクエストを中断すべきか判定します。
+
+        Returns:
+            Optional[str]: 中断する場合はその理由 ("type" または "domain")、中断しない場合は None
+        """
+        if resource_type == "document":
+            return None
+        host = (urlsplit(url).hostname or "").lower()
+        if host and _domain_matches(host, self.allowed_domains):
+            return None
+        if resource_type in self.blocked_types:
+            return "type"
+        if host and _domain_matches(host, self.blocked_domains):
+            return "domain"
+        return None
+
+    async def install(self, context: "BrowserContext") -> ContextTracker:
+        """コンテキストにリクエストの横取り処理を登録します。"""
+        tracker = ContextTracker()
+
+        async def handle_route(route: "Route") -> None:
+            request = route.request
+            reason = self.should_block(request.url, request.resource_type)
+            if reason is None:
+                await route.fallback()
+                return
+            self.blocked[(tracker.operation, request.resource_type)] += 1
+            logger.debug(f"Blocked {request.resource_type} ({reason}): {request.url}")
+            await route.abort("blockedbyclient")
+
+        def on_response(response: "Response") -> None:
+            self.allowed[tracker.operation] += 1
+            length = response.headers.get("content-length")
+            if length and length.isdigit():
+                self.bytes_loaded[tracker.operation] += int(length)
+
+        await context.route("**/*", handle_route)
+        context.on("response", on_response)
+        return tracker
+
+    def stats(self) -> Dict[str, Any]:
+        """操作ごとの中断数・読み込み数・転送量を返します。"""
+        blocked: Dict[str, Dict[str, int]] = {}
+        for (operation, resource_type), count in self.blocked.items():
+            blocked.setdefault(operation, {})[resource_type] = count
+        return {
+            "blocked_total": sum(self.blocked.values()),
+            "blocked": blocked,
+            "allowed": dict(self.allowed),
+            "bytes_loaded": dict(self.bytes_loaded),
+        }
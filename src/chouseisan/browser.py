@@ -0,0 +1,418 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, TYPE_CHECKING
+
+from . import deadline, memory
+from .blocking import ContextTracker, ResourceBlocker
+from .deadline import step_timeout_ms
+from .errors import OverloadedError
+from .metrics import phase
+from .profile import AssetCache, StorageState
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
+logger = logging.getLogger(__name__)
+
+
+class _BrowserInstance:
+    """起動した Chromium 1 つと、その利用状況"""
+    __slots__ = ("browser", "generation", "marker", "pages", "leases", "memory", "draining")
+
+    def __init__(self, browser: "Browser", generation: int, marker: str):
+        self.browser = browser
+        self.generation = generation
+        # プロセスのメモリ使用量を /proc から探すための起動引数
+        self.marker = marker
+        self.pages = 0
+        self.leases = 0
+        self.memory: Optional[int] = None
+        self.draining = False
+
+
+class _PooledContext:
+    """プールで管理する BrowserContext とその Page"""
+    __slots__ = ("instance", "context", "page", "tracker")
+
+    def __init__(self, instance: _BrowserInstance, context: "BrowserContext", page: "Page", tracker: ContextTracker):
+        self.instance = instance
+        self.context = context
+        self.page = page
+        self.tracker = tracker
+
+
+class BrowserPool:
+    """
+    Playwright ドライバと Chromium プロセスを共有し、
+    呼び出しごとに独立した BrowserContext/Page を貸し出すプール。
+
+    - ドライバとブラウザはプロセス内で 1 つだけ起動し、使い回します。
+    - 同時に貸し出せるコンテキスト数は ``size`` で制限されます。
+    - 返却されたコンテキストは破棄し (Cookie 等を持ち越さないため)、
+      バックグラウンドで新しいコンテキストを補充して待機させておきます。
+    - ブラウザのクラッシュ (切断) を検知した場合は次回の貸し出し時に再起動します。
+    - ``blocker`` を指定すると、各コンテキストで不要なリソースの読み込みを中断します。
+    - ブラウザが ``max_pages`` 回貸し出した場合や、ブラウザのプロセス群のメモリ使用量が
+      ``max_memory`` バイトを超えた場合はそのブラウザを退役させます。新しい貸し出しは新しく
+      起動したブラウザで行い、退役したブラウザは貸し出し中の処理がすべて終わってから終了します。
+    - 全ブラウザのメモリ使用量の合計が ``memory_limit`` バイトを超えている間は、新しい貸し出しを
+      OverloadedError で拒否します。
+    - ``asset_cache`` を指定すると、静的アセットをディスクに保存して再起動後も再利用します。
+    - ``storage_state`` を指定すると、読み取り操作のコンテキスト間でだけ Cookie を引き継ぎます
+      (書き込み操作のコンテキストは常に Cookie を持たない状態で貸し出します)。
+    """
+    # ブラウザ起動の最大待機時間 (ミリ秒)。操作の期限内で起動する場合はその残り時間に短縮される
+    LAUNCH_TIMEOUT = 30000
+
+    def __init__(
+        self,
+        headless: bool = True,
+        size: int = 2,
+        timeout: int = 15000,
+        blocker: Optional[ResourceBlocker] = None,
+        max_pages: int = 0,
+        max_memory: int = 0,
+        memory_limit: int = 0,
+        memory_check_interval: float = 15.0,
+        asset_cache: Optional[AssetCache] = None,
+        storage_state: Optional[StorageState] = None
+    ):
+        if size < 1:
+            raise ValueError("プールサイズは 1 以上を指定してください。")
+        self.headless = headless
+        self.size = size
+        self.timeout = timeout
+        self.blocker = blocker
+        # 0 の場合はそれぞれの制限を行わない
+        self.max_pages = max_pages
+        self.max_memory = max_memory
+        self.memory_limit = memory_limit
+        self.memory_check_interval = memory_check_interval
+        self.asset_cache = asset_cache
+        self.storage_state = storage_state
+
+        self._playwright: Optional["Playwright"] = None
+        self._browser: Optional["Browser"] = None
+        self._instance: Optional[_BrowserInstance] = None
+        self._draining: List[_BrowserInstance] = []
+        self._generation = 0
+        self._monitor_task: Optional["asyncio.Task[None]"] = None
+        self.recycled: Dict[str, int] = {"pages": 0, "memory": 0, "limit": 0}
+        self._idle: List[_PooledContext] = []
+        self._semaphore = asyncio.Semaphore(size)
+        self._launch_lock = asyncio.Lock()
+        self._refill_tasks: Set["asyncio.Task[None]"] = set()
+        self._closed = False
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self) -> None:
+        """ドライバとブラウザを起動し、コンテキストを事前に用意します。"""
+        self._closed = False
+        await self._ensure_browser()
+        missing = self.size - len(self._idle)
+        if missing > 0:
+            await asyncio.gather(*(self._refill() for _ in range(missing)))
+
+    async def close(self) -> None:
+        """全コンテキスト、ブラウザ、ドライバを終了します。"""
+        self._closed = True
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            await asyncio.gather(self._monitor_task, return_exceptions=True)
+            self._monitor_task = None
+        for task in list(self._refill_tasks):
+            task.cancel()
+        if self._refill_tasks:
+            await asyncio.gather(*self._refill_tasks, return_exceptions=True)
+        self._refill_tasks.clear()
+
+        async with self._launch_lock:
+            await self._discard_idle()
+            draining, self._draining = self._draining, []
+            for instance in draining:
+                await self._close_instance(instance)
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception:
+                    logger.debug("Browser already closed", exc_info=True)
+                self._browser = None
+                self._instance = None
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    logger.debug("Playwright driver already stopped", exc_info=True)
+                self._playwright = None
+
+    @asynccontextmanager
+    async def page(self, operation: str = "unknown") -> AsyncIterator["Page"]:
+        """
+        独立した BrowserContext 上の Page を貸し出します。
+
+        ブロックを抜けるとコンテキストは破棄され、プールには新しいコンテキストが補充されます。
+
+        Args:
+            operation: 利用する操作の名前 (リソース中断数などの集計に使用)
+        """
+        await self._acquire_slot()
+        try:
+            with phase("browser_lease"):
+                pooled = await self._acquire()
+            pooled.tracker.operation = operation
+            instance = pooled.instance
+            instance.leases += 1
+            instance.pages += 1
+            shared = self.storage_state is not None and self.storage_state.shares(operation)
+            try:
+                if shared:
+                    await self.storage_state.apply(pooled.context)
+                yield pooled.page
+            finally:
+                if shared:
+                    try:
+                        await self.storage_state.capture(pooled.context)
+                    except Exception:
+                        logger.debug("Failed to capture browser cookies", exc_info=True)
+                try:
+                    await pooled.context.close()
+                except Exception:
+                    logger.debug("Failed to close browser context", exc_info=True)
+                instance.leases -= 1
+                if not instance.draining and self.max_pages and instance.pages >= self.max_pages:
+                    self._retire(instance, "pages")
+                if instance.draining and instance.leases == 0:
+                    self._close_later(self._finish_draining(instance))
+                self._schedule_refill()
+        finally:
+            self._semaphore.release()
+
+    async def _acquire_slot(self) -> None:
+        """
+        貸し出し枠を確保します。空きを待つ時間は queue_wait として記録し、操作全体の期限までに限ります。
+
+        Raises:
+            DeadlineExceededError: 空きを待つ間に操作全体の期限を過ぎた場合
+        """
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return
+        current = deadline.current()
+        try:
+            with phase("queue_wait"):
+                if current is None:
+                    await self._semaphore.acquire()
+                else:
+                    await asyncio.wait_for(self._semaphore.acquire(), timeout=current.remaining())
+        except asyncio.TimeoutError:
+            deadline.check("ブラウザの空き待ち")
+            raise OverloadedError(
+                "サーバーが混雑しています (ブラウザの空き待ちが制限時間を超えました)。"
+                "しばらくしてから再実行してください。"
+            ) from None
+
+    async def _acquire(self) -> _PooledContext:
+        if self.memory_limit:
+            total = self.memory_usage()
+            if total is not None and total > self.memory_limit:
+                # 退役済みのブラウザが終了していれば解消されている可能性があるため測定し直す
+                await self.check_memory()
+                total = self.memory_usage()
+                if total is not None and total > self.memory_limit:
+                    raise OverloadedError(
+                        "ブラウザのメモリ使用量が上限を超えているため、現在リクエストを受け付けられません。"
+                        "しばらくしてから再度お試しください。"
+                    )
+        await self._ensure_browser()
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.instance is self._instance and not pooled.page.is_closed():
+                return pooled
+            # 再起動前のブラウザに属するコンテキストは使用不可
+        return await self._new_context()
+
+    async def _ensure_browser(self) -> "Browser":
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            if self._browser is not None:
+                logger.warning("Chromium process disconnected; relaunching browser")
+                await self._discard_idle()
+
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                with phase("driver_start"):
+                    self._playwright = await async_playwright().start()
+
+            logger.info(f"Launching shared Chromium (headless={self.headless}, pool_size={self.size})")
+            marker = f"--chouseisan-browser={os.getpid()}-{self._generation + 1}"
+            with phase("browser_launch"):
+                browser = await self._playwright.chromium.launch(
+                    headless=self.headless,
+                    timeout=step_timeout_ms(self.LAUNCH_TIMEOUT),
+                    args=[marker]
+                )
+            browser.on("disconnected", self._on_disconnected)
+            self._browser = browser
+            self._generation += 1
+            self._instance = _BrowserInstance(browser, self._generation, marker)
+            self._start_monitor()
+            return browser
+
+    def _start_monitor(self) -> None:
+        # 事前起動の有無にかかわらず、最初のブラウザを起動した時点でメモリの監視を始める
+        if self._monitor_task is None and not self._closed and (self.max_memory or self.memory_limit) and memory.available():
+            self._monitor_task = asyncio.get_running_loop().create_task(self._monitor_memory())
+
+    def _on_disconnected(self, browser: "Browser") -> None:
+        if browser is self._browser and not self._closed:
+            logger.warning("Shared Chromium disconnected unexpectedly")
+            self._idle.clear()
+
+    async def _new_context(self) -> _PooledContext:
+        browser = await self._ensure_browser()
+        instance = self._instance
+        assert instance is not None
+        context = await browser.new_context()
+        context.set_default_timeout(self.timeout)
+        tracker = ContextTracker()
+        # 後に登録したルートが先に呼ばれるため、中断対象のリソースはキャッシュより先に中断される
+        if self.asset_cache is not None:
+            await self.asset_cache.install(context)
+        if self.blocker is not None:
+            tracker = await self.blocker.install(context)
+        page = await context.new_page()
+        return _PooledContext(instance, context, page, tracker)
+
+    async def _refill(self) -> None:
+        if self._closed or len(self._idle) >= self.size:
+            return
+        try:
+            pooled = await self._new_context()
+        except Exception:
+            logger.warning("Failed to pre-warm browser context", exc_info=True)
+            return
+        if self._closed or pooled.instance is not self._instance or len(self._idle) >= self.size:
+            await pooled.context.close()
+            return
+        self._idle.append(pooled)
+
+    def _schedule_refill(self) -> None:
+        if self._closed:
+            return
+        task = asyncio.get_running_loop().create_task(self._refill())
+        self._refill_tasks.add(task)
+        task.add_done_callback(self._refill_tasks.discard)
+
+    async def _discard_idle(self) -> None:
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            try:
+                await pooled.context.close()
+            except Exception:
+                logger.debug("Failed to close idle browser context", exc_info=True)
+
+    def _retire(self, instance: _BrowserInstance, reason: str) -> None:
+        """
+        ブラウザを退役させます。以降の貸し出しは新しいブラウザで行い、
+        退役したブラウザは貸し出し中の処理がすべて終わった時点で終了します。
+        """
+        if instance.draining:
+            return
+        instance.draining = True
+        self.recycled[reason] = self.recycled.get(reason, 0) + 1
+        memory_mb = f"{instance.memory / 2**20:.0f}MB" if instance.memory is not None else "unknown"
+        logger.info(
+            f"Recycling Chromium (generation {instance.generation}, reason={reason}, "
+            f"pages={instance.pages}, memory={memory_mb}, leases={instance.leases})"
+        )
+        if instance is self._instance:
+            self._instance = None
+            self._browser = None
+        self._draining.append(instance)
+        # 待機中のコンテキストは退役したブラウザに属するため破棄する
+        idle, self._idle = self._idle, [p for p in self._idle if p.instance is not instance]
+        for pooled in idle:
+            if pooled.instance is instance:
+                self._close_later(pooled.context.close())
+        if instance.leases == 0:
+            self._close_later(self._finish_draining(instance))
+
+    async def _finish_draining(self, instance: _BrowserInstance) -> None:
+        if instance in self._draining:
+            self._draining.remove(instance)
+            await self._close_instance(instance)
+
+    async def _close_instance(self, instance: _BrowserInstance) -> None:
+        try:
+            await instance.browser.close()
+        except Exception:
+            logger.debug("Retired browser already closed", exc_info=True)
+
+    def _close_later(self, closing: Any) -> None:
+        task = asyncio.get_running_loop().create_task(closing)
+        self._refill_tasks.add(task)
+        task.add_done_callback(self._refill_tasks.discard)
+
+    def memory_usage(self) -> Optional[int]:
+        """直近に測定した全ブラウザ (退役中を含む) のメモリ使用量の合計 (バイト)。未測定の場合は None"""
+        samples = [i.memory for i in self._instances() if i.memory is not None]
+        return sum(samples) if samples else None
+
+    def _instances(self) -> List[_BrowserInstance]:
+        instances = list(self._draining)
+        if self._instance is not None:
+            instances.append(self._instance)
+        return instances
+
+    async def check_memory(self) -> None:
+        """
+        各ブラウザのメモリ使用量を測定し、上限を超えたブラウザを退役させます。
+
+        合計が memory_limit を超えている場合は、稼働中のブラウザも退役させてメモリの解放を促します。
+        """
+        instances = self._instances()
+        if not instances:
+            return
+        usage = await asyncio.get_running_loop().run_in_executor(
+            None, memory.tree_memory, [i.marker for i in instances]
+        )
+        for instance in instances:
+            instance.memory = usage.get(instance.marker)
+        active = self._instance
+        if active is None or active.draining or active.memory is None:
+            return
+        if self.max_memory and active.memory > self.max_memory:
+            self._retire(active, "memory")
+        elif self.memory_limit and (self.memory_usage() or 0) > self.memory_limit:
+            self._retire(active, "limit")
+
+    async def _monitor_memory(self) -> None:
+        while True:
+            await asyncio.sleep(self.memory_check_interval)
+            try:
+                await self.check_memory()
+            except Exception:
+                logger.warning("Failed to measure browser memory", exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """ブラウザの数・貸し出し回数・メモリ使用量と、退役の理由ごとの回数を返します。"""
+        active = self._instance
+        return {
+            "instances": len(self._instances()),
+            "draining": len(self._draining),
+            "leases": sum(i.leases for i in self._instances()),
+            "pages_served": active.pages if active is not None else 0,
+            "memory_bytes": self.memory_usage() or 0,
+            "memory_limit_bytes": self.memory_limit,
+            "recycled": dict(self.recycled),
+        }
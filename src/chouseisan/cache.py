@@ -0,0 +1,178 @@
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from . import deadline
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _consume_exception(task: "asyncio.Task[Any]") -> None:
+    # 待機者がいない場合に "Task exception was never retrieved" を出さないため
+    if not task.cancelled():
+        task.exception()
+
+
+def normalize_event_url(url: str) -> str:
+    """
+    キャッシュキーとして使用するためにイベント URL を正規化します。
+
+    スキーム・ホスト名の小文字化、既定ポートとフラグメントの除去、クエリの並べ替えを行います。
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+class _Flight:
+    """実行中の取得処理と、その結果を待っている呼び出し元の数"""
+    __slots__ = ("key", "generation", "task", "waiters")
+
+    def __init__(self, key: str, generation: int, task: "asyncio.Task[Dict[str, Any]]"):
+        self.key = key
+        self.generation = generation
+        self.task = task
+        self.waiters = 0
+
+
+class EventInfoCache:
+    """
+    イベント情報の TTL/LRU キャッシュ。
+
+    - エントリは ``ttl`` 秒で失効し、``max_size`` を超えると最も古く使われたものから破棄されます。
+    - 同じキーへの同時のキャッシュミスは 1 回の取得処理を共有します (singleflight)。
+      取得処理は呼び出し元から切り離したタスクで実行するため、最初の呼び出し元が取り消されても
+      他の呼び出し元は結果を受け取れます。待機する呼び出し元がいなくなった時点で取得処理を取り消します。
+    - ``invalidate`` されたキーについては、無効化前に開始した取得結果を保存しません。
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        max_age: Optional[float] = None,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        キャッシュから値を返し、なければ fetch で取得して保存します。
+
+        Args:
+            key: キャッシュキー (正規化済みイベント URL)
+            fetch: キャッシュミス時に呼び出す取得処理
+            max_age: 許容するキャッシュの経過秒数 (None の場合は TTL)
+            force_refresh: True の場合はキャッシュを使わずに取得し直す
+
+        Returns:
+            Dict[str, Any]: イベント情報 (呼び出し元が変更してもキャッシュに影響しないコピー)
+        """
+        if not self.enabled:
+            return await fetch()
+
+        generation = self._generations.get(key, 0)
+        if not force_refresh:
+            entry = self._entries.get(key)
+            limit = self.ttl if max_age is None else min(max_age, self.ttl)
+            if entry is not None and self._clock() - entry[0] <= limit:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+
+        self.misses += 1
+        flight = self._inflight.get(key)
+        if flight is not None and flight.generation == generation:
+            # 無効化以降に開始された取得処理であれば結果を共有する
+            self.coalesced += 1
+        else:
+            # 取得処理は最初の呼び出し元のコンテキスト (期限など) を引き継いだ別タスクで実行する
+            task = asyncio.ensure_future(self._run(key, generation, fetch))
+            task.add_done_callback(_consume_exception)
+            flight = self._inflight[key] = _Flight(key, generation, task)
+        return copy.deepcopy(await self._wait_shared(flight))
+
+    async def _run(self, key: str, generation: int, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            value = await fetch()
+        finally:
+            flight = self._inflight.get(key)
+            if flight is not None and flight.task is asyncio.current_task():
+                del self._inflight[key]
+        if self._generations.get(key, 0) == generation:
+            self._store(key, value)
+        return value
+
+    async def _wait_shared(self, flight: _Flight) -> Dict[str, Any]:
+        # 共有している取得処理は待機する側の取り消しや期限では止めず、待機だけをやめる
+        flight.waiters += 1
+        try:
+            current = deadline.current()
+            if current is None:
+                return await asyncio.shield(flight.task)
+            try:
+                return await asyncio.wait_for(asyncio.shield(flight.task), timeout=current.remaining())
+            except asyncio.TimeoutError:
+                deadline.check("イベント情報の取得")
+                raise
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # 結果を待つ呼び出し元がいなくなった取得処理は取り消す
+                flight.task.cancel()
+                if self._inflight.get(flight.key) is flight:
+                    del self._inflight[flight.key]
+
+    def invalidate(self, key: str) -> None:
+        """キーのエントリを削除し、実行中の取得結果も保存されないようにします。"""
+        self._entries.pop(key, None)
+        self._generations[key] = self._generations.get(key, 0) + 1
+        if key not in self._inflight and len(self._generations) > self.max_size * 4:
+            # 世代番号は実行中の取得処理の判定にのみ使うため、肥大化したら整理する
+            self._generations = {k: v for k, v in self._generations.items() if k in self._inflight}
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self.invalidate(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット数・ミス数などの統計情報を返します。"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
+
+    def _store(self, key: str, value: Dict[str, Any]) -> None:
+        self._entries[key] = (self._clock(), copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted event info cache entry: {evicted}")
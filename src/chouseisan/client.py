@@ -1,24 +1,59 @@
+import asyncio
+import functools
+import inspect
 import logging
 import json
 import os
-from typing import List, Dict, Any, Optional, Union, TYPE_CHECKING
+import time
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Optional, Tuple, Union, TYPE_CHECKING
+from urllib.parse import urljoin, urlsplit
+
+from .attendance import AttendanceMatrix, extract_attendance, extract_event_info_markup
+from .blocking import ResourceBlocker
+from .browser import BrowserPool
+from .cache import EventInfoCache, normalize_event_url
+from .deadline import check as check_deadline, deadline_scope, first_success, step_timeout_ms
+from .errors import (
+    AvailabilityFieldError, ChouseisanError, FormShapeError, NetworkError, NotSubmittedError, ScrapingError
+)
+from .forms import AVAILABILITY_BUTTON_CLASSES, availability_value, find_csrf_token, find_event_url, find_form
+from .hedging import HedgePolicy
+from .httpclient import HttpSession, post_form, request
+from .index import EventIndex
+from .metrics import ClientMetrics, phase
+from .scheduler import OperationScheduler
+from .parser import parse_html
+from .profile import AssetCache, StorageState
+from .watch import EventWatcher
+from . import scripts
 
 if TYPE_CHECKING:
-    from playwright.async_api import Page, Browser
+    import httpx
+    from playwright.async_api import APIResponse, Browser, Page, Route
 
 logger = logging.getLogger(__name__)
 
-class ChouseisanError(Exception):
-    """調整さんクライアントの基底例外クラス"""
-    pass
+def _client_call(tool: str, default_deadline: bool = True) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    公開メソッドの共通処理を行うデコレーター。
 
-class NetworkError(ChouseisanError):
-    """ネットワーク通信エラー"""
-    pass
+    - 操作全体の所要時間とフェーズごとの内訳を client.metrics に記録します。
+    - 引数 ``deadline`` (秒。省略時は client.call_timeout) を操作全体の期限として設定します。
+      default_deadline が偽の場合、deadline を明示したときだけ期限を設定します。
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
 
-class ScrapingError(ChouseisanError):
-    """スクレイピングエラー"""
-    pass
+        @functools.wraps(func)
+        async def wrapper(self: "ChouseisanClient", *args: Any, **kwargs: Any) -> Any:
+            budget = signature.bind(self, *args, **kwargs).arguments.get("deadline")
+            if budget is None and default_deadline:
+                budget = self.call_timeout
+            with self.metrics.call(tool), deadline_scope(budget):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 def parse_availability_status(val: Any) -> int:
     """
@@ -89,19 +124,400 @@ def parse_availability_list(input_val: Union[List[Any], str, None]) -> List[int]
 
     return []
 
+def parse_response_entries(input_val: Union[List[Any], str, None]) -> List[Any]:
+    """
+    一括登録用の回答エントリ一覧をリストに変換します。
+
+    Args:
+        input_val: {name, comment, availability} 形式の辞書のリスト、またはその JSON 文字列
+
+    Returns:
+        List[Any]: エントリのリスト (各要素の検証は呼び出し元で行う)
+
+    Raises:
+        ChouseisanError: JSON として解釈できない文字列が渡された場合
+    """
+    if input_val is None:
+        return []
+
+    if isinstance(input_val, str):
+        s = input_val.strip()
+        if not s:
+            return []
+        try:
+            parsed = json.loads(s)
+        except json.JSONDecodeError as e:
+            raise ChouseisanError(f"回答エントリの JSON を解釈できませんでした: {e}") from e
+        if isinstance(parsed, dict):
+            return [parsed]
+        if isinstance(parsed, list):
+            return parsed
+        raise ChouseisanError("回答エントリはオブジェクトのリストで指定してください。")
+
+    if isinstance(input_val, dict):
+        return [input_val]
+
+    if isinstance(input_val, (list, tuple)):
+        return list(input_val)
+
+    return []
+
+def parse_event_urls(input_val: Union[List[Any], str, None]) -> List[str]:
+    """
+    イベント URL の一覧をリストに変換します。
+
+    Args:
+        input_val: URL のリスト、その JSON 文字列、または改行・カンマ・空白区切りの文字列
+
+    Returns:
+        List[str]: 前後の空白を除いた URL のリスト (空の要素は除く)
+    """
+    if input_val is None:
+        return []
+
+    if isinstance(input_val, str):
+        s = input_val.strip()
+        if s.startswith("["):
+            try:
+                parsed = json.loads(s)
+                if isinstance(parsed, list):
+                    return [str(u).strip() for u in parsed if str(u).strip()]
+            except json.JSONDecodeError:
+                pass
+        return [u for u in s.replace(",", " ").split() if u]
+
+    if isinstance(input_val, (list, tuple)):
+        return [str(u).strip() for u in input_val if str(u).strip()]
+
+    return []
+
+def group_event_urls(urls: List[str]) -> List[Dict[str, Any]]:
+    """
+    同じイベントを指す URL (正規化後に一致するもの) をまとめます。
+
+    Returns:
+        List[Dict[str, Any]]: 入力順に並んだイベントごとの {index, indices, url}
+    """
+    groups: Dict[str, Dict[str, Any]] = {}
+    for index, url in enumerate(urls):
+        key = normalize_event_url(url) if url.startswith("http") else url
+        if key in groups:
+            groups[key]["indices"].append(index)
+        else:
+            groups[key] = {"index": index, "indices": [index], "url": url}
+    return list(groups.values())
+
+async def fetch_events_info(
+    fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+    event_urls: Union[List[str], str],
+    concurrency: int,
+    on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    イベントごとの取得処理 fetch を同時実行数を制限しながら呼び出し、完了順に結果を返します。
+
+    同じイベントを指す URL は 1 回だけ取得し、1 件の失敗で全体を中断することはありません。
+    結果の形式は ChouseisanClient.get_events_info を参照してください。
+    """
+    urls = parse_event_urls(event_urls)
+    unique = group_event_urls(urls)
+    limit = max(concurrency, 1)
+    semaphore = asyncio.Semaphore(limit)
+    logger.info(f"Fetching {len(unique)} events ({len(urls)} URLs) with concurrency {limit}")
+
+    async def fetch_one(item: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                info = await fetch(item["url"])
+                return {**item, "success": True, "info": info, "error": None}
+            except Exception as e:
+                if not isinstance(e, ChouseisanError):
+                    logger.exception(f"Unexpected error while fetching {item['url']}")
+                return {**item, "success": False, "info": None, "error": str(e)}
+
+    results: List[Dict[str, Any]] = []
+    tasks = [asyncio.ensure_future(fetch_one(item)) for item in unique]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            results.append(result)
+            if on_result is not None:
+                await on_result(result)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    succeeded = sum(1 for r in results if r["success"])
+    logger.info(f"Fetched {succeeded}/{len(results)} events")
+    return results
+
+def split_candidate_dates(dates: str) -> List[str]:
+    """create_event に渡す改行区切りの候補日程を、空行を除いたリストにします。"""
+    return [line.strip() for line in dates.splitlines() if line.strip()]
+
+async def refresh_stale_entries(
+    fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+    entries: List[Dict[str, Any]],
+    max_age: float,
+    concurrency: int
+) -> int:
+    """
+    インデックスの記録のうち、最終取得から max_age 秒を超えたもの (未取得を含む) だけを fetch で取得し直します。
+
+    取得結果の記録は fetch (get_event_info) 側で行われます。1 件の失敗で全体を中断することはなく、
+    失敗したイベントは以前の記録のまま残ります。
+
+    Returns:
+        int: 取得し直したイベント数
+    """
+    now = time.time()
+    stale = [e["url"] for e in entries if e["fetched_at"] is None or now - e["fetched_at"] > max_age]
+    if stale:
+        await fetch_events_info(fetch, stale, concurrency=concurrency)
+    return len(stale)
+
+class ResponseResult:
+    """
+    add_response の結果。
+
+    真偽値としては登録の成否を表し (従来の bool の戻り値と同じように使える)、
+    warnings には入力できなかった日程などの警告を保持します。
+    """
+
+    def __init__(self, success: bool = True, warnings: Optional[List[str]] = None):
+        self.success = success
+        self.warnings: List[str] = list(warnings or [])
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    def __repr__(self) -> str:
+        return f"ResponseResult(success={self.success!r}, warnings={self.warnings!r})"
+
 class ChouseisanClient:
     """調整さん (chouseisan.com) を操作するための高信頼クライアントクラス"""
     BASE_URL = "https://chouseisan.com"
+    READ_MODES = ("http", "browser")
+    WRITE_MODES = ("browser", "http")
 
-    def __init__(self, headless: Optional[bool] = None, timeout: int = 15000):
+    def __init__(
+        self,
+        headless: Optional[bool] = None,
+        timeout: int = 15000,
+        pool_size: Optional[int] = None,
+        read_mode: Optional[str] = None,
+        write_mode: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+        cache_size: Optional[int] = None,
+        base_url: Optional[str] = None,
+        call_timeout: Optional[float] = None,
+        event_index: Optional[bool] = None,
+        browser_memory_limit: Optional[int] = None
+    ):
         if headless is None:
             headless_env = os.environ.get("HEADLESS", "true").lower()
             self.headless = headless_env in ("true", "1", "yes")
         else:
             self.headless = headless
         self.timeout = timeout
+        # 1 回の操作全体の制限時間 (秒)。各ステップのタイムアウトはこの残り時間から割り当てる
+        if call_timeout is None:
+            call_timeout = float(os.environ.get("CALL_TIMEOUT", str(timeout / 1000)))
+        self.call_timeout = call_timeout
+        # 接続先 (検証用のローカルサーバー等を指す場合は CHOUSEISAN_BASE_URL で変更)
+        if base_url is None:
+            base_url = os.environ.get("CHOUSEISAN_BASE_URL", self.BASE_URL)
+        self.base_url = base_url.rstrip("/")
+        self._base_host = (urlsplit(self.base_url).hostname or "").lower()
+        if not self._base_host:
+            raise ValueError(f"無効な接続先 URL です: {base_url}")
+        if pool_size is None:
+            pool_size = int(os.environ.get("BROWSER_POOL_SIZE", "2"))
+        self.pool_size = pool_size
+        # 画像・フォント・広告等の読み込み中断 (BLOCK_RESOURCES=false で無効化)
+        block_env = os.environ.get("BLOCK_RESOURCES", "true").lower()
+        self.blocker = ResourceBlocker.from_env() if block_env in ("true", "1", "yes") else None
+        # 再起動をまたいで再利用する静的アセットと読み取り用 Cookie の保存先 (BROWSER_CACHE_DIR が空なら無効)
+        self.asset_cache: Optional[AssetCache] = None
+        storage_state: Optional[StorageState] = None
+        cache_dir = os.environ.get("BROWSER_CACHE_DIR", "")
+        if cache_dir:
+            self.asset_cache = AssetCache(
+                os.path.join(cache_dir, "assets"),
+                max_bytes=int(float(os.environ.get("BROWSER_CACHE_MAX_MB", "100")) * 2**20),
+                ttl=float(os.environ.get("BROWSER_CACHE_TTL", "86400")),
+            )
+            if os.environ.get("BROWSER_PERSIST_COOKIES", "true").lower() in ("true", "1", "yes"):
+                storage_state = StorageState(os.path.join(cache_dir, "storage_state.json"), hosts=[self._base_host])
+        # ブラウザの退役条件 (貸し出し回数・1 ブラウザあたりのメモリ) と全ブラウザのメモリ上限 (バイト。0 で無効)。
+        # ワーカーモードでは WorkerClient がサーバー全体の上限をワーカー数で割って渡す
+        if browser_memory_limit is None:
+            browser_memory_limit = int(float(os.environ.get("BROWSER_MEMORY_LIMIT_MB", "0")) * 2**20)
+        self._pool = BrowserPool(
+            headless=self.headless,
+            size=self.pool_size,
+            timeout=self.timeout,
+            blocker=self.blocker,
+            max_pages=int(os.environ.get("BROWSER_MAX_PAGES", "500")),
+            max_memory=int(float(os.environ.get("BROWSER_MAX_MEMORY_MB", "0")) * 2**20),
+            memory_limit=browser_memory_limit,
+            memory_check_interval=float(os.environ.get("BROWSER_MEMORY_CHECK_INTERVAL", "15")),
+            asset_cache=self.asset_cache,
+            storage_state=storage_state,
+        )
+
+        # 読み取りモード: http (HTML を直接取得・解析し、日程が取れなければブラウザへフォールバック)
+        # または browser (常に Playwright で取得)
+        if read_mode is None:
+            read_mode = os.environ.get("READ_MODE", "http").lower()
+        if read_mode not in self.READ_MODES:
+            raise ValueError(f"未対応の読み取りモードです: {read_mode}")
+        self.read_mode = read_mode
+
+        # 書き込みモード: browser (Playwright で UI を操作) または
+        # http (フォームを直接 POST し、フォーム構造が想定と異なる場合はブラウザへフォールバック)
+        if write_mode is None:
+            write_mode = os.environ.get("WRITE_MODE", "browser").lower()
+        if write_mode not in self.WRITE_MODES:
+            raise ValueError(f"未対応の書き込みモードです: {write_mode}")
+        self.write_mode = write_mode
 
-    async def create_event(self, title: str, memo: str = "", dates: str = "") -> str:
+        # イベント情報キャッシュ (TTL 秒。0 で無効化)
+        if cache_ttl is None:
+            cache_ttl = float(os.environ.get("EVENT_CACHE_TTL", "30"))
+        if cache_size is None:
+            cache_size = int(os.environ.get("EVENT_CACHE_SIZE", "256"))
+        self.cache = EventInfoCache(ttl=cache_ttl, max_size=cache_size)
+
+        # ブラウザを使う操作の同時実行数・待機キューの上限・最大待機秒数
+        self.scheduler = OperationScheduler(
+            max_concurrency=int(os.environ.get("MAX_CONCURRENCY", str(self.pool_size))),
+            max_queue=int(os.environ.get("MAX_QUEUE", "32")),
+            max_wait=float(os.environ.get("MAX_QUEUE_WAIT", "30")),
+        )
+        self._http = HttpSession(timeout=self.timeout / 1000)
+
+        # get_events_info で同時に取得するイベント数の上限
+        self.batch_concurrency = int(os.environ.get("BATCH_CONCURRENCY", "8"))
+
+        # watch_event で差分を返すための、イベントごとの出欠表の指紋の履歴
+        self.watcher = EventWatcher(
+            max_events=int(os.environ.get("WATCH_MAX_EVENTS", "1024")),
+            history=int(os.environ.get("WATCH_HISTORY", "8")),
+        )
+
+        # 作成・取得したイベントの記録 (EVENT_INDEX_PATH が空の場合はメモリ上のみ。EVENT_INDEX=false で無効)
+        if event_index is None:
+            event_index = os.environ.get("EVENT_INDEX", "true").lower() in ("true", "1", "yes")
+        self.index: Optional[EventIndex] = EventIndex.from_env() if event_index else None
+
+        # 読み取りのヘッジ (直近の所要時間の分位点を過ぎたら 2 つ目の試行を開始) と、送信前に失敗した書き込みの再試行
+        self.hedging = HedgePolicy(
+            enabled=os.environ.get("HEDGE_REQUESTS", "true").lower() in ("true", "1", "yes"),
+            quantile=float(os.environ.get("HEDGE_QUANTILE", "0.95")),
+            initial_delay=float(os.environ.get("HEDGE_INITIAL_DELAY", "2")),
+            max_ratio=float(os.environ.get("HEDGE_MAX_RATIO", "0.1")),
+            max_retries=int(os.environ.get("WRITE_RETRIES", "1")),
+        )
+
+        # 操作・フェーズごとの所要時間 (SLOW_CALL_THRESHOLD 秒を超えた操作は内訳をログに出力)
+        self.metrics = ClientMetrics(slow_call_threshold=float(os.environ.get("SLOW_CALL_THRESHOLD", "0")))
+
+    async def start(self) -> None:
+        """
+        共有ブラウザを起動し、コンテキストプールを事前に用意します。
+
+        呼び出さなかった場合も、最初の操作時に自動で起動します。
+        """
+        await self._pool.start()
+
+    @_client_call("prewarm", default_deadline=False)
+    async def prewarm(self, browser: bool = True, http: Optional[bool] = None) -> None:
+        """
+        Playwright ドライバ・共有ブラウザの起動と、接続先への HTTP 接続の確立を並行して行います。
+
+        失敗しても例外は送出せず、最初の操作時に改めて起動・接続します。
+
+        Args:
+            browser (bool, optional): 共有ブラウザとコンテキストプールを起動する
+            http (Optional[bool], optional): HTTP 接続を確立する。None の場合は
+                読み取り・書き込みのいずれかが http モードのときのみ
+        """
+        if http is None:
+            http = self.read_mode == "http" or self.write_mode == "http"
+
+        async def warm_http() -> None:
+            with phase("http_connect"):
+                await self._http.warm(self.base_url)
+
+        steps: List[Tuple[str, Awaitable[None]]] = []
+        if browser:
+            steps.append(("browser", self._pool.start()))
+        if http:
+            steps.append(("http", warm_http()))
+        results = await asyncio.gather(*(step for _, step in steps), return_exceptions=True)
+        for (name, _), result in zip(steps, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to prewarm {name}: {result}")
+
+    async def close(self) -> None:
+        """共有ブラウザ、Playwright ドライバ、HTTP 接続プールを終了します。"""
+        await self._http.close()
+        await self._pool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュやリソース中断などの統計情報を返します。"""
+        return {
+            "scheduler": self.scheduler.stats(),
+            "browser": self._pool.stats(),
+            "cache": self.cache.stats(),
+            "watch": self.watcher.stats(),
+            "resources": self.blocker.stats() if self.blocker is not None else None,
+            "assets": self.asset_cache.stats() if self.asset_cache is not None else None,
+            "index": self.index.stats() if self.index is not None else None,
+            "hedging": self.hedging.stats(),
+        }
+
+    async def render_metrics(self, extra: Optional[Dict[str, Any]] = None) -> str:
+        """計測値と統計情報 (extra を加えたもの) を Prometheus のテキスト形式で返します。"""
+        return self.metrics.render({**self.stats(), **(extra or {})})
+
+    def _is_service_url(self, url: Optional[str]) -> bool:
+        """URL が接続先 (base_url) のホストまたはそのサブドメインを指しているか判定します。"""
+        if not url:
+            return False
+        host = (urlsplit(url).hostname or "").lower()
+        return host == self._base_host or host.endswith("." + self._base_host)
+
+    def _step_timeout(self) -> float:
+        """Playwright の 1 ステップに割り当てるタイムアウト (ミリ秒)。操作全体の残り時間を超えない"""
+        return step_timeout_ms(self.timeout)
+
+    def _has_spare_capacity(self) -> bool:
+        """待機中の操作がなく、ブラウザの実行枠に空きがあるか (ヘッジで待機キューを増やさないため)"""
+        return self.scheduler.waiting == 0 and self.scheduler.running < self.scheduler.max_concurrency
+
+    async def _fetch_text(self, event_url: str) -> str:
+        """イベントページの HTML を HTTP で取得します (遅い場合はヘッジする)。"""
+        with phase("fetch"):
+            return await self.hedging.hedge("http_fetch", lambda: self._http.get_text(event_url))
+
+    @asynccontextmanager
+    async def _browser_page(self, operation: str) -> AsyncIterator["Page"]:
+        """スケジューラの実行枠を確保したうえで、共有ブラウザの Page を借ります。"""
+        async with self.scheduler.admit(operation):
+            async with self._pool.page(operation) as page:
+                yield page
+
+    async def __aenter__(self) -> "ChouseisanClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @_client_call("create_event")
+    async def create_event(self, title: str, memo: str = "", dates: str = "", deadline: Optional[float] = None) -> str:
         """
         新しい調整さんイベントを作成します。
 
@@ -109,6 +525,7 @@ class ChouseisanClient:
             title (str): イベントのタイトル
             memo (str, optional): イベントのメモ（説明文）
             dates (str, optional): 候補日程（改行区切り）
+            deadline (Optional[float], optional): 操作全体の制限時間 (秒)。None の場合は call_timeout
 
         Returns:
             str: 作成されたイベントのURL
@@ -120,39 +537,113 @@ class ChouseisanClient:
             raise ChouseisanError("イベントタイトルは必須です。")
 
         logger.info(f"Creating Chouseisan event: '{title}'")
-        from playwright.async_api import async_playwright
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
+        url = await self.hedging.retry("create_event", lambda: self._create_event_once(title, memo, dates))
+        if self.index is not None:
+            await self.index.run(self.index.record_created, url, title, memo, split_candidate_dates(dates))
+        return url
+
+    async def _create_event_once(self, title: str, memo: str, dates: str) -> str:
+        if self.write_mode == "http":
             try:
-                page = await browser.new_page()
-                page.set_default_timeout(self.timeout)
-                
-                await page.goto(self.BASE_URL, wait_until="domcontentloaded")
-                
-                await page.fill('input[name="name"]', title)
-                await page.fill('textarea[name="comment"]', memo)
-                await page.fill('textarea[name="kouho"]', dates)
-                
-                # 送信ボタンクリック
-                btn_locator = page.locator('#createBtn, #create_event_submit_btn, button:has-text("出欠表をつくる")').first
-                if await btn_locator.count() > 0:
-                    await btn_locator.click()
-                else:
-                    raise ScrapingError("イベント作成ボタンが見つかりませんでした。")
-                
-                # 作成完了後のURL取得
+                return await self._create_event_http(title, memo, dates)
+            except FormShapeError as e:
+                logger.warning(f"Form POST is not applicable for event creation; falling back to browser: {e}")
+        return await self._create_event_browser(title, memo, dates)
+
+    async def _create_event_http(self, title: str, memo: str, dates: str) -> str:
+        """
+        トップページの作成フォームを直接 POST してイベントを作成します。
+
+        フォームの取得・解析段階で想定外の構造を検出した場合は FormShapeError を送出します
+        (この時点ではまだ送信していないため、呼び出し元はブラウザ経由で安全に再実行できます)。
+        """
+        async with self._http.isolated() as http:
+            with phase("load_form"):
                 try:
-                    await page.wait_for_selector('input.new-event-url-input', timeout=self.timeout)
-                    url = await page.input_value('input.new-event-url-input')
-                except Exception:
-                    # リダイレクト後のURLフォールバック
-                    if "s?h=" in page.url:
-                        url = page.url
-                    else:
-                        await page.wait_for_url("**/s?h=*", timeout=5000)
-                        url = page.url
-
-                if not url or "chouseisan.com" not in url:
+                    response = await request(http, "GET", self.base_url)
+                except NetworkError as e:
+                    raise NotSubmittedError(f"作成フォームの取得に失敗しました: {e}") from e
+                page_url = str(response.url)
+                doc = parse_html(response.text)
+                form = find_form(doc, page_url, ("name", "comment", "kouho"))
+            data = form.build({"name": title, "comment": memo, "kouho": dates})
+            headers = {"Referer": page_url}
+            csrf_token = find_csrf_token(doc)
+            if csrf_token:
+                headers["X-CSRF-Token"] = csrf_token
+
+            try:
+                with phase("submit"):
+                    response = await post_form(http, form.action, data, headers)
+                url: Optional[str] = None
+                location = response.headers.get("location")
+                if response.is_redirect and location and "s?h=" in location:
+                    url = str(response.url.join(location))
+                else:
+                    with phase("resolve_url"):
+                        if response.is_redirect and location:
+                            response = await request(http, "GET", str(response.url.join(location)))
+                        if "s?h=" in str(response.url):
+                            url = str(response.url)
+                        else:
+                            url = find_event_url(parse_html(response.text), str(response.url))
+            except Exception as e:
+                logger.exception("Failed to create event via form POST")
+                if isinstance(e, ChouseisanError):
+                    raise
+                raise ChouseisanError(f"イベントの作成に失敗しました: {e}") from e
+
+        if not self._is_service_url(url):
+            raise ScrapingError(f"無効なイベントURLが生成されました: {url}")
+
+        logger.info(f"Event created successfully (http): {url}")
+        return url
+
+    async def _create_event_browser(self, title: str, memo: str, dates: str) -> str:
+        """
+        Playwright で作成フォームを操作してイベントを作成します。
+
+        送信ボタンを押す前に Playwright の操作が失敗した場合は NotSubmittedError を送出します。
+        """
+        async with self._browser_page("create_event") as page:
+            submitted = False
+            try:
+                with phase("goto"):
+                    await page.goto(self.base_url, wait_until="domcontentloaded", timeout=self._step_timeout())
+
+                with phase("fill_form"):
+                    await page.fill('input[name="name"]', title, timeout=self._step_timeout())
+                    await page.fill('textarea[name="comment"]', memo, timeout=self._step_timeout())
+                    await page.fill('textarea[name="kouho"]', dates, timeout=self._step_timeout())
+
+                # 送信ボタンクリック (送信リクエストの応答からイベント URL を取得できるよう先に監視を始める)
+                btn_locator = page.locator('#createBtn, #create_event_submit_btn, button:has-text("出欠表をつくる")').first
+                async with self._capture_created_event_url(page) as captured:
+                    with phase("submit"):
+                        if await btn_locator.count() > 0:
+                            # クリックが失敗した場合も送信された可能性があるため、以降は再試行しない
+                            submitted = True
+                            await btn_locator.click(timeout=self._step_timeout())
+                        else:
+                            raise ScrapingError("イベント作成ボタンが見つかりませんでした。")
+
+                    # 作成完了の合図 (送信の応答・URL 入力欄の表示・s?h= へのリダイレクト) を同時に待ち、
+                    # 先に来た方を使う。通常は応答から URL が得られ、次のページの描画は待たない
+                    with phase("wait_result"):
+                        timeout = self._step_timeout()
+                        signal, result = await first_success([
+                            captured,
+                            page.wait_for_selector('input.new-event-url-input', timeout=timeout),
+                            page.wait_for_url("**/s?h=*", timeout=timeout),
+                        ])
+                        if signal == 0:
+                            url = result
+                        elif signal == 1:
+                            url = await page.input_value('input.new-event-url-input', timeout=self._step_timeout())
+                        else:
+                            url = page.url
+
+                if not self._is_service_url(url):
                     raise ScrapingError(f"無効なイベントURLが生成されました: {url}")
 
                 logger.info(f"Event created successfully: {url}")
@@ -161,16 +652,98 @@ class ChouseisanClient:
                 logger.exception("Failed to create event")
                 if isinstance(e, ChouseisanError):
                     raise
+                check_deadline("イベントの作成")
+                if not submitted:
+                    raise NotSubmittedError(f"イベントの作成に失敗しました (未送信): {e}") from e
                 raise ChouseisanError(f"イベントの作成に失敗しました: {e}") from e
-            finally:
-                await browser.close()
 
-    async def get_event_info(self, event_url: str) -> Dict[str, Any]:
+    @asynccontextmanager
+    async def _capture_created_event_url(self, page: "Page") -> AsyncIterator["asyncio.Future[str]"]:
+        """
+        作成フォームの送信リクエストを横取りし、サーバーの応答からイベント URL を取得します。
+
+        送信はリダイレクトを追跡せずに 1 回だけ行い、応答の Location (または本文) から URL を特定します。
+        特定できた場合はブラウザへは空の応答 (204) を返すため、次のページとそのサブリソースは読み込みません。
+        特定できなかった場合は受け取った応答をそのままブラウザへ渡し、通常どおりの画面遷移に任せます。
+        ブロックを抜けると横取りを解除し、未完了の Future は取り消します。
+
+        Yields:
+            asyncio.Future[str]: イベント URL が確定すると完了する Future
+        """
+        captured: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+
+        async def handle_route(route: "Route") -> None:
+            req = route.request
+            if captured.done() or req.method != "POST" or not req.is_navigation_request():
+                await route.fallback()
+                return
+            try:
+                response = await route.fetch(max_redirects=0, timeout=self._step_timeout())
+            except Exception as e:
+                # 送信済みの可能性があるため、ブラウザから再送信させない
+                if not captured.done():
+                    captured.set_exception(e)
+                await route.abort()
+                return
+            try:
+                url = await self._event_url_from_response(page, req.url, response)
+            except Exception as e:
+                logger.debug(f"Could not resolve event URL from the submit response: {e}")
+                url = None
+            if url and not captured.done():
+                captured.set_result(url)
+                await route.fulfill(status=204)
+                return
+            if not captured.done():
+                captured.set_exception(ScrapingError("送信の応答からイベントURLを特定できませんでした。"))
+            await route.fulfill(response=response)
+
+        await page.route("**/*", handle_route)
+        try:
+            yield captured
+        finally:
+            # クリックの失敗や他の合図が先に来た場合も、Future の例外を回収して横取りを解除する
+            if not captured.done():
+                captured.cancel()
+            elif not captured.cancelled():
+                captured.exception()
+            try:
+                await page.unroute("**/*", handle_route)
+            except Exception:
+                logger.debug("Failed to remove the submit route", exc_info=True)
+
+    async def _event_url_from_response(self, page: "Page", request_url: str, response: "APIResponse") -> Optional[str]:
+        """作成フォーム送信の応答 (リダイレクト先または本文) からイベント URL を求めます。"""
+        location = response.headers.get("location")
+        if 300 <= response.status < 400 and location:
+            target = urljoin(request_url, location)
+            if "s?h=" in target:
+                return target
+            # 完了ページは HTML だけを取得して解析する (描画・サブリソースの読み込みは行わない)
+            followed = await page.request.get(target, timeout=self._step_timeout())
+            return find_event_url(parse_html(await followed.text()), followed.url)
+        if response.status >= 400:
+            raise ScrapingError(f"イベントの作成リクエストがエラーを返しました: {response.status}")
+        return find_event_url(parse_html(await response.text()), request_url)
+
+    @_client_call("get_event_info")
+    async def get_event_info(
+        self,
+        event_url: str,
+        max_age: Optional[float] = None,
+        force_refresh: bool = False,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         イベント情報（タイトル、候補日程一覧、URL）を取得します。
 
+        同じイベントの情報はキャッシュされ、同時に行われた取得は 1 回にまとめられます。
+
         Args:
             event_url (str): イベントのURL
+            max_age (Optional[float], optional): 許容するキャッシュの経過秒数。None の場合は TTL まで
+            force_refresh (bool, optional): True の場合はキャッシュを使わずに取得し直す
+            deadline (Optional[float], optional): 操作全体の制限時間 (秒)。None の場合は call_timeout
 
         Returns:
             Dict[str, Any]: イベント情報を含む辞書
@@ -184,43 +757,111 @@ class ChouseisanClient:
         if not event_url or not event_url.startswith("http"):
             raise ChouseisanError(f"無効なURLフォーマットです: {event_url}")
 
+        return await self.cache.get_or_fetch(
+            normalize_event_url(event_url),
+            lambda: self._fetch_event_info(event_url),
+            max_age=max_age,
+            force_refresh=force_refresh
+        )
+
+    @_client_call("get_events_info", default_deadline=False)
+    async def get_events_info(
+        self,
+        event_urls: Union[List[str], str],
+        max_age: Optional[float] = None,
+        force_refresh: bool = False,
+        concurrency: Optional[int] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        複数のイベント情報を同時実行数を制限しながらまとめて取得します。
+
+        同じイベントを指す URL は 1 回だけ取得し、結果は取得が完了した順に返します。
+        各イベントは get_event_info と同じ経路 (キャッシュ・HTTP・共有ブラウザ) で取得され、
+        1 件の失敗で全体を中断することはありません。
+
+        Args:
+            event_urls (Union[List[str], str]): イベント URL のリスト、またはその JSON/区切り文字列
+            max_age (Optional[float], optional): 許容するキャッシュの経過秒数
+            force_refresh (bool, optional): True の場合はキャッシュを使わずに取得し直す
+            concurrency (Optional[int], optional): 同時に取得するイベント数。None の場合は batch_concurrency
+            on_result (Optional[Callable], optional): 各イベントの取得が終わるたびに結果を受け取るコールバック
+            deadline (Optional[float], optional):
+                一括取得全体の制限時間 (秒)。None の場合は全体の制限を設けず、
+                イベントごとに call_timeout を適用する
+
+        Returns:
+            List[Dict[str, Any]]: 完了順に並んだイベントごとの結果
+                - index: 入力で最初に現れた位置 (0 始まり)
+                - indices: 同じイベントを指していた入力の位置すべて
+                - url: イベントURL
+                - success: 取得に成功した場合は True
+                - info: イベント情報 (title, dates, url)。失敗時は None
+                - error: 失敗した場合のエラーメッセージ (成功時は None)
+        """
+        return await fetch_events_info(
+            lambda url: self.get_event_info(url, max_age=max_age, force_refresh=force_refresh),
+            event_urls,
+            concurrency=concurrency or self.batch_concurrency,
+            on_result=on_result
+        )
+
+    async def _fetch_event_info(self, event_url: str) -> Dict[str, Any]:
         logger.info(f"Fetching event info: {event_url}")
-        from playwright.async_api import async_playwright
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
+        info: Optional[Dict[str, Any]] = None
+        if self.read_mode == "http":
+            info = await self._get_event_info_http(event_url)
+        if info is None:
+            info = await self._get_event_info_browser(event_url)
+        if self.index is not None:
+            await self.index.run(self.index.record_info, info)
+        return info
+
+    async def _get_event_info_http(self, event_url: str) -> Optional[Dict[str, Any]]:
+        """
+        ブラウザを使わずに HTML を取得・解析してイベント情報を返します。
+
+        候補日程が見つからない場合や通信に失敗した場合は None を返し、
+        呼び出し元でブラウザ経由の取得にフォールバックさせます。
+        """
+        try:
+            markup = await self._fetch_text(event_url)
+        except NetworkError as e:
+            logger.warning(f"HTTP fast path failed for {event_url}; falling back to browser: {e}")
+            return None
+
+        with phase("parse"):
+            info = extract_event_info_markup(markup)
+        if not info["dates"]:
+            logger.info(f"HTTP fast path found no candidate dates for {event_url}; falling back to browser")
+            return None
+
+        logger.info(f"Retrieved event '{info['title']}' with {len(info['dates'])} candidate dates (http).")
+        return {
+            "title": info["title"],
+            "dates": info["dates"],
+            "url": event_url
+        }
+
+    async def _get_event_info_browser(self, event_url: str) -> Dict[str, Any]:
+        """Playwright でページを描画してイベント情報を取得します (遅い場合は別のコンテキストでヘッジする)。"""
+        return await self.hedging.hedge(
+            "get_event_info", lambda: self._get_event_info_browser_once(event_url), self._has_spare_capacity
+        )
+
+    async def _get_event_info_browser_once(self, event_url: str) -> Dict[str, Any]:
+        async with self._browser_page("get_event_info") as page:
             try:
-                page = await browser.new_page()
-                page.set_default_timeout(self.timeout)
-                await page.goto(event_url, wait_until="domcontentloaded")
-                
-                # タイトル取得
-                title = ""
-                if await page.locator('h1').count() > 0:
-                    title = (await page.locator('h1').inner_text()).strip()
-                elif await page.locator('.event-name').count() > 0:
-                    title = (await page.locator('.event-name').inner_text()).strip()
-                
-                # 日程リスト取得
-                dates: List[str] = []
-                nittei_locator = page.locator('#nittei tr td:first-child')
-                nittei_count = await nittei_locator.count()
-                
-                if nittei_count > 0:
-                    for i in range(nittei_count):
-                        td_text = (await nittei_locator.nth(i).inner_text()).strip()
-                        if td_text and td_text != "日程":
-                            dates.append(td_text)
-
-                if not dates:
-                    # フォールバックセレクタ
-                    th_locator = page.locator('#attendance-table th.valign-middle')
-                    th_count = await th_locator.count()
-                    if th_count > 2:
-                        for i in range(2, th_count):
-                            text = (await th_locator.nth(i).inner_text()).strip()
-                            if text:
-                                dates.append(text)
-                
+                with phase("goto"):
+                    await page.goto(event_url, wait_until="domcontentloaded", timeout=self._step_timeout())
+
+                # タイトルと日程を 1 回の evaluate でまとめて取得
+                with phase("extract"):
+                    extracted = await page.evaluate(scripts.EXTRACT_EVENT_INFO)
+                title = extracted.get("title", "")
+                dates: List[str] = extracted.get("dates", [])
+
                 logger.info(f"Retrieved event '{title}' with {len(dates)} candidate dates.")
                 return {
                     "title": title,
@@ -231,17 +872,197 @@ class ChouseisanClient:
                 logger.exception(f"Failed to fetch event info for {event_url}")
                 if isinstance(e, ChouseisanError):
                     raise
+                check_deadline("イベント情報の取得")
                 raise ChouseisanError(f"イベント情報の取得に失敗しました: {e}") from e
-            finally:
-                await browser.close()
 
+    @_client_call("get_responses")
+    async def get_responses(self, event_url: str, deadline: Optional[float] = None) -> AttendanceMatrix:
+        """
+        出欠表全体 (回答者 × 日程の ○/△/× とコメント) を取得します。
+
+        Args:
+            event_url (str): イベントのURL
+            deadline (Optional[float], optional): 操作全体の制限時間 (秒)。None の場合は call_timeout
+
+        Returns:
+            AttendanceMatrix: 出欠行列 (日程ごとの集計や候補日程のランキングを計算可能)
+
+        Raises:
+            ChouseisanError: 出欠表の取得に失敗した場合
+        """
+        if not event_url or not event_url.startswith("http"):
+            raise ChouseisanError(f"無効なURLフォーマットです: {event_url}")
+        return await self._load_attendance(event_url)
+
+    @_client_call("watch_event")
+    async def watch_event(
+        self,
+        event_url: str,
+        cursor: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        前回の確認 (cursor) 以降に出欠表で変化した部分だけを返します。
+
+        出欠表を取得して候補日程と回答者ごとの行のハッシュ (指紋) を計算し、
+        cursor の時点の指紋と比較します。変化がなければ差分は空で、ハッシュの比較だけで済みます。
+
+        Args:
+            event_url (str): イベントのURL
+            cursor (Optional[str], optional): 前回の結果で受け取ったカーソル。
+                None または履歴に残っていない場合は出欠表全体を返す
+            deadline (Optional[float], optional): 操作全体の制限時間 (秒)。None の場合は call_timeout
+
+        Returns:
+            Dict[str, Any]: 差分 (cursor, changed, reset, dates, dates_added, dates_removed,
+                respondents_added, respondents_changed, respondents_removed など。
+                詳細は EventWatcher.observe を参照)
+
+        Raises:
+            ChouseisanError: 出欠表の取得に失敗した場合
+        """
+        if not event_url or not event_url.startswith("http"):
+            raise ChouseisanError(f"無効なURLフォーマットです: {event_url}")
+        matrix = await self._load_attendance(event_url)
+        with phase("diff"):
+            delta = self.watcher.observe(normalize_event_url(event_url), matrix, cursor)
+        logger.info(f"Watched {event_url}: changed={delta['changed']} reset={delta['reset']}")
+        return delta
+
+    async def _load_attendance(self, event_url: str) -> AttendanceMatrix:
+        logger.info(f"Fetching attendance table: {event_url}")
+        matrix: Optional[AttendanceMatrix] = None
+        if self.read_mode == "http":
+            try:
+                markup = await self._fetch_text(event_url)
+                with phase("parse"):
+                    matrix = extract_attendance(markup)
+            except NetworkError as e:
+                logger.warning(f"HTTP fast path failed for {event_url}; falling back to browser: {e}")
+            if matrix is not None and not matrix.dates:
+                logger.info(f"HTTP fast path found no candidate dates for {event_url}; falling back to browser")
+                matrix = None
+
+        if matrix is None:
+            markup = await self._get_page_html_browser(event_url)
+            with phase("parse"):
+                matrix = extract_attendance(markup)
+        if matrix is None:
+            raise ScrapingError("出欠表が見つかりませんでした。")
+
+        matrix.url = event_url
+        logger.info(f"Retrieved attendance for {len(matrix.respondents)} respondents x {len(matrix.dates)} dates.")
+        if self.index is not None:
+            await self.index.run(self.index.record_attendance, matrix)
+        return matrix
+
+    async def _get_page_html_browser(self, event_url: str) -> str:
+        """Playwright でページを開き、描画後の HTML を返します (遅い場合は別のコンテキストでヘッジする)。"""
+        return await self.hedging.hedge(
+            "get_responses", lambda: self._get_page_html_browser_once(event_url), self._has_spare_capacity
+        )
+
+    async def _get_page_html_browser_once(self, event_url: str) -> str:
+        async with self._browser_page("get_responses") as page:
+            try:
+                with phase("goto"):
+                    await page.goto(event_url, wait_until="domcontentloaded", timeout=self._step_timeout())
+                with phase("content"):
+                    return await page.content()
+            except Exception as e:
+                logger.exception(f"Failed to load page {event_url}")
+                if isinstance(e, ChouseisanError):
+                    raise
+                check_deadline("ページの取得")
+                raise ChouseisanError(f"ページの取得に失敗しました: {e}") from e
+
+    @_client_call("list_events", default_deadline=False)
+    async def list_events(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        created_only: bool = False,
+        limit: int = 50,
+        max_age: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        このサーバーで作成・取得したイベントの記録を、追加日時 (作成したイベントは作成日時) の新しい順に返します。
+
+        記録だけから応答するため、通常は調整さんへのアクセスを行いません。
+
+        Args:
+            since (Optional[float], optional): この UNIX 時刻以降に追加・作成されたものに限る
+            until (Optional[float], optional): この UNIX 時刻より前に追加・作成されたものに限る
+            created_only (bool, optional): このサーバーで作成したイベントに限る
+            limit (int, optional): 最大件数
+            max_age (Optional[float], optional): 指定した場合、最終取得からこの秒数を超えた記録だけを取得し直してから返す
+            deadline (Optional[float], optional):
+                取得し直す場合の全体の制限時間 (秒)。None の場合はイベントごとに call_timeout を適用する
+
+        Returns:
+            List[Dict[str, Any]]: イベントごとの記録 (url, title, memo, dates, created, added_at,
+                fetched_at, respondents, responses_at)
+
+        Raises:
+            ChouseisanError: イベントの記録が無効な場合
+        """
+        index = self._require_index()
+        entries = await index.run(index.list_events, since=since, until=until, created_only=created_only, limit=limit)
+        if max_age is not None and await refresh_stale_entries(
+            lambda url: self.get_event_info(url, max_age=max_age), entries, max_age, self.batch_concurrency
+        ):
+            entries = await index.run(index.list_events, since=since, until=until, created_only=created_only, limit=limit)
+        return entries
+
+    @_client_call("search_events", default_deadline=False)
+    async def search_events(
+        self,
+        query: str = "",
+        date: Optional[str] = None,
+        limit: int = 50,
+        max_age: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        記録されたイベントをタイトル・候補日程で検索します。
+
+        Args:
+            query (str, optional): タイトルまたは候補日程に含まれる文字列
+            date (Optional[str], optional): 候補日程の前方一致 (例: "3/1")
+            limit (int, optional): 最大件数
+            max_age (Optional[float], optional): 指定した場合、最終取得からこの秒数を超えた記録だけを取得し直してから返す
+            deadline (Optional[float], optional):
+                取得し直す場合の全体の制限時間 (秒)。None の場合はイベントごとに call_timeout を適用する
+
+        Returns:
+            List[Dict[str, Any]]: list_events と同じ形式の記録
+
+        Raises:
+            ChouseisanError: イベントの記録が無効な場合
+        """
+        index = self._require_index()
+        entries = await index.run(index.search_events, query=query, date=date, limit=limit)
+        if max_age is not None and await refresh_stale_entries(
+            lambda url: self.get_event_info(url, max_age=max_age), entries, max_age, self.batch_concurrency
+        ):
+            entries = await index.run(index.search_events, query=query, date=date, limit=limit)
+        return entries
+
+    def _require_index(self) -> EventIndex:
+        if self.index is None:
+            raise ChouseisanError("イベントの記録が無効になっています (EVENT_INDEX=false)。")
+        return self.index
+
+    @_client_call("add_response")
     async def add_response(
         self,
         event_url: str,
         name: str,
         comment: str = "",
-        availability: Optional[Union[List[Any], str]] = None
-    ) -> bool:
+        availability: Optional[Union[List[Any], str]] = None,
+        deadline: Optional[float] = None
+    ) -> ResponseResult:
         """
         イベントに出欠回答を追加・更新します。
 
@@ -252,9 +1073,10 @@ class ChouseisanClient:
             availability (Optional[Union[List[Any], str]], optional):
                 各日程の出欠回答。
                 リスト ([2, 1, 0] や ["○", "△", "×"]), または JSON文字列/カンマ区切り文字列
+            deadline (Optional[float], optional): 操作全体の制限時間 (秒)。None の場合は call_timeout
 
         Returns:
-            bool: 登録に成功した場合は True
+            ResponseResult: 登録に成功した場合は真。入力できなかった日程があれば warnings に含む
 
         Raises:
             ChouseisanError: 出欠登録に失敗した場合
@@ -267,61 +1089,363 @@ class ChouseisanClient:
         avail_list = parse_availability_list(availability)
         logger.info(f"Adding response for '{name}' to {event_url} (availability: {avail_list})")
 
-        from playwright.async_api import async_playwright
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
+        key = normalize_event_url(event_url)
+        try:
+            async with self.scheduler.exclusive(key, "add_response"):
+                warnings = await self.hedging.retry(
+                    "add_response", lambda: self._add_response_once(event_url, name, comment, avail_list)
+                )
+                return ResponseResult(True, warnings)
+        finally:
+            # 送信後に失敗した場合も登録されている可能性があるため、常にキャッシュを無効化する
+            self.cache.invalidate(key)
+
+    @_client_call("add_responses", default_deadline=False)
+    async def add_responses(
+        self,
+        event_url: str,
+        entries: Union[List[Dict[str, Any]], str],
+        on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        複数の回答者の出欠を 1 つのセッションで順番に登録します。
+
+        ブラウザを使う場合は 1 つの Page を使い回し (回答者ごとに Cookie は破棄)、
+        1 件の失敗で一括登録全体を中断することはありません。
+
+        Args:
+            event_url (str): イベントのURL
+            entries (Union[List[Dict[str, Any]], str]):
+                {name, comment, availability} 形式の辞書のリスト、またはその JSON 文字列。
+                availability は add_response と同じ形式で指定できます
+            on_result (Optional[Callable], optional):
+                各エントリの処理が終わるたびに結果を受け取るコールバック
+            deadline (Optional[float], optional):
+                一括登録全体の制限時間 (秒)。None の場合は全体の制限を設けず、
+                エントリごとに call_timeout を適用する
+
+        Returns:
+            List[Dict[str, Any]]: 入力順に並んだ各エントリの結果
+                - index: エントリの位置 (0 始まり)
+                - name: 回答者の名前
+                - success: 登録に成功した場合は True
+                - error: 失敗した場合のエラーメッセージ (成功時は None)
+                - warnings: 入力できなかった日程などの警告 (ない場合は空のリスト)
+
+        Raises:
+            ChouseisanError: URL やエントリ一覧の形式が不正な場合
+        """
+        if not event_url or not event_url.startswith("http"):
+            raise ChouseisanError(f"無効なURLフォーマットです: {event_url}")
+
+        items = parse_response_entries(entries)
+        results: List[Dict[str, Any]] = []
+        # 送信を始める前に、各エントリの出欠の数を候補日程の数と照合する
+        dates = await self._candidate_dates(event_url)
+
+        async def report(
+            index: int, name: str, error: Optional[str] = None, warnings: Optional[List[str]] = None
+        ) -> None:
+            result = {
+                "index": index, "name": name, "success": error is None, "error": error, "warnings": warnings or []
+            }
+            results.append(result)
+            if on_result is not None:
+                await on_result(result)
+
+        pending: List[Tuple[int, str, str, List[int]]] = []
+        for index, entry in enumerate(items):
+            if not isinstance(entry, dict):
+                await report(index, "", "エントリはオブジェクトで指定してください。")
+                continue
+            name = str(entry.get("name") or "").strip()
+            if not name:
+                await report(index, name, "回答者名は必須です。")
+                continue
+            comment = str(entry.get("comment") or "")
+            avail_list = parse_availability_list(entry.get("availability"))
+            if dates is not None and len(avail_list) > len(dates):
+                await report(index, name, f"出欠の数 ({len(avail_list)}) が候補日程の数 ({len(dates)}) を超えています。")
+                continue
+            pending.append((index, name, comment, avail_list))
+
+        logger.info(f"Adding {len(pending)} responses to {event_url} in one session")
+        key = normalize_event_url(event_url)
+        try:
+            async with self.scheduler.exclusive(key, "add_responses"):
+                browser_items: List[Tuple[int, str, str, List[int]]] = []
+                use_http = self.write_mode == "http"
+                for item in pending:
+                    if not use_http:
+                        browser_items.append(item)
+                        continue
+                    index, name, comment, avail_list = item
+                    try:
+                        # 一括登録全体の期限とは別に、エントリごとに call_timeout を適用する
+                        with deadline_scope(self.call_timeout):
+                            await self.hedging.retry(
+                                "add_responses", lambda: self._add_response_http(event_url, name, comment, avail_list)
+                            )
+                        await report(index, name)
+                    except AvailabilityFieldError as e:
+                        # 日程の入力欄の不一致はこのエントリだけブラウザで処理する
+                        logger.warning(f"Form POST is not applicable for '{name}'; falling back to browser: {e}")
+                        browser_items.append(item)
+                    except FormShapeError as e:
+                        # 回答フォーム自体がない場合はイベント単位で共通のため、以降のエントリもブラウザで処理する
+                        logger.warning(f"Form POST is not applicable for {event_url}; falling back to browser: {e}")
+                        use_http = False
+                        browser_items.append(item)
+                    except ChouseisanError as e:
+                        await report(index, name, str(e))
+
+                if browser_items:
+                    await self._add_responses_browser(event_url, browser_items, report)
+        finally:
+            self.cache.invalidate(key)
+
+        results.sort(key=lambda r: r["index"])
+        succeeded = sum(1 for r in results if r["success"])
+        logger.info(f"Registered {succeeded}/{len(results)} responses for {event_url}")
+        return results
+
+    async def _candidate_dates(self, event_url: str) -> Optional[List[str]]:
+        """入力の検証に使う候補日程 (キャッシュを利用)。取得できない場合は None"""
+        try:
+            with deadline_scope(self.call_timeout):
+                info = await self.cache.get_or_fetch(
+                    normalize_event_url(event_url), lambda: self._fetch_event_info(event_url)
+                )
+        except Exception as e:
+            logger.warning(f"Could not load candidate dates of {event_url}; skipping availability validation: {e}")
+            return None
+        return info["dates"] or None
+
+    async def _add_responses_browser(
+        self,
+        event_url: str,
+        items: List[Tuple[int, str, str, List[int]]],
+        report: Callable[..., Awaitable[None]]
+    ) -> None:
+        """1 つの Page を使い回して複数の回答を順番に登録します。"""
+        remaining = list(items)
+        while remaining:
             try:
-                page = await browser.new_page()
-                page.set_default_timeout(self.timeout)
-                await page.goto(event_url, wait_until="domcontentloaded")
-                
-                # "出欠を入力する" ボタンをクリック
-                add_btn = page.locator('#add_btn, button:has-text("出欠を入力する")').first
-                if await add_btn.count() > 0:
-                    await add_btn.click()
-                else:
-                    raise ScrapingError("出欠入力ボタンが見つかりませんでした。")
-                
-                # フォーム待機
-                await page.wait_for_selector('input[name="name"]', timeout=self.timeout)
-                
-                # 名前およびコメント入力
-                await page.fill('input[name="name"]', name)
-                
-                if await page.locator('input[name="hitokoto"]').count() > 0:
-                    await page.fill('input[name="hitokoto"]', comment)
-
-                # 出欠の入力 (2: ○, 1: △, 0: ×)
-                # ボタンクラス対応: 2 -> .oax-0, 1 -> .oax-1, 0 -> .oax-2
-                button_class_map = {2: "oax-0", 1: "oax-1", 0: "oax-2"}
-                
-                for i, status in enumerate(avail_list):
-                    field_name = f"kouho{i+1}"
-                    if await page.locator(f'input[name="{field_name}"]').count() > 0:
-                        btn_class = button_class_map.get(status, "oax-2")
-                        await page.evaluate(f'''() => {{
-                            const input = document.querySelector('input[name="{field_name}"]');
-                            if (input && input.parentElement) {{
-                                const btn = input.parentElement.querySelector('.{btn_class}');
-                                if (btn) btn.click();
-                            }}
-                        }}''')
-                        await page.wait_for_timeout(50)
-
-                # 保存ボタンをクリック
-                save_btn = page.locator('#memUpdBtn, input[value="入力する"], button:has-text("入力する")').first
-                if await save_btn.count() > 0:
-                    await save_btn.click()
-                else:
-                    raise ScrapingError("保存ボタンが見つかりませんでした。")
-                
-                await page.wait_for_load_state("domcontentloaded")
+                async with self._browser_page("add_responses") as page:
+                    while remaining:
+                        index, name, comment, avail_list = remaining.pop(0)
+
+                        async def submit() -> List[str]:
+                            # 前の回答者のセッションを持ち越さない
+                            await page.context.clear_cookies()
+                            return await self._submit_response_on_page(page, event_url, name, comment, avail_list)
+
+                        try:
+                            with deadline_scope(self.call_timeout):
+                                warnings = await self.hedging.retry("add_responses", submit)
+                            await report(index, name, warnings=warnings)
+                        except Exception as e:
+                            logger.exception(f"Failed to add response for '{name}'")
+                            await report(index, name, f"出欠の登録に失敗しました: {e}")
+                            if page.is_closed():
+                                # ページが失われた場合は新しいコンテキストで続行する
+                                break
+            except Exception as e:
+                logger.exception("Failed to lease a browser page for bulk responses")
+                for index, name, _, _ in remaining:
+                    await report(index, name, f"ブラウザを利用できません: {e}")
+                return
+
+    async def _add_response_once(self, event_url: str, name: str, comment: str, avail_list: List[int]) -> List[str]:
+        """回答を 1 回送信し、入力できなかった日程ごとの警告を返します (HTTP で送信できた場合は常に空)。"""
+        if self.write_mode == "http":
+            try:
+                await self._add_response_http(event_url, name, comment, avail_list)
+                return []
+            except FormShapeError as e:
+                logger.warning(f"Form POST is not applicable for {event_url}; falling back to browser: {e}")
+        return await self._add_response_browser(event_url, name, comment, avail_list)
+
+    async def _add_response_http(self, event_url: str, name: str, comment: str, avail_list: List[int]) -> bool:
+        """
+        イベントページの出欠フォームを直接 POST して回答を登録します。
+
+        送信前にフォーム構造の不一致を検出した場合は FormShapeError を送出します
+        (回答フォームはあるが日程の入力欄が一致しない場合は AvailabilityFieldError)。
+        """
+        async with self._http.isolated() as http:
+            with phase("load_form"):
+                try:
+                    response = await request(http, "GET", event_url)
+                except NetworkError as e:
+                    raise NotSubmittedError(f"出欠フォームの取得に失敗しました: {e}") from e
+                page_url = str(response.url)
+                doc = parse_html(response.text)
+                # 回答フォーム自体がない場合はイベント単位で HTTP 送信を諦める (FormShapeError)
+                form = find_form(doc, page_url, ["name"])
+                field_names = [f"kouho{i+1}" for i in range(len(avail_list))]
+                try:
+                    form = find_form(doc, page_url, ["name", *field_names])
+                except FormShapeError as e:
+                    raise AvailabilityFieldError(str(e)) from e
+
+            values = {"name": name}
+            if form.input("hitokoto") is not None:
+                values["hitokoto"] = comment
+            for field_name, status in zip(field_names, avail_list):
+                try:
+                    values[field_name] = availability_value(form, field_name, status)
+                except FormShapeError as e:
+                    raise AvailabilityFieldError(str(e)) from e
+
+            headers = {"Referer": page_url}
+            csrf_token = find_csrf_token(doc)
+            if csrf_token:
+                headers["X-CSRF-Token"] = csrf_token
+
+            try:
+                with phase("submit"):
+                    response = await post_form(http, form.action, form.build(values), headers)
+                self._check_response_accepted(response, name, comment, avail_list)
+            except Exception as e:
+                logger.exception("Failed to add response via form POST")
+                if isinstance(e, ChouseisanError):
+                    raise
+                raise ChouseisanError(f"出欠の登録に失敗しました: {e}") from e
+
+        logger.info(f"Successfully registered availability for '{name}' (http)")
+        return True
+
+    def _check_response_accepted(
+        self, response: "httpx.Response", name: str, comment: str, avail_list: List[int]
+    ) -> None:
+        """
+        出欠フォーム送信の応答が登録の完了を示しているか確認します。
+
+        イベントページ (s?h=) へのリダイレクト、または送信した内容 (出欠とコメント) どおりの回答者の行が
+        出欠表に含まれるページを完了とみなします。既存の回答者の更新が拒否されてフォームが再表示された場合は
+        以前の行が残っているため、名前だけでは判定しません。
+        入力エラーでフォームが再表示された場合や、トップページ等へ遷移した場合は ScrapingError を送出します。
+        """
+        location = response.headers.get("location")
+        if response.is_redirect:
+            if location and "s?h=" in str(response.url.join(location)):
+                return
+            raise ScrapingError(f"出欠の登録後に想定外のページへ遷移しました: {location}")
+        matrix = extract_attendance(response.text)
+        if matrix is not None:
+            expected_comment = " ".join(comment.split())
+            for i, respondent in enumerate(matrix.respondents):
+                if respondent != name or matrix.row(i)[:len(avail_list)] != avail_list:
+                    continue
+                if not expected_comment or matrix.comments[i] == expected_comment:
+                    return
+        raise ScrapingError(f"出欠の登録が受け付けられませんでした (応答: {response.status_code})。")
+
+    async def _add_response_browser(self, event_url: str, name: str, comment: str, avail_list: List[int]) -> List[str]:
+        """Playwright で出欠フォームを操作して回答を登録し、入力できなかった日程ごとの警告を返します。"""
+        async with self._browser_page("add_response") as page:
+            try:
+                warnings = await self._submit_response_on_page(page, event_url, name, comment, avail_list)
                 logger.info(f"Successfully registered availability for '{name}'")
-                return True
+                return warnings
             except Exception as e:
                 logger.exception("Failed to add response")
                 if isinstance(e, ChouseisanError):
                     raise
+                check_deadline("出欠の登録")
                 raise ChouseisanError(f"出欠の登録に失敗しました: {e}") from e
-            finally:
-                await browser.close()
+
+    async def _submit_response_on_page(
+        self,
+        page: "Page",
+        event_url: str,
+        name: str,
+        comment: str,
+        avail_list: List[int]
+    ) -> List[str]:
+        """
+        貸し出された Page 上でイベントページを開き、出欠フォームを入力・送信します。
+
+        保存ボタンを押す前に Playwright の操作が失敗した場合は NotSubmittedError を送出します。
+
+        Returns:
+            List[str]: 入力できなかった日程ごとの警告 (すべて入力できた場合は空)
+        """
+        try:
+            warnings = await self._fill_response_form(page, event_url, name, comment, avail_list)
+        except Exception as e:
+            if isinstance(e, ChouseisanError):
+                raise
+            check_deadline("出欠の登録")
+            raise NotSubmittedError(f"出欠の登録に失敗しました (未送信): {e}") from e
+
+        # 保存ボタンをクリック
+        with phase("submit"):
+            save_btn = page.locator('#memUpdBtn, input[value="入力する"], button:has-text("入力する")').first
+            if await save_btn.count() > 0:
+                await save_btn.click(timeout=self._step_timeout())
+            else:
+                raise ScrapingError("保存ボタンが見つかりませんでした。")
+
+            await page.wait_for_load_state("domcontentloaded", timeout=self._step_timeout())
+        return warnings
+
+    async def _fill_response_form(
+        self,
+        page: "Page",
+        event_url: str,
+        name: str,
+        comment: str,
+        avail_list: List[int]
+    ) -> List[str]:
+        """
+        イベントページを開き、出欠フォームを入力します (送信はしない)。
+
+        Returns:
+            List[str]: 入力欄または出欠ボタンが見つからず入力できなかった日程ごとの警告
+        """
+        with phase("goto"):
+            await page.goto(event_url, wait_until="domcontentloaded", timeout=self._step_timeout())
+
+        # "出欠を入力する" ボタンをクリックし、フォームを待機
+        with phase("open_form"):
+            add_btn = page.locator('#add_btn, button:has-text("出欠を入力する")').first
+            if await add_btn.count() > 0:
+                await add_btn.click(timeout=self._step_timeout())
+            else:
+                raise ScrapingError("出欠入力ボタンが見つかりませんでした。")
+
+            await page.wait_for_selector('input[name="name"]', timeout=self._step_timeout())
+
+        with phase("fill_form"):
+            # 名前およびコメント入力
+            await page.fill('input[name="name"]', name, timeout=self._step_timeout())
+
+            if await page.locator('input[name="hitokoto"]').count() > 0:
+                await page.fill('input[name="hitokoto"]', comment, timeout=self._step_timeout())
+
+            # 出欠の入力 (2: ○, 1: △, 0: ×) を 1 回の evaluate でまとめて適用
+            warnings: List[str] = []
+            if avail_list:
+                applied = await page.evaluate(scripts.APPLY_AVAILABILITY, {
+                    "statuses": avail_list,
+                    "classes": {str(k): v for k, v in AVAILABILITY_BUTTON_CLASSES.items()},
+                })
+                warnings.extend(
+                    f"日程 {i + 1} (kouho{i + 1}) の入力欄が見つからないため入力できませんでした。"
+                    for i in applied["missingInput"]
+                )
+                warnings.extend(
+                    f"日程 {i + 1} (kouho{i + 1}) の出欠ボタン "
+                    f".{AVAILABILITY_BUTTON_CLASSES.get(avail_list[i], 'oax-2')} が見つからないため入力できませんでした。"
+                    for i in applied["missingButton"]
+                )
+                if warnings:
+                    logger.warning(
+                        f"Some availability fields could not be applied for '{name}': "
+                        f"missing inputs={[f'kouho{i+1}' for i in applied['missingInput']]}, "
+                        f"missing buttons={[f'kouho{i+1}' for i in applied['missingButton']]}"
+                    )
+        return warnings
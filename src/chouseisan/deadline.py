@@ -0,0 +1,112 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional, Sequence, Tuple
+
+from .errors import ChouseisanError, DeadlineExceededError
+
+
+class Deadline:
+    """1 回のクライアント操作全体に許される残り時間"""
+    __slots__ = ("budget", "expires_at")
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """残り秒数 (期限切れの場合は 0)"""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("chouseisan_deadline", default=None)
+
+
+def current() -> Optional[Deadline]:
+    """実行中の操作の期限 (設定されていない場合は None)"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(budget: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    ブロック内の処理に期限を設定します。
+
+    外側ですでに期限が設定されている場合は、より早い方の期限が適用されます。
+    budget が None の場合は外側の期限をそのまま引き継ぎます。
+    """
+    outer = _current_deadline.get()
+    if budget is None or (outer is not None and outer.remaining() <= budget):
+        yield outer
+        return
+    token = _current_deadline.set(Deadline(budget))
+    try:
+        yield _current_deadline.get()
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining(default: float) -> float:
+    """default 秒と、期限までの残り秒数のうち短い方を返します。"""
+    deadline = _current_deadline.get()
+    return default if deadline is None else min(default, deadline.remaining())
+
+
+def step_timeout_ms(default_ms: float) -> float:
+    """
+    Playwright の各操作に渡すタイムアウト (ミリ秒)。
+
+    Playwright では 0 がタイムアウトなしを意味するため、期限切れ間近でも 1 ミリ秒以上を返します。
+    """
+    return max(remaining(default_ms / 1000) * 1000, 1.0)
+
+
+def check(step: str) -> None:
+    """
+    期限を過ぎていれば DeadlineExceededError を送出します。
+
+    Args:
+        step: 中断した処理の説明 (エラーメッセージに使用)
+    """
+    deadline = _current_deadline.get()
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceededError(
+            f"{step}が制限時間 ({deadline.budget:g} 秒) 内に完了しませんでした。"
+        )
+
+
+async def first_success(awaitables: Sequence[Awaitable[Any]]) -> Tuple[int, Any]:
+    """
+    複数の待機を同時に開始し、最初に成功したもののインデックスと結果を返します。
+
+    残りの待機は取り消されます。すべて失敗した場合は最後に失敗した例外を送出し、
+    失敗したものがなくすべて取り消された場合 (内側の処理が取り消された等) は ChouseisanError を送出します。
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in awaitables]
+    pending = set(tasks)
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in tasks:
+                if task not in done:
+                    continue
+                if task.cancelled():
+                    continue
+                exc = task.exception()
+                if exc is None:
+                    return tasks.index(task), task.result()
+                error = exc
+        if error is None:
+            raise ChouseisanError("待機していた処理がすべて取り消されました。")
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
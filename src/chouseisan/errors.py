@@ -0,0 +1,31 @@
+class ChouseisanError(Exception):
+    """調整さんクライアントの基底例外クラス"""
+    pass
+
+class NetworkError(ChouseisanError):
+    """ネットワーク通信エラー"""
+    pass
+
+class ScrapingError(ChouseisanError):
+    """スクレイピングエラー"""
+    pass
+
+class FormShapeError(ScrapingError):
+    """フォーム構造が想定と異なり、HTTP での直接送信ができないエラー"""
+    pass
+
+class AvailabilityFieldError(FormShapeError):
+    """出欠フォーム自体はあるが、日程の入力欄・出欠ボタンの構造が想定と異なるエラー"""
+    pass
+
+class OverloadedError(ChouseisanError):
+    """同時実行数・待機キューの上限により処理を受け付けられないエラー"""
+    pass
+
+class DeadlineExceededError(ChouseisanError):
+    """操作全体の制限時間を超えたエラー"""
+    pass
+
+class NotSubmittedError(ChouseisanError):
+    """フォームの送信前に失敗し、作成・登録が行われていないことが確実なエラー (安全に再試行できる)"""
+    pass
@@ -0,0 +1,143 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from .errors import FormShapeError
+from .parser import Element
+
+# 送信値に含めない input の type
+_SKIPPED_INPUT_TYPES = frozenset({"submit", "button", "image", "reset", "file"})
+
+# CSRF トークンを埋め込む meta 要素の name
+_CSRF_META_NAMES = ("csrf-token", "csrf_token", "_csrf")
+
+# 出欠ボタンのクラス (2: ○, 1: △, 0: ×)
+AVAILABILITY_BUTTON_CLASSES = {2: "oax-0", 1: "oax-1", 0: "oax-2"}
+
+
+class HtmlForm:
+    """ページから抽出した送信可能な HTML フォーム"""
+
+    def __init__(self, element: Element, page_url: str):
+        self.element = element
+        self.method = element.get("method", "get").lower()
+        self.action = urljoin(page_url, element.get("action") or page_url)
+        self.fields: List[Tuple[str, str]] = list(_collect_fields(element))
+
+    @property
+    def field_names(self) -> List[str]:
+        return [name for name, _ in self.fields]
+
+    def has_field(self, name: str) -> bool:
+        return any(n == name for n, _ in self.fields)
+
+    def input(self, name: str) -> Optional[Element]:
+        """name 属性に一致するフォーム内の入力要素を返します。"""
+        return self.element.find(predicate=lambda el: el.tag in ("input", "textarea", "select") and el.get("name") == name)
+
+    def build(self, values: Dict[str, str]) -> List[Tuple[str, str]]:
+        """
+        既存のフィールド (hidden 値や CSRF トークンを含む) に values を上書きした送信データを返します。
+        """
+        data: List[Tuple[str, str]] = []
+        seen = set()
+        for name, value in self.fields:
+            if name in values:
+                if name in seen:
+                    continue
+                seen.add(name)
+                data.append((name, values[name]))
+            else:
+                data.append((name, value))
+        for name, value in values.items():
+            if name not in seen:
+                data.append((name, value))
+        return data
+
+
+def _collect_fields(form: Element) -> Iterable[Tuple[str, str]]:
+    for el in form.iter():
+        name = el.get("name")
+        if not name:
+            continue
+        if el.tag == "input":
+            input_type = el.get("type", "text").lower()
+            if input_type in _SKIPPED_INPUT_TYPES:
+                continue
+            if input_type in ("checkbox", "radio") and "checked" not in el.attrs:
+                continue
+            yield name, el.get("value")
+        elif el.tag == "textarea":
+            yield name, el.text()
+        elif el.tag == "select":
+            options = el.find_all("option")
+            selected = [o for o in options if "selected" in o.attrs] or options[:1]
+            for option in selected:
+                yield name, option.get("value", option.text())
+
+
+def find_form(doc: Element, page_url: str, required_fields: Iterable[str]) -> HtmlForm:
+    """
+    必須フィールドをすべて含む POST フォームを探します。
+
+    Args:
+        doc: ページ全体の要素ツリー
+        page_url: ページの URL (action の相対パス解決に使用)
+        required_fields: フォームに含まれている必要がある name 属性
+
+    Returns:
+        HtmlForm: 見つかったフォーム
+
+    Raises:
+        FormShapeError: 条件に一致するフォームが見つからない場合
+    """
+    required = list(required_fields)
+    for el in doc.find_all("form"):
+        form = HtmlForm(el, page_url)
+        if all(form.input(name) is not None for name in required):
+            if form.method != "post":
+                raise FormShapeError(f"フォームの送信メソッドが POST ではありません: {form.method}")
+            return form
+    raise FormShapeError(f"必要な入力項目 {required} を含むフォームが見つかりませんでした。")
+
+
+def find_csrf_token(doc: Element) -> Optional[str]:
+    """meta 要素に埋め込まれた CSRF トークンを返します。"""
+    for meta in doc.find_all("meta"):
+        if meta.get("name").lower() in _CSRF_META_NAMES and meta.get("content"):
+            return meta.get("content")
+    return None
+
+
+def availability_value(form: HtmlForm, field_name: str, status: int) -> str:
+    """
+    出欠ボタンに対応する kouhoN フィールドの送信値を求めます。
+
+    ブラウザでは kouhoN 入力と同じ親要素内の ``.oax-*`` ボタンをクリックして値を設定するため、
+    そのボタンの value (または data-value) 属性を送信値として使用します。
+
+    Raises:
+        FormShapeError: 入力欄またはボタンの値が特定できない場合
+    """
+    field = form.input(field_name)
+    if field is None or field.parent is None:
+        raise FormShapeError(f"入力欄 {field_name} が見つかりませんでした。")
+    btn_class = AVAILABILITY_BUTTON_CLASSES.get(status, "oax-2")
+    button = field.parent.find(cls=btn_class)
+    if button is None:
+        raise FormShapeError(f"入力欄 {field_name} の出欠ボタン .{btn_class} が見つかりませんでした。")
+    value = button.get("data-value") or button.get("value")
+    if not value:
+        raise FormShapeError(f"出欠ボタン .{btn_class} ({field_name}) の送信値が特定できませんでした。")
+    return value
+
+
+def find_event_url(doc: Element, base_url: str) -> Optional[str]:
+    """イベント作成完了ページからイベント URL を探します。"""
+    url_input = doc.find("input", cls="new-event-url-input")
+    if url_input is not None and url_input.get("value"):
+        return urljoin(base_url, url_input.get("value"))
+    for a in doc.find_all("a"):
+        href = a.get("href")
+        if "s?h=" in href:
+            return urljoin(base_url, href)
+    return None
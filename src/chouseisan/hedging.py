@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from . import deadline
+from .errors import DeadlineExceededError, NotSubmittedError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    読み取りのヘッジ実行と、書き込みの安全な再試行の方針。
+
+    - ``hedge``: 冪等な読み取りを開始し、操作ごとの直近の所要時間の ``quantile`` 分位点
+      (サンプルが ``min_samples`` 未満の間は ``initial_delay``。``min_delay``〜``max_delay`` に制限)
+      を過ぎても終わらなければ、2 つ目の試行を並行して開始します。先に成功した方を採用し、
+      もう一方は取り消します。ヘッジ前に 1 つ目が失敗した場合は、すぐに 2 つ目を開始します。
+      ヘッジの数は呼び出し数の ``max_ratio`` 倍までに抑えます。
+    - ``retry``: 書き込みは、送信前に失敗したことが確実な場合 (NotSubmittedError) に限り
+      ``max_retries`` 回まで再試行します。
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        quantile: float = 0.95,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.2,
+        max_delay: float = 10.0,
+        min_samples: int = 20,
+        window: int = 200,
+        max_ratio: float = 0.1,
+        max_retries: int = 1
+    ):
+        self.enabled = enabled
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.max_ratio = max_ratio
+        self.max_retries = max_retries
+        self._samples: Dict[str, Deque[float]] = {}
+        self.calls: "Counter[str]" = Counter()
+        self.hedged: "Counter[str]" = Counter()
+        self.hedge_wins: "Counter[str]" = Counter()
+        self.read_retries: "Counter[str]" = Counter()
+        self.write_retries: "Counter[str]" = Counter()
+        self.write_retry_successes: "Counter[str]" = Counter()
+
+    def observe(self, key: str, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def delay(self, key: str) -> float:
+        """key の試行を何秒待ってからヘッジするか"""
+        samples = self._samples.get(key)
+        if samples is None or len(samples) < self.min_samples:
+            value = self.initial_delay
+        else:
+            ordered = sorted(samples)
+            value = ordered[min(int(len(ordered) * self.quantile), len(ordered) - 1)]
+        return min(max(value, self.min_delay), self.max_delay)
+
+    def _within_budget(self, key: str) -> bool:
+        return self.hedged[key] + self.read_retries[key] < self.max_ratio * self.calls[key] + 1
+
+    async def hedge(
+        self,
+        key: str,
+        attempt: Callable[[], Awaitable[T]],
+        can_hedge: Callable[[], bool] = lambda: True
+    ) -> T:
+        """
+        attempt を実行し、遅い場合や失敗した場合は 2 つ目の試行を並行して行います。
+
+        Args:
+            key: 所要時間とヘッジ数を集計する単位 (操作名など)
+            attempt: 冪等な読み取り処理 (呼び出すたびに新しい試行を開始する)
+            can_hedge: 2 つ目の試行を開始してよいか (ブラウザの空きなど)
+        """
+        self.calls[key] += 1
+        if not self.enabled:
+            return await self._timed(key, attempt)
+
+        tasks: List["asyncio.Task[T]"] = [asyncio.ensure_future(self._timed(key, attempt))]
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=deadline.remaining(self.delay(key)))
+            while True:
+                for task in done:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.hedge_wins[key] += 1
+                        return task.result()
+                    error = task.exception()
+                if len(tasks) == 1 and self._should_start_second(key, error, can_hedge):
+                    if error is None:
+                        self.hedged[key] += 1
+                        logger.info(f"Hedging {key}: first attempt still running after {self.delay(key):.3f}s")
+                    else:
+                        self.read_retries[key] += 1
+                        logger.info(f"Retrying {key} after failure: {error}")
+                    second = asyncio.ensure_future(self._timed(key, attempt))
+                    tasks.append(second)
+                    pending.add(second)
+                if not pending:
+                    assert error is not None
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _should_start_second(self, key: str, error: Optional[BaseException], can_hedge: Callable[[], bool]) -> bool:
+        if isinstance(error, DeadlineExceededError) or not self._within_budget(key):
+            return False
+        current = deadline.current()
+        if current is not None and current.expired:
+            return False
+        return can_hedge()
+
+    async def _timed(self, key: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        # 開始したすべての試行を記録する。取り消された試行 (ヘッジ側が先に終わった等) の経過時間は
+        # 本来の所要時間の下限だが、除くと遅い試行ほど記録から漏れ、ヘッジまでの待ち時間が短く偏る
+        started = time.perf_counter()
+        try:
+            return await attempt()
+        finally:
+            self.observe(key, time.perf_counter() - started)
+
+    async def retry(self, key: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """
+        書き込み処理を実行し、送信前に失敗したことが確実な場合だけ再試行します。
+
+        Args:
+            key: 再試行数を集計する単位 (操作名)
+            attempt: 書き込み処理 (送信前の失敗では NotSubmittedError を送出すること)
+        """
+        retries = 0
+        while True:
+            try:
+                result = await attempt()
+            except NotSubmittedError as e:
+                current = deadline.current()
+                if not self.enabled or retries >= self.max_retries or (current is not None and current.expired):
+                    raise
+                retries += 1
+                self.write_retries[key] += 1
+                logger.warning(f"Retrying {key} (attempt {retries + 1}); the previous attempt failed before submission: {e}")
+                continue
+            if retries:
+                self.write_retry_successes[key] += 1
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hedge_delay_seconds": {key: round(self.delay(key), 6) for key in self._samples},
+            "calls": dict(self.calls),
+            "hedged": dict(self.hedged),
+            "hedge_wins": dict(self.hedge_wins),
+            "read_retries": dict(self.read_retries),
+            "write_retries": dict(self.write_retries),
+            "write_retry_successes": dict(self.write_retry_successes),
+        }
@@ -0,0 +1,182 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import urlencode
+
+from . import deadline
+from .errors import NetworkError
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+DEFAULT_HEADERS = {
+    "User-Agent": DEFAULT_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ja,en;q=0.8",
+}
+
+
+class _BorrowedTransport:
+    """共有コネクションプールを借用し、クライアント終了時にプールを閉じないトランスポート"""
+
+    def __init__(self, transport: Any):
+        self._transport = transport
+
+    async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+        return await self._transport.handle_async_request(request)
+
+    async def __aenter__(self) -> "_BorrowedTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class HttpSession:
+    """
+    調整さんへの HTTP 通信で共有する非同期 HTTP クライアント。
+
+    Keep-Alive による接続の再利用と圧縮転送 (gzip/deflate) を有効にした
+    ``httpx.AsyncClient`` を最初の利用時に生成し、クライアントの終了まで使い回します。
+    """
+
+    def __init__(self, timeout: float = 15.0, max_connections: int = 20):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._transport: Any = None
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    @property
+    def transport(self) -> Any:
+        """全クライアントで共有するコネクションプール"""
+        if self._transport is None:
+            import httpx
+            self._transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._transport
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            self._client = self._new_client()
+        return self._client
+
+    def _new_client(self) -> "httpx.AsyncClient":
+        import httpx
+        return httpx.AsyncClient(
+            transport=_BorrowedTransport(self.transport),
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers=DEFAULT_HEADERS,
+        )
+
+    @asynccontextmanager
+    async def isolated(self) -> AsyncIterator["httpx.AsyncClient"]:
+        """
+        Cookie を他の呼び出しと共有しないクライアントを貸し出します。
+
+        コネクションプールは共有するため、接続の再利用は維持されます。
+        回答者ごとのセッションが混ざらないよう、書き込み操作ではこちらを使用します。
+        """
+        client = self._new_client()
+        try:
+            yield client
+        finally:
+            await client.aclose()
+
+    async def get_text(self, url: str, **kwargs: Any) -> str:
+        """
+        URL を GET し、レスポンス本文を文字列で返します。
+
+        Raises:
+            NetworkError: 通信に失敗した場合、または 4xx/5xx が返された場合
+        """
+        response = await request(self.client, "GET", url, **kwargs)
+        return response.text
+
+    async def warm(self, url: str) -> None:
+        """
+        接続先への接続 (TCP/TLS) を確立し、コネクションプールに保持させます。
+
+        Raises:
+            NetworkError: 通信に失敗した場合
+        """
+        await request(self.client, "HEAD", url, raise_for_status=False, follow_redirects=False)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+async def request(
+    client: "httpx.AsyncClient",
+    method: str,
+    url: str,
+    raise_for_status: bool = True,
+    **kwargs: Any
+) -> "httpx.Response":
+    """
+    HTTP リクエストを送信し、通信エラーを NetworkError に変換します。
+
+    操作全体の期限が設定されている場合、タイムアウトは期限までの残り時間に短縮されます。
+
+    Raises:
+        DeadlineExceededError: 操作全体の期限を過ぎた場合
+        NetworkError: 通信に失敗した場合、または raise_for_status が真で 4xx/5xx が返された場合
+    """
+    import httpx
+    current = deadline.current()
+    if current is not None and "timeout" not in kwargs:
+        deadline.check("HTTP リクエスト")
+        default = client.timeout.read if client.timeout.read is not None else current.remaining()
+        kwargs["timeout"] = deadline.remaining(default)
+    try:
+        response = await client.request(method, url, **kwargs)
+        if raise_for_status and response.status_code >= 400:
+            response.raise_for_status()
+    except httpx.HTTPError as e:
+        if isinstance(e, httpx.TimeoutException):
+            deadline.check("HTTP リクエスト")
+        raise NetworkError(f"HTTP リクエストに失敗しました: {e}") from e
+    return response
+
+
+async def post_form(
+    client: "httpx.AsyncClient",
+    url: str,
+    fields: List[Tuple[str, str]],
+    headers: Optional[Dict[str, str]] = None
+) -> "httpx.Response":
+    """
+    フォームデータを application/x-www-form-urlencoded で POST します。
+
+    同名フィールドの順序を保つため、値はタプルのリストで受け取ります。
+    リダイレクトは追跡せず、サーバーの応答 (Location ヘッダー等) をそのまま返します。
+    """
+    request_headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    if headers:
+        request_headers.update(headers)
+    return await request(
+        client, "POST", url,
+        content=urlencode(fields).encode("utf-8"),
+        headers=request_headers,
+        follow_redirects=False,
+    )
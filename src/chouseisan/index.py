@@ -0,0 +1,282 @@
+import asyncio
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, TYPE_CHECKING
+
+from .cache import normalize_event_url
+
+if TYPE_CHECKING:
+    from .attendance import AttendanceMatrix
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    memo TEXT NOT NULL DEFAULT '',
+    created INTEGER NOT NULL DEFAULT 0,
+    added_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    fetched_at REAL,
+    respondents INTEGER,
+    responses TEXT,
+    responses_at REAL
+);
+CREATE TABLE IF NOT EXISTS event_dates (
+    key TEXT NOT NULL REFERENCES events(key) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (key, position)
+);
+-- タイトルは部分一致 (instr) で検索し索引を使えないため、以前のバージョンで作成した索引は削除する
+DROP INDEX IF EXISTS events_title;
+CREATE INDEX IF NOT EXISTS events_added_at ON events(added_at);
+CREATE INDEX IF NOT EXISTS events_updated_at ON events(updated_at);
+CREATE INDEX IF NOT EXISTS event_dates_date ON event_dates(date);
+"""
+
+_COLUMNS = "key, url, title, memo, created, added_at, updated_at, fetched_at, respondents, responses_at"
+
+
+def _glob_escape(text: str) -> str:
+    """GLOB の特殊文字をリテラルとして扱うようにエスケープします。"""
+    return "".join(f"[{c}]" if c in "*?[" else c for c in text)
+
+
+class EventIndex:
+    """
+    このサーバーで作成・取得したイベントを記録する SQLite のインデックス。
+
+    - イベントごとに URL・タイトル・メモ・候補日程・最終取得時刻と、出欠表の最新のスナップショットを保存します。
+    - タイトルと候補日程にインデックスを張り、再取得なしで一覧・検索に応答します。
+    - ``path`` が空または ``:memory:`` の場合はプロセス内のメモリ上にだけ保持します。
+      ファイルを指定すると再起動後も残り、複数プロセスから同じファイルを共有できます (WAL モード)。
+    - 記録が ``max_events`` 件を超えると、最も長く更新されていないものから削除します。
+    """
+
+    def __init__(self, path: str = "", max_events: int = 10000, clock: Callable[[], float] = time.time):
+        self.path = path or ":memory:"
+        self.max_events = max_events
+        self._clock = clock
+        if self.path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+        # 記録はイベントループ (とワーカーのスレッド) から行うため、接続は 1 つをロックで共有する
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute("PRAGMA busy_timeout = 5000")
+        self._conn.executescript(_SCHEMA)
+        self.writes = 0
+        self.pruned = 0
+
+    @classmethod
+    def from_env(cls) -> "EventIndex":
+        """EVENT_INDEX_PATH / EVENT_INDEX_MAX_EVENTS から生成します。"""
+        return cls(
+            path=os.path.expanduser(os.environ.get("EVENT_INDEX_PATH", "")),
+            max_events=int(os.environ.get("EVENT_INDEX_MAX_EVENTS", "10000")),
+        )
+
+    async def run(self, method: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """
+        このインデックスのメソッドをイベントループの外 (既定のスレッドプール) で実行します。
+
+        SQLite の読み書きはロック待ち (busy_timeout) で数秒止まることがあるため、
+        イベントループからは ``await index.run(index.record_info, info)`` のように呼び出します。
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(method, *args, **kwargs))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _upsert(
+        self,
+        url: str,
+        title: Optional[str] = None,
+        memo: Optional[str] = None,
+        dates: Optional[Sequence[str]] = None,
+        created: bool = False,
+        fetched: bool = False,
+        responses: Optional[Dict[str, Any]] = None
+    ) -> None:
+        key = normalize_event_url(url)
+        now = self._clock()
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error as e:
+                # 記録の失敗で操作自体を失敗させない
+                logger.warning(f"Failed to record event {url} in index: {e}")
+                return
+            try:
+                self._conn.execute(
+                    "INSERT INTO events (key, url, added_at, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET url = excluded.url, updated_at = excluded.updated_at",
+                    (key, url, now, now),
+                )
+                if created:
+                    # 作成日時で一覧できるよう、作成したイベントは作成時刻を追加日時とする
+                    self._conn.execute("UPDATE events SET created = 1, added_at = ? WHERE key = ?", (now, key))
+                if title is not None:
+                    self._conn.execute("UPDATE events SET title = ? WHERE key = ?", (title, key))
+                if memo is not None:
+                    self._conn.execute("UPDATE events SET memo = ? WHERE key = ?", (memo, key))
+                if fetched:
+                    self._conn.execute("UPDATE events SET fetched_at = ? WHERE key = ?", (now, key))
+                if responses is not None:
+                    self._conn.execute(
+                        "UPDATE events SET respondents = ?, responses = ?, responses_at = ? WHERE key = ?",
+                        (len(responses["respondents"]), json.dumps(responses, ensure_ascii=False), now, key),
+                    )
+                if dates is not None:
+                    self._conn.execute("DELETE FROM event_dates WHERE key = ?", (key,))
+                    self._conn.executemany(
+                        "INSERT INTO event_dates (key, position, date) VALUES (?, ?, ?)",
+                        [(key, i, d) for i, d in enumerate(dates)],
+                    )
+                self._prune()
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                logger.warning(f"Failed to record event {url} in index: {e}")
+                return
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.writes += 1
+
+    def _prune(self) -> None:
+        if not self.max_events:
+            return
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()
+        excess = count - self.max_events
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM events WHERE key IN (SELECT key FROM events ORDER BY updated_at LIMIT ?)", (excess,)
+            )
+            self.pruned += excess
+
+    def record_created(self, url: str, title: str, memo: str = "", dates: Sequence[str] = ()) -> None:
+        """このサーバーで作成したイベントを記録します。"""
+        self._upsert(url, title=title, memo=memo, dates=list(dates), created=True)
+
+    def record_info(self, info: Dict[str, Any]) -> None:
+        """取得したイベント情報 (title, dates, url) を記録します。"""
+        self._upsert(info["url"], title=info["title"], dates=info["dates"], fetched=True)
+
+    def record_attendance(self, matrix: "AttendanceMatrix") -> None:
+        """取得した出欠表を、そのイベントの最新のスナップショットとして記録します。"""
+        self._upsert(matrix.url, title=matrix.title, dates=matrix.dates, fetched=True, responses=matrix.to_dict())
+
+    def _entries(self, where: str, params: Sequence[Any], limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM events {where} ORDER BY added_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+            dates: Dict[str, List[str]] = {row["key"]: [] for row in rows}
+            if rows:
+                placeholders = ",".join("?" * len(rows))
+                for key, date in self._conn.execute(
+                    f"SELECT key, date FROM event_dates WHERE key IN ({placeholders}) ORDER BY key, position",
+                    list(dates),
+                ):
+                    dates[key].append(date)
+        return [
+            {
+                "url": row["url"],
+                "title": row["title"],
+                "memo": row["memo"],
+                "dates": dates[row["key"]],
+                "created": bool(row["created"]),
+                "added_at": row["added_at"],
+                "fetched_at": row["fetched_at"],
+                "respondents": row["respondents"],
+                "responses_at": row["responses_at"],
+            }
+            for row in rows
+        ]
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        entries = self._entries("WHERE key = ?", (normalize_event_url(url),), 1)
+        return entries[0] if entries else None
+
+    def responses(self, url: str) -> Optional[Dict[str, Any]]:
+        """記録されている出欠表のスナップショット (AttendanceMatrix.to_dict の形式)。ない場合は None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT responses FROM events WHERE key = ?", (normalize_event_url(url),)
+            ).fetchone()
+        return json.loads(row["responses"]) if row is not None and row["responses"] else None
+
+    def list_events(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        created_only: bool = False,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        記録されたイベントを追加日時 (作成したイベントは作成日時) の新しい順に返します。
+
+        Args:
+            since: この UNIX 時刻以降に追加されたものに限る
+            until: この UNIX 時刻より前に追加されたものに限る
+            created_only: このサーバーで作成したイベントに限る
+            limit: 最大件数
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        if since is not None:
+            conditions.append("added_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("added_at < ?")
+            params.append(until)
+        if created_only:
+            conditions.append("created = 1")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._entries(where, params, limit)
+
+    def search_events(self, query: str = "", date: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        タイトルまたは候補日程に query を含むイベントを検索します。
+
+        Args:
+            query: タイトル・候補日程に含まれる文字列 (大文字・小文字を区別しない。空の場合は条件なし)
+            date: 候補日程の前方一致 (例: "3/1")。日程のインデックスを使って絞り込む
+            limit: 最大件数
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        if query:
+            conditions.append(
+                "(instr(lower(title), lower(?)) > 0 OR key IN "
+                "(SELECT key FROM event_dates WHERE instr(lower(date), lower(?)) > 0))"
+            )
+            params.extend([query, query])
+        if date:
+            conditions.append("key IN (SELECT key FROM event_dates WHERE date GLOB ?)")
+            params.append(_glob_escape(date) + "*")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._entries(where, params, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (events,) = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()
+            (created,) = self._conn.execute("SELECT COUNT(*) FROM events WHERE created = 1").fetchone()
+        return {"events": events, "created": created, "writes": self.writes, "pruned": self.pruned}
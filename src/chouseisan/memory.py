@@ -0,0 +1,86 @@
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_PROC = "/proc"
+
+
+def available() -> bool:
+    """/proc からプロセスのメモリ使用量を取得できる環境 (Linux) かどうか"""
+    return os.path.isdir(os.path.join(_PROC, "self"))
+
+
+def _process_table() -> Dict[int, Tuple[int, Tuple[str, ...]]]:
+    """pid -> (親 pid, コマンドラインの引数)"""
+    table: Dict[int, Tuple[int, Tuple[str, ...]]] = {}
+    for entry in os.listdir(_PROC):
+        if not entry.isdigit():
+            continue
+        pid = int(entry)
+        try:
+            with open(os.path.join(_PROC, entry, "stat"), "rb") as f:
+                stat = f.read()
+            with open(os.path.join(_PROC, entry, "cmdline"), "rb") as f:
+                args = tuple(a.decode(errors="replace") for a in f.read().split(b"\0") if a)
+        except OSError:
+            continue
+        # comm (2 番目の項目) は空白や括弧を含み得るため、最後の ')' 以降を分割する
+        fields = stat[stat.rfind(b")") + 2:].split()
+        table[pid] = (int(fields[1]), args)
+    return table
+
+
+def process_memory(pid: int) -> int:
+    """
+    プロセスのメモリ使用量 (バイト)。
+
+    共有ページを按分した PSS (smaps_rollup) を優先し、取得できない場合は RSS を返します。
+    プロセスが存在しない場合は 0 を返します。
+    """
+    try:
+        with open(os.path.join(_PROC, str(pid), "smaps_rollup"), "rb") as f:
+            for line in f:
+                if line.startswith(b"Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(_PROC, str(pid), "statm"), "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _descendants(table: Dict[int, Tuple[int, Tuple[str, ...]]], roots: Iterable[int]) -> Set[int]:
+    children: Dict[int, List[int]] = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    members: Set[int] = set()
+    stack = list(roots)
+    while stack:
+        pid = stack.pop()
+        if pid in members:
+            continue
+        members.add(pid)
+        stack.extend(children.get(pid, ()))
+    return members
+
+
+def tree_memory(markers: Iterable[str]) -> Dict[str, Optional[int]]:
+    """
+    起動引数に marker を含むプロセスとその子孫 (レンダラー等) のメモリ使用量の合計を返します。
+
+    Args:
+        markers: ブラウザの起動引数に付けた識別用の文字列
+
+    Returns:
+        Dict[str, Optional[int]]: marker ごとのバイト数 (/proc が利用できない場合は None)
+    """
+    markers = list(markers)
+    if not available():
+        return {marker: None for marker in markers}
+    table = _process_table()
+    result: Dict[str, Optional[int]] = {}
+    for marker in markers:
+        roots = [pid for pid, (_, args) in table.items() if marker in args]
+        result[marker] = sum(process_memory(pid) for pid in _descendants(table, roots))
+    return result
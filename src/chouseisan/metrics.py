@@ -0,0 +1,271 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ブラウザの起動やページ遷移 (数秒) から HTML 解析 (数ミリ秒) までを扱える区切り (秒)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Histogram:
+    """ラベルごとに累積バケット・合計・件数を保持するヒストグラム"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        # [バケットごとの件数..., 合計, 件数]
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def snapshot(self) -> Dict[LabelValues, List[float]]:
+        """ラベルごとの [バケットごとの件数..., 合計, 件数] の複製 (pickle してプロセス間で送れる)"""
+        return {labels: list(series) for labels, series in self._series.items()}
+
+    def merge(self, snapshot: Dict[LabelValues, List[float]]) -> None:
+        """同じバケットを持つヒストグラムの snapshot を足し合わせます。"""
+        for labels, series in snapshot.items():
+            mine = self._series.get(labels)
+            if mine is None:
+                self._series[labels] = list(series)
+            else:
+                for i, value in enumerate(series):
+                    mine[i] += value
+
+    def copy(self) -> "Histogram":
+        histogram = Histogram(self.name, self.help, self.labelnames, self.buckets)
+        histogram.merge(self.snapshot())
+        return histogram
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(self._bucket_line(labels, _format_value(bound), cumulative))
+            lines.append(self._bucket_line(labels, "+Inf", series[-1]))
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {_format_value(series[-1])}")
+        return lines
+
+    def _bucket_line(self, labels: LabelValues, le: str, count: float) -> str:
+        return f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), labels + (le,))} {_format_value(count)}"
+
+
+class Counter:
+    """ラベルごとに単調増加する値を保持するカウンター"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class CallRecord:
+    """1 回のクライアント操作で計測したフェーズごとの所要時間"""
+    __slots__ = ("tool", "started", "phases", "closed")
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.started = time.perf_counter()
+        # (フェーズ名, 秒, 結果)
+        self.phases: List[Tuple[str, float, str]] = []
+        self.closed = False
+
+    def breakdown(self) -> str:
+        return ", ".join(f"{name}={seconds:.3f}s" + ("" if outcome == "success" else f" ({outcome})")
+                         for name, seconds, outcome in self.phases)
+
+
+_current_call: ContextVar[Optional[Tuple["ClientMetrics", CallRecord]]] = ContextVar(
+    "chouseisan_current_call", default=None
+)
+
+
+def _outcome(exc: Optional[BaseException]) -> str:
+    return "success" if exc is None else type(exc).__name__
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    実行中のクライアント操作の 1 フェーズ (ページ遷移・フォーム送信など) の所要時間を計測します。
+
+    ``ClientMetrics.call`` の外 (バックグラウンドでのコンテキスト補充など) では何も記録しません。
+    """
+    current = _current_call.get()
+    if current is None or current[1].closed:
+        yield
+        return
+    metrics, record = current
+    started = time.perf_counter()
+    exc: Optional[BaseException] = None
+    try:
+        yield
+    except BaseException as e:
+        exc = e
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        outcome = _outcome(exc)
+        record.phases.append((name, elapsed, outcome))
+        metrics.phase_duration.observe(elapsed, record.tool, name, outcome)
+
+
+class ClientMetrics:
+    """
+    ChouseisanClient の操作とフェーズの所要時間を集計し、Prometheus のテキスト形式で出力します。
+
+    ``slow_call_threshold`` (秒) を超えた操作は、フェーズごとの内訳とともに警告ログに出力します。
+    """
+
+    def __init__(self, slow_call_threshold: Optional[float] = None, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.slow_call_threshold = slow_call_threshold if slow_call_threshold and slow_call_threshold > 0 else None
+        self.call_duration = Histogram(
+            "chouseisan_call_duration_seconds",
+            "Duration of ChouseisanClient operations.",
+            ("tool", "outcome"), buckets
+        )
+        self.phase_duration = Histogram(
+            "chouseisan_phase_duration_seconds",
+            "Duration of each phase within ChouseisanClient operations.",
+            ("tool", "phase", "outcome"), buckets
+        )
+        self.slow_calls = Counter(
+            "chouseisan_slow_calls_total",
+            "Operations that exceeded the slow call threshold.",
+            ("tool",)
+        )
+        self._listeners: List[Callable[[CallRecord], None]] = []
+
+    def add_listener(self, listener: Callable[[CallRecord], None]) -> None:
+        """操作が終わるたびに、その CallRecord (フェーズごとの所要時間) を受け取る関数を登録します。"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[CallRecord], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @contextmanager
+    def call(self, tool: str) -> Iterator[CallRecord]:
+        """操作全体の所要時間を計測し、内部で ``phase`` により計測されたフェーズをまとめます。"""
+        record = CallRecord(tool)
+        token = _current_call.set((self, record))
+        exc: Optional[BaseException] = None
+        try:
+            yield record
+        except BaseException as e:
+            exc = e
+            raise
+        finally:
+            record.closed = True
+            _current_call.reset(token)
+            elapsed = time.perf_counter() - record.started
+            outcome = _outcome(exc)
+            self.call_duration.observe(elapsed, tool, outcome)
+            for listener in list(self._listeners):
+                listener(record)
+            if self.slow_call_threshold is not None and elapsed >= self.slow_call_threshold:
+                self.slow_calls.inc(tool)
+                logger.warning(
+                    f"Slow call: {tool} took {elapsed:.3f}s ({outcome}); "
+                    f"phases: {record.breakdown() or 'none'}"
+                )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """別プロセス (ワーカー) の計測値を render でまとめて出力するための複製を返します。"""
+        return {"phase_duration": self.phase_duration.snapshot()}
+
+    def render(self, stats: Optional[Dict[str, Any]] = None, snapshots: Sequence[Dict[str, Any]] = ()) -> str:
+        """
+        計測値を Prometheus のテキスト形式で返します。
+
+        Args:
+            stats: ``ChouseisanClient.stats()`` の結果。数値をゲージとして併せて出力します
+            snapshots: ワーカーの ``snapshot()``。フェーズの所要時間を足し合わせて出力します
+                (操作全体の所要時間は呼び出し元のプロセスで計測したものだけを出力する)
+        """
+        phase_duration = self.phase_duration
+        if snapshots:
+            phase_duration = phase_duration.copy()
+            for snapshot in snapshots:
+                phase_duration.merge(snapshot.get("phase_duration", {}))
+        lines = self.call_duration.render() + phase_duration.render() + self.slow_calls.render()
+        if stats:
+            lines.extend(_render_stats(stats))
+        return "\n".join(lines) + "\n"
+
+
+def _render_stats(stats: Dict[str, Any]) -> List[str]:
+    """
+    統計情報の辞書をゲージに変換します。
+
+    ``{section: {key: 数値}}`` は ``chouseisan_<section>_<key>`` に、
+    ``{section: {key: {operation: 数値}}}`` は operation ラベル付きの系列に展開します
+    (さらに 1 段深い場合は type ラベルを付けます)。
+    """
+    lines: List[str] = []
+    for section, values in sorted(stats.items()):
+        if not isinstance(values, dict):
+            continue
+        for key, value in sorted(values.items()):
+            name = f"chouseisan_{section}_{key}"
+            samples: List[Tuple[str, float]] = []
+            if isinstance(value, (int, float)):
+                samples.append(("", float(value)))
+            elif isinstance(value, dict):
+                for op, inner in sorted(value.items()):
+                    if isinstance(inner, (int, float)):
+                        samples.append((_format_labels(("operation",), (str(op),)), float(inner)))
+                    elif isinstance(inner, dict):
+                        for kind, count in sorted(inner.items()):
+                            if isinstance(count, (int, float)):
+                                samples.append((
+                                    _format_labels(("operation", "type"), (str(op), str(kind))), float(count)
+                                ))
+            if samples:
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{labels} {_format_value(v)}" for labels, v in samples)
+    return lines
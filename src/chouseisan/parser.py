@@ -0,0 +1,206 @@
+import re
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# 終了タグを持たない要素
+_VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+
+# 開始タグの出現により暗黙的に閉じられる要素 (開始タグ -> 閉じる対象)
+_IMPLIED_END = {
+    "tr": ("tr",),
+    "td": ("td", "th"),
+    "th": ("td", "th"),
+    "li": ("li",),
+    "option": ("option",),
+    "p": ("p",),
+}
+
+# 暗黙的な終了の探索を打ち切る要素
+_SCOPE_TAGS = frozenset({"table", "ul", "ol", "select", "body", "html"})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class Element:
+    """軽量 HTML パーサーが生成する要素ノード"""
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Optional[Dict[str, str]] = None, parent: Optional["Element"] = None):
+        self.tag = tag
+        self.attrs: Dict[str, str] = attrs or {}
+        self.children: List[Any] = []
+        self.parent = parent
+
+    @property
+    def id(self) -> str:
+        return self.attrs.get("id", "")
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attrs.get("class", "").split()
+
+    def get(self, name: str, default: str = "") -> str:
+        return self.attrs.get(name, default)
+
+    @property
+    def elements(self) -> List["Element"]:
+        """子要素 (テキストノードを除く) のリスト"""
+        return [c for c in self.children if isinstance(c, Element)]
+
+    def iter(self) -> Iterator["Element"]:
+        """自身を含む子孫要素を文書順に列挙します。"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.elements))
+
+    def iter_find(
+        self,
+        tag: Optional[str] = None,
+        id: Optional[str] = None,
+        cls: Optional[str] = None,
+        predicate: Optional[Callable[["Element"], bool]] = None
+    ) -> Iterator["Element"]:
+        """タグ名・id・クラス・任意条件に一致する子孫要素を文書順に列挙します。"""
+        for el in self.iter():
+            if el is self:
+                continue
+            if tag is not None and el.tag != tag:
+                continue
+            if id is not None and el.id != id:
+                continue
+            if cls is not None and cls not in el.classes:
+                continue
+            if predicate is not None and not predicate(el):
+                continue
+            yield el
+
+    def find_all(self, *args: Any, **kwargs: Any) -> List["Element"]:
+        """iter_find と同じ条件に一致する子孫要素をリストで返します。"""
+        return list(self.iter_find(*args, **kwargs))
+
+    def find(self, *args: Any, **kwargs: Any) -> Optional["Element"]:
+        """iter_find と同じ条件で最初に一致した要素を返します。"""
+        return next(self.iter_find(*args, **kwargs), None)
+
+    def text(self) -> str:
+        """子孫のテキストを連結し、空白を正規化した文字列を返します。"""
+        parts: List[str] = []
+        stack: List[Any] = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Element):
+                if node.tag in ("script", "style"):
+                    continue
+                if node.tag == "br":
+                    parts.append(" ")
+                stack.extend(reversed(node.children))
+            else:
+                parts.append(node)
+        return _WHITESPACE_RE.sub(" ", "".join(parts)).strip()
+
+    def __repr__(self) -> str:
+        return f"<Element {self.tag} id={self.id!r} class={self.get('class')!r}>"
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document")
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        implied = _IMPLIED_END.get(tag)
+        if implied:
+            self._close_implied(implied)
+        parent = self._stack[-1]
+        el = Element(tag, {k: (v or "") for k, v in attrs}, parent)
+        parent.children.append(el)
+        if tag not in _VOID_TAGS:
+            self._stack.append(el)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        parent = self._stack[-1]
+        parent.children.append(Element(tag, {k: (v or "") for k, v in attrs}, parent))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _VOID_TAGS:
+            return
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+        # 対応する開始タグがない終了タグは無視する
+
+    def handle_data(self, data: str) -> None:
+        self._stack[-1].children.append(data)
+
+    def _close_implied(self, targets: Tuple[str, ...]) -> None:
+        for i in range(len(self._stack) - 1, 0, -1):
+            tag = self._stack[i].tag
+            if tag in targets:
+                del self._stack[i:]
+                return
+            if tag in _SCOPE_TAGS:
+                return
+
+
+def parse_html(markup: str) -> Element:
+    """
+    HTML 文字列を軽量な要素ツリーに変換します。
+
+    Args:
+        markup: HTML 文字列
+
+    Returns:
+        Element: 文書全体を表すルート要素
+    """
+    builder = _TreeBuilder()
+    builder.feed(markup)
+    builder.close()
+    return builder.root
+
+
+def extract_event_info(doc: Element) -> Dict[str, Any]:
+    """
+    イベントページからタイトルと候補日程を抽出します。
+
+    ブラウザ経由の取得と同じく、``h1`` (なければ ``.event-name``) をタイトル、
+    ``#nittei tr td:first-child`` を候補日程とし、見つからない場合は
+    ``#attendance-table th.valign-middle`` の 3 列目以降を候補日程とみなします。
+
+    Args:
+        doc: parse_html で生成した要素ツリー
+
+    Returns:
+        Dict[str, Any]: title と dates を含む辞書
+    """
+    title = ""
+    title_el = doc.find("h1") or doc.find(cls="event-name")
+    if title_el is not None:
+        title = title_el.text()
+
+    dates: List[str] = []
+    nittei = doc.find(id="nittei")
+    if nittei is not None:
+        for tr in nittei.find_all("tr"):
+            cells = tr.elements
+            if cells and cells[0].tag == "td":
+                text = cells[0].text()
+                if text and text != "日程":
+                    dates.append(text)
+
+    if not dates:
+        table = doc.find(id="attendance-table")
+        if table is not None:
+            headers = table.find_all("th", cls="valign-middle")
+            for th in headers[2:]:
+                text = th.text()
+                if text:
+                    dates.append(text)
+
+    return {"title": title, "dates": dates}
@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+# ディスクキャッシュの対象とするリソース種別 (利用者ごとに内容が変わらない静的アセット)
+CACHEABLE_RESOURCE_TYPES = ("script", "stylesheet", "font", "image")
+
+# Cookie を引き継ぐ操作 (公開ページの読み取りのみ。書き込み操作は常に新しいセッションで行う)
+SHARED_STATE_OPERATIONS = ("get_event_info", "get_responses")
+
+# キャッシュしたレスポンスを返す際に復元するヘッダー
+_STORED_HEADERS = ("content-type", "cache-control", "etag", "last-modified")
+
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class AssetCache:
+    """
+    静的アセット (JS/CSS/フォント/画像) のディスクキャッシュ。
+
+    BrowserContext ごとに破棄されるブラウザのメモリキャッシュの代わりに、GET で取得した
+    アセットを ``directory`` に保存し、以降のコンテキストではネットワークに出ずに応答します。
+
+    - 保存するのは 200 応答で、Cache-Control が no-store/private でなく、Set-Cookie を含まないものだけです。
+    - 有効期間は Cache-Control の max-age (なければ ``ttl`` 秒) です。
+    - 合計サイズが ``max_bytes`` を超えると、最も古く使われたものから削除します。
+      上限はプロセスごとに管理されるため、複数プロセスで同じディレクトリを共有すると一時的に超えることがあります。
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 100 * 2**20, ttl: float = 86400.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        entries: List[Tuple[float, str, int]] = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".body"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name[:-len(".body")], st.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".json"
+
+    def load(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """有効期間内のアセットを (メタ情報, 本文) で返します。ない場合や期限切れの場合は None"""
+        key = self._key(url)
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "rb") as f:
+                meta = json.loads(f.read())
+            if meta.get("url") != url or meta.get("expires_at", 0) < time.time():
+                return None
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            # 再起動後も使用順を復元できるよう更新時刻を使用時刻として扱う
+            os.utime(body_path)
+        except OSError:
+            pass
+        return meta, body
+
+    def store(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        """キャッシュ可能なレスポンスであれば保存し、保存した場合は True を返します。"""
+        cache_control = headers.get("cache-control", "").lower()
+        if status != 200 or "no-store" in cache_control or "private" in cache_control or "set-cookie" in headers:
+            return False
+        if len(body) > self.max_bytes // 4:
+            return False
+        match = _MAX_AGE_RE.search(cache_control)
+        max_age = float(match.group(1)) if match else self.ttl
+        if max_age <= 0:
+            return False
+
+        key = self._key(url)
+        body_path, meta_path = self._paths(key)
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k in _STORED_HEADERS},
+            "expires_at": time.time() + max_age,
+        }
+        try:
+            _write_atomic(body_path, body)
+            _write_atomic(meta_path, json.dumps(meta).encode())
+        except OSError as e:
+            logger.warning(f"Failed to store asset {url}: {e}")
+            return False
+
+        evicted: List[str] = []
+        with self._lock:
+            self._size += len(body) - self._index.pop(key, 0)
+            self._index[key] = len(body)
+            while self._size > self.max_bytes and len(self._index) > 1:
+                old, size = self._index.popitem(last=False)
+                self._size -= size
+                evicted.append(old)
+            self.stores += 1
+            self.evictions += len(evicted)
+        for old in evicted:
+            for path in self._paths(old):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return True
+
+    async def handle_route(self, route: "Route") -> None:
+        request = route.request
+        if request.method != "GET" or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+            await route.fallback()
+            return
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self.load, request.url)
+        if cached is not None:
+            self.hits += 1
+            meta, body = cached
+            await route.fulfill(status=meta["status"], headers=meta["headers"], body=body)
+            return
+
+        self.misses += 1
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception:
+            logger.debug(f"Failed to fetch asset {request.url}; passing to browser", exc_info=True)
+            await route.fallback()
+            return
+        await loop.run_in_executor(None, self.store, request.url, response.status, dict(response.headers), body)
+        await route.fulfill(response=response, body=body)
+
+    async def install(self, context: "BrowserContext") -> None:
+        """コンテキストに静的アセットの横取り処理を登録します。"""
+        await context.route("**/*", self.handle_route)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "entries": len(self._index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+class StorageState:
+    """
+    読み取り操作のコンテキスト間で Cookie を引き継ぐための保存状態 (Playwright の storage state 形式)。
+
+    ``operations`` に含まれる操作のコンテキストにだけ Cookie を読み込み、終了時の Cookie を保存します。
+    出欠登録などの書き込み操作は常に Cookie のない新しいコンテキストで行い、その Cookie は保存しないため、
+    回答者のセッションがほかの呼び出しに引き継がれることはありません。
+    """
+
+    def __init__(self, path: str, hosts: Iterable[str] = (), operations: Iterable[str] = SHARED_STATE_OPERATIONS):
+        self.path = path
+        self.hosts = tuple(h.lower().lstrip(".") for h in hosts)
+        self.operations = frozenset(operations)
+        self._cookies: Optional[List[Dict[str, Any]]] = None
+
+    def shares(self, operation: str) -> bool:
+        return operation in self.operations
+
+    def _matches(self, cookie: Dict[str, Any]) -> bool:
+        if not self.hosts:
+            return True
+        domain = str(cookie.get("domain", "")).lower().lstrip(".")
+        return any(domain == h or domain.endswith("." + h) or h.endswith("." + domain) for h in self.hosts)
+
+    def cookies(self) -> List[Dict[str, Any]]:
+        if self._cookies is None:
+            try:
+                with open(self.path, "rb") as f:
+                    state = json.loads(f.read())
+                self._cookies = [c for c in state.get("cookies", []) if self._matches(c)]
+            except (OSError, ValueError):
+                self._cookies = []
+        now = time.time()
+        return [c for c in self._cookies if c.get("expires", -1) in (-1, None) or c["expires"] > now]
+
+    async def apply(self, context: "BrowserContext") -> None:
+        cookies = self.cookies()
+        if cookies:
+            await context.add_cookies(cookies)
+
+    async def capture(self, context: "BrowserContext") -> None:
+        """コンテキストの Cookie を保存します (変化がなければ書き込みません)。"""
+        cookies = [dict(c) for c in await context.cookies() if self._matches(c)]
+        if cookies == self.cookies():
+            return
+        self._cookies = cookies
+        data = json.dumps({"cookies": cookies, "origins": []}, ensure_ascii=False).encode()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _write_atomic, self.path, data)
+        except OSError as e:
+            logger.warning(f"Failed to save storage state to {self.path}: {e}")
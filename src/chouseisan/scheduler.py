@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from . import deadline
+from .errors import OverloadedError
+from .metrics import phase
+
+logger = logging.getLogger(__name__)
+
+
+class _KeyLock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class OperationScheduler:
+    """
+    クライアント操作の流量制御を行うスケジューラ。
+
+    - ``admit``: ブラウザを使う操作の同時実行数を ``max_concurrency`` に制限します。
+    - ``exclusive``: 同じキー (イベント URL) への書き込みを 1 つずつ順番に実行します。
+    - どちらも待機中の操作数が ``max_queue`` に達している場合は即座に、
+      ``max_wait`` 秒以内に実行を開始できない場合は待機後に OverloadedError を送出します。
+    """
+
+    def __init__(self, max_concurrency: int = 2, max_queue: int = 32, max_wait: float = 30.0):
+        if max_concurrency < 1:
+            raise ValueError("同時実行数は 1 以上を指定してください。")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._key_locks: Dict[str, _KeyLock] = {}
+        self.running = 0
+        self.waiting = 0
+        self.admitted: "Counter[str]" = Counter()
+        self.rejected: "Counter[str]" = Counter()
+        self.timed_out: "Counter[str]" = Counter()
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @asynccontextmanager
+    async def admit(self, operation: str, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        ブラウザを使う操作の実行枠を確保します。
+
+        Args:
+            operation: 操作の名前 (統計に使用)
+            max_wait: 実行開始まで待機する最大秒数 (None の場合は既定値)
+
+        Raises:
+            OverloadedError: 待機キューが満杯、または最大待機時間を超えた場合
+        """
+        await self._acquire(self._semaphore, operation, "同時実行数", max_wait, "queue_wait")
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def exclusive(self, key: str, operation: str, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        キーごとの排他ロックを確保し、同じイベントへの書き込みを直列化します。
+
+        Raises:
+            OverloadedError: 待機キューが満杯、または最大待機時間を超えた場合
+        """
+        entry = self._key_locks.get(key)
+        if entry is None:
+            entry = self._key_locks[key] = _KeyLock()
+        entry.users += 1
+        try:
+            await self._acquire(entry.lock, operation, "同一イベントへの書き込み", max_wait, "event_lock_wait")
+            try:
+                yield
+            finally:
+                entry.lock.release()
+        finally:
+            entry.users -= 1
+            if entry.users == 0 and self._key_locks.get(key) is entry:
+                del self._key_locks[key]
+
+    async def _acquire(
+        self,
+        primitive: Union[asyncio.Semaphore, asyncio.Lock],
+        operation: str,
+        resource: str,
+        max_wait: Optional[float],
+        phase_name: str
+    ) -> None:
+        if not primitive.locked():
+            # 待たずに確保できる場合はキューに数えない
+            await primitive.acquire()
+            self.admitted[operation] += 1
+            return
+
+        if self.waiting >= self.max_queue:
+            self.rejected[operation] += 1
+            raise OverloadedError(
+                f"サーバーが混雑しています ({resource}の待機数が上限 {self.max_queue} に達しました)。"
+                "しばらくしてから再実行してください。"
+            )
+
+        timeout = self.max_wait if max_wait is None else max_wait
+        # 操作全体の期限が先に来る場合は、その残り時間までしか待たない
+        budget = deadline.remaining(timeout)
+        self.waiting += 1
+        started = time.monotonic()
+        try:
+            with phase(phase_name):
+                await asyncio.wait_for(primitive.acquire(), timeout=max(budget, 0))
+        except asyncio.TimeoutError:
+            self.timed_out[operation] += 1
+            if budget < timeout:
+                deadline.check(f"{resource}の待機")
+            raise OverloadedError(
+                f"サーバーが混雑しています ({resource}の待機が {timeout:g} 秒を超えました)。"
+                "しばらくしてから再実行してください。"
+            ) from None
+        finally:
+            self.waiting -= 1
+            waited = time.monotonic() - started
+            self.waits += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self.admitted[operation] += 1
+        if waited > 1.0:
+            logger.info(f"Operation '{operation}' waited {waited:.2f}s for {resource}")
+
+    def stats(self) -> Dict[str, Any]:
+        """実行中・待機中の操作数と待機時間の統計を返します。"""
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "max_wait": self.max_wait,
+            "admitted": dict(self.admitted),
+            "rejected": dict(self.rejected),
+            "timed_out": dict(self.timed_out),
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "wait_seconds_avg": self.wait_seconds_total / self.waits if self.waits else 0.0,
+            "locked_keys": len(self._key_locks),
+        }
@@ -0,0 +1,44 @@
+"""ページ内で page.evaluate により 1 回の往復で実行する JavaScript"""
+
+# タイトルと候補日程をまとめて抽出する
+# 戻り値: {title: string, dates: string[]}
+EXTRACT_EVENT_INFO = """() => {
+    const text = (el) => (el && el.innerText ? el.innerText.trim() : "");
+    const titleEl = document.querySelector('h1') || document.querySelector('.event-name');
+    const title = text(titleEl);
+
+    let dates = Array.from(document.querySelectorAll('#nittei tr td:first-child'))
+        .map(text)
+        .filter((t) => t && t !== '日程');
+
+    if (dates.length === 0) {
+        const headers = Array.from(document.querySelectorAll('#attendance-table th.valign-middle'));
+        if (headers.length > 2) {
+            dates = headers.slice(2).map(text).filter((t) => t);
+        }
+    }
+    return { title, dates };
+}"""
+
+# 各 kouhoN 入力欄の隣にある出欠ボタンをまとめてクリックする
+# 引数: {statuses: number[], classes: {[status]: string}}
+# 戻り値: {applied: number[], missingInput: number[], missingButton: number[]}
+#   (いずれも 0 始まりの日程インデックス)
+APPLY_AVAILABILITY = """({ statuses, classes }) => {
+    const result = { applied: [], missingInput: [], missingButton: [] };
+    statuses.forEach((status, i) => {
+        const input = document.querySelector(`input[name="kouho${i + 1}"]`);
+        if (!input || !input.parentElement) {
+            result.missingInput.push(i);
+            return;
+        }
+        const btn = input.parentElement.querySelector('.' + (classes[status] || classes[0]));
+        if (!btn) {
+            result.missingButton.push(i);
+            return;
+        }
+        btn.click();
+        result.applied.push(i);
+    });
+    return result;
+}"""
@@ -0,0 +1,258 @@
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .attendance import NO_ANSWER, AttendanceMatrix
+
+logger = logging.getLogger(__name__)
+
+_DIGEST_SIZE = 8
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=_DIGEST_SIZE).digest()
+
+
+def _respondent_keys(respondents: List[str]) -> List[Tuple[str, int]]:
+    """回答者の識別キー (名前, 同名の回答者の中での出現順)"""
+    seen: Dict[str, int] = {}
+    keys = []
+    for name in respondents:
+        n = seen.get(name, 0)
+        seen[name] = n + 1
+        keys.append((name, n))
+    return keys
+
+
+class EventFingerprint:
+    """
+    出欠表の内容を表す小さな指紋。
+
+    候補日程の並びと、回答者ごとの行 (コメントと回答済みの日程・出欠) のハッシュだけを保持します。
+    行のハッシュは日程名と出欠の組から計算するため、日程が追加されただけでは既存の回答者は
+    変更扱いになりません。
+    """
+    __slots__ = ("dates", "rows", "digest")
+
+    def __init__(self, dates: Tuple[str, ...], rows: Dict[Tuple[str, int], bytes]):
+        self.dates = dates
+        self.rows = rows
+        body = b"\x1e".join(d.encode() for d in dates) + b"\x1d"
+        body += b"".join(f"{name}\x1e{n}\x1f".encode() + h for (name, n), h in sorted(rows.items()))
+        self.digest = _digest(body)
+
+    @classmethod
+    def from_matrix(cls, matrix: AttendanceMatrix) -> "EventFingerprint":
+        rows: Dict[Tuple[str, int], bytes] = {}
+        for i, key in enumerate(_respondent_keys(matrix.respondents)):
+            answered = [
+                f"{date}\x1e{status}"
+                for date, status in zip(matrix.dates, matrix.row(i))
+                if status != NO_ANSWER
+            ]
+            rows[key] = _digest("\x1f".join([matrix.comments[i]] + answered).encode())
+        return cls(tuple(matrix.dates), rows)
+
+    @property
+    def cursor(self) -> str:
+        return self.digest.hex()
+
+
+def _respondent(matrix: AttendanceMatrix, index: int) -> Dict[str, Any]:
+    return {
+        "name": matrix.respondents[index],
+        "comment": matrix.comments[index],
+        "availability": matrix.row(index),
+    }
+
+
+class EventWatcher:
+    """
+    イベントごとの指紋の履歴を保持し、カーソル (指紋のダイジェスト) 以降の差分を返します。
+
+    - イベントごとに直近 ``history`` 件の異なる指紋を保持します。
+    - 監視するイベントが ``max_events`` を超えると、最も古く参照されたものから破棄します。
+    - 内容が変わっていなければ比較はダイジェスト 1 つで済み、差分は空になります。
+    """
+
+    def __init__(self, max_events: int = 1024, history: int = 8):
+        self.max_events = max_events
+        self.history = max(history, 1)
+        self._events: "OrderedDict[str, OrderedDict[str, EventFingerprint]]" = OrderedDict()
+        self.unchanged = 0
+        self.changed = 0
+        self.resets = 0
+
+    def observe(self, key: str, matrix: AttendanceMatrix, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        最新の出欠表を記録し、cursor の時点からの差分を返します。
+
+        cursor が未指定、または履歴に残っていない場合は全体を追加として返します (reset)。
+
+        Args:
+            key: イベントの識別キー (正規化済みイベント URL)
+            matrix: 最新の出欠表
+            cursor: 前回の結果で受け取ったカーソル
+
+        Returns:
+            Dict[str, Any]: 差分
+                - url, title: イベントの URL とタイトル
+                - cursor: 次回の呼び出しで渡すカーソル
+                - changed: cursor の時点から変化があった場合は True
+                - reset: 差分ではなく全体を返した場合は True
+                - dates: 現在の候補日程 (availability はこの順)
+                - dates_added / dates_removed: 追加・削除された候補日程
+                - respondents_added / respondents_changed: 追加・変更された回答者 (name, comment, availability)
+                - respondents_removed: 削除された回答者の名前
+        """
+        fingerprint = EventFingerprint.from_matrix(matrix)
+        history = self._events.get(key)
+        if history is None:
+            history = self._events[key] = OrderedDict()
+        self._events.move_to_end(key)
+        base = history.get(cursor) if cursor else None
+        history[fingerprint.cursor] = fingerprint
+        history.move_to_end(fingerprint.cursor)
+        while len(history) > self.history:
+            history.popitem(last=False)
+        while len(self._events) > self.max_events:
+            evicted, _ = self._events.popitem(last=False)
+            logger.debug(f"Evicted watch history: {evicted}")
+
+        result: Dict[str, Any] = {
+            "url": matrix.url,
+            "title": matrix.title,
+            "cursor": fingerprint.cursor,
+            "changed": False,
+            "reset": False,
+            "dates": list(matrix.dates),
+            "dates_added": [],
+            "dates_removed": [],
+            "respondents_added": [],
+            "respondents_changed": [],
+            "respondents_removed": [],
+        }
+        if cursor == fingerprint.cursor:
+            self.unchanged += 1
+            return result
+
+        result["changed"] = True
+        if base is None:
+            self.resets += 1
+            result["reset"] = True
+            result["dates_added"] = list(matrix.dates)
+            result["respondents_added"] = [_respondent(matrix, i) for i in range(len(matrix))]
+            return result
+
+        self.changed += 1
+        old_dates = set(base.dates)
+        new_dates = set(fingerprint.dates)
+        result["dates_added"] = [d for d in fingerprint.dates if d not in old_dates]
+        result["dates_removed"] = [d for d in base.dates if d not in new_dates]
+        for i, (respondent, row_hash) in enumerate(fingerprint.rows.items()):
+            old_hash = base.rows.get(respondent)
+            if old_hash is None:
+                result["respondents_added"].append(_respondent(matrix, i))
+            elif old_hash != row_hash:
+                result["respondents_changed"].append(_respondent(matrix, i))
+        result["respondents_removed"] = [name for name, n in base.rows if (name, n) not in fingerprint.rows]
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "events": len(self._events),
+            "max_events": self.max_events,
+            "unchanged": self.unchanged,
+            "changed": self.changed,
+            "resets": self.resets,
+        }
+
+
+class WatchSubscriptions:
+    """
+    リソースの購読と定期的な差分確認を管理し、変化したリソースを購読中のセッションへ通知します。
+
+    セッションは ``send_resource_updated(uri)`` を持つオブジェクト (MCP の ServerSession) です。
+    通知に失敗したセッションは切断されたものとして購読から外します。
+    """
+
+    def __init__(
+        self,
+        watch: Callable[[str, Optional[str]], Awaitable[Dict[str, Any]]],
+        interval: float = 60.0,
+        concurrency: int = 8
+    ):
+        self._watch = watch
+        self.interval = interval
+        self.concurrency = max(concurrency, 1)
+        # uri -> (イベント URL, 購読中のセッション, 前回のカーソル)
+        self._subscriptions: Dict[str, Tuple[str, Set[Any], Optional[str]]] = {}
+
+    def subscribe(self, uri: str, event_url: str, session: Any) -> None:
+        entry = self._subscriptions.get(uri)
+        if entry is None:
+            self._subscriptions[uri] = (event_url, {session}, None)
+        else:
+            entry[1].add(session)
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        entry = self._subscriptions.get(uri)
+        if entry is None:
+            return
+        entry[1].discard(session)
+        if not entry[1]:
+            del self._subscriptions[uri]
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    async def poll_once(self) -> int:
+        """
+        購読中のすべてのリソースの差分を確認し、変化があったものを通知します。
+
+        最初の確認は基準となるカーソルの取得のみで、通知は行いません。
+
+        Returns:
+            int: 送信した通知の数
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def poll(uri: str, event_url: str, cursor: Optional[str]) -> int:
+            async with semaphore:
+                try:
+                    result = await self._watch(event_url, cursor)
+                except Exception as e:
+                    logger.warning(f"Failed to poll {event_url} for resource {uri}: {e}")
+                    return 0
+            entry = self._subscriptions.get(uri)
+            if entry is None:
+                return 0
+            self._subscriptions[uri] = (entry[0], entry[1], result["cursor"])
+            if cursor is None or not result["changed"]:
+                return 0
+            sent = 0
+            for session in list(entry[1]):
+                try:
+                    await session.send_resource_updated(uri)
+                    sent += 1
+                except Exception as e:
+                    logger.info(f"Dropping subscriber of {uri}: {e}")
+                    self.unsubscribe(uri, session)
+            return sent
+
+        counts = await asyncio.gather(*(
+            poll(uri, event_url, cursor)
+            for uri, (event_url, _, cursor) in list(self._subscriptions.items())
+        ))
+        return sum(counts)
+
+    async def run(self) -> None:
+        """interval 秒ごとに poll_once を繰り返します (タスクとして実行し、取り消しで停止)。"""
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._subscriptions:
+                notified = await self.poll_once()
+                if notified:
+                    logger.info(f"Sent {notified} resource update notifications")
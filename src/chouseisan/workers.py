@@ -0,0 +1,743 @@
+"""
+ChouseisanClient の操作を別プロセスのワーカーで実行するための仕組み。
+
+各ワーカーは自身の Playwright ドライバ・共有ブラウザ・HTTP 接続プールを持つ ChouseisanClient を
+1 つ起動し、親プロセスとは標準入出力上の長さ付きフレーム (4 バイトのビッグエンディアン長 + pickle)
+でやり取りします。
+
+- 要求: {"id", "method", "kwargs", "progress"} / 取り消し: {"id", "cancel": True}
+- 応答: {"id", "ok": True, "result"} または {"id", "ok": False, "error": (例外クラス名, メッセージ)}
+- 途中経過 (on_result): {"id", "progress": 結果}
+- イベントの記録: 応答に {"records": [(EventIndex のメソッド名, 引数), ...]} を添え、親プロセスの EventIndex で再生する
+
+例外は ChouseisanError のサブクラス名とメッセージで送り、親プロセスで同じクラスとして再送出します。
+"""
+import asyncio
+import itertools
+import logging
+import os
+import pickle
+import struct
+import sys
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from . import errors
+from .cache import normalize_event_url
+from .client import ChouseisanClient, ResponseResult, fetch_events_info, refresh_stale_entries
+from .deadline import current as current_deadline, deadline_scope
+from .errors import ChouseisanError, DeadlineExceededError
+from .index import EventIndex
+from .metrics import ClientMetrics
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+
+# ワーカーで実行できる ChouseisanClient のメソッド
+WORKER_METHODS = frozenset({
+    "create_event", "get_event_info", "get_responses", "watch_event", "add_response", "add_responses", "prewarm",
+})
+
+# ワーカー内の期限切れを親プロセスが待つ猶予 (秒)。応答の転送にかかる時間を見込む
+_DEADLINE_GRACE = 1.0
+
+ResultCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+IndexRecord = Tuple[str, Tuple[Any, ...]]
+RecordsCallback = Callable[[List[IndexRecord]], Awaitable[None]]
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Any:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return pickle.loads(await reader.readexactly(size))
+
+
+def _write_frame(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    writer.write(_HEADER.pack(len(payload)) + payload)
+
+
+def _encode_error(e: BaseException) -> Tuple[str, str]:
+    if isinstance(e, ChouseisanError):
+        return type(e).__name__, str(e)
+    return ChouseisanError.__name__, f"ワーカーで予期せぬエラーが発生しました: {e}"
+
+
+def _decode_error(name: str, message: str) -> ChouseisanError:
+    cls = getattr(errors, name, None)
+    if not (isinstance(cls, type) and issubclass(cls, ChouseisanError)):
+        cls = ChouseisanError
+    return cls(message)
+
+
+class _WorkerProcess:
+    """1 つのワーカープロセスと、その応答待ちの呼び出し"""
+
+    def __init__(self, index: int, options: Dict[str, Any], on_records: Optional[RecordsCallback] = None):
+        self.index = index
+        self.options = options
+        self.on_records = on_records
+        self.process: Optional[asyncio.subprocess.Process] = None
+        # 起動済みで要求を書き込める間だけ set。終了を検知した時点で clear し、再起動が済むまで呼び出しを待たせる
+        self.ready = asyncio.Event()
+        self._restart_lock: Optional[asyncio.Lock] = None
+        self.calls = 0
+        self.failures = 0
+        self.restarts = 0
+        self._ids = itertools.count()
+        self._pending: Dict[int, Tuple["asyncio.Future[Any]", Optional[ResultCallback]]] = {}
+        self._reader_task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def inflight(self) -> int:
+        return len(self._pending)
+
+    def _lock(self) -> asyncio.Lock:
+        if self._restart_lock is None:
+            self._restart_lock = asyncio.Lock()
+        return self._restart_lock
+
+    def mark_exited(self) -> None:
+        """プロセスの終了を検知したときに呼び、再起動まで新しい呼び出しを書き込ませないようにします。"""
+        self.ready.clear()
+
+    async def start(self) -> None:
+        async with self._lock():
+            self.ready.clear()
+            await self._spawn()
+
+    async def _wait_ready(self) -> None:
+        while True:
+            await self.ready.wait()
+            async with self._lock():
+                if self.ready.is_set() and self.alive:
+                    return
+                # 終了したがまだ再起動されていない (ready が古いまま残っている)
+                self.ready.clear()
+
+    async def _spawn(self) -> None:
+        env = dict(os.environ)
+        # 親プロセスと同じ場所から chouseisan パッケージを読み込めるようにする
+        env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "chouseisan.workers",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, env=env
+        )
+        assert self.process.stdin is not None
+        _write_frame(self.process.stdin, {
+            "index": self.index, "options": self.options, "records": self.on_records is not None
+        })
+        await self.process.stdin.drain()
+        self._reader_task = asyncio.ensure_future(self._read_loop(self.process))
+        self.ready.set()
+        logger.info(f"Started worker {self.index} (pid {self.process.pid})")
+
+    async def _read_loop(self, process: asyncio.subprocess.Process) -> None:
+        assert process.stdout is not None
+        try:
+            while True:
+                message = await _read_frame(process.stdout)
+                # 記録は呼び出し元が待つのをやめていても (期限切れ等) 反映する
+                records = message.get("records")
+                if records and self.on_records is not None:
+                    try:
+                        await self.on_records(records)
+                    except Exception:
+                        logger.exception(f"Failed to record events from worker {self.index}")
+                entry = self._pending.get(message["id"])
+                if entry is None:
+                    continue
+                future, on_result = entry
+                if "progress" in message:
+                    if on_result is not None:
+                        try:
+                            await on_result(message["progress"])
+                        except Exception:
+                            logger.exception(f"Progress callback failed for worker {self.index}")
+                    continue
+                del self._pending[message["id"]]
+                if future.done():
+                    continue
+                if message["ok"]:
+                    future.set_result(message["result"])
+                else:
+                    future.set_exception(_decode_error(*message["error"]))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # 再起動後に古いプロセスの読み取りが終わった場合は、新しいプロセスの状態を変えない
+            if self.process is process:
+                self.ready.clear()
+            error = ChouseisanError(f"ワーカープロセス {self.index} が終了したため、処理が中断されました。")
+            for future, _ in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def call(
+        self,
+        method: str,
+        kwargs: Dict[str, Any],
+        on_result: Optional[ResultCallback] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        if not self.alive or not self.ready.is_set():
+            try:
+                await asyncio.wait_for(self._wait_ready(), timeout)
+            except asyncio.TimeoutError:
+                raise ChouseisanError(f"ワーカープロセス {self.index} が再起動中です。") from None
+        assert self.process is not None and self.process.stdin is not None
+        call_id = next(self._ids)
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = (future, on_result)
+        self.calls += 1
+        try:
+            _write_frame(self.process.stdin, {
+                "id": call_id, "method": method, "kwargs": kwargs, "progress": on_result is not None
+            })
+            await self.process.stdin.drain()
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(
+                f"ワーカープロセス {self.index} が制限時間 ({timeout:g} 秒) 内に応答しませんでした。"
+            ) from None
+        except ConnectionError as e:
+            raise ChouseisanError(f"ワーカープロセス {self.index} との通信に失敗しました: {e}") from e
+        except ChouseisanError:
+            self.failures += 1
+            raise
+        finally:
+            if self._pending.pop(call_id, None) is not None and self.alive:
+                # 取り消し・期限切れの場合はワーカー側の処理も止める
+                try:
+                    _write_frame(self.process.stdin, {"id": call_id, "cancel": True})
+                except Exception:
+                    pass
+
+    def kill(self) -> None:
+        if self.alive:
+            assert self.process is not None
+            self.process.kill()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """標準入力を閉じてワーカーに終了を促し、timeout 秒以内に終了しなければ強制終了します。"""
+        if self.process is None:
+            return
+        if self.alive and self.process.stdin is not None:
+            self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Worker {self.index} did not exit in {timeout:g}s; killing it")
+            self.kill()
+            await self.process.wait()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+class WorkerPool:
+    """
+    ワーカープロセスの集合。
+
+    - イベント URL を指定した呼び出しは常に同じワーカーに振り分けるため、キャッシュや
+      同じイベントへの書き込みの直列化はワーカー内でそのまま機能します。
+    - 終了したワーカーは restart_delay 秒後に再起動し、health_interval 秒ごとの ping に
+      health_timeout 秒以内に応答しないワーカーは強制終了して再起動します。
+    - on_records を指定すると、ワーカー内で行われたイベントの記録 (EventIndex の呼び出し) を受け取ります。
+    """
+
+    def __init__(
+        self,
+        size: int,
+        options: Optional[Dict[str, Any]] = None,
+        health_interval: float = 30.0,
+        health_timeout: float = 10.0,
+        restart_delay: float = 1.0,
+        on_records: Optional[RecordsCallback] = None
+    ):
+        if size < 1:
+            raise ValueError("ワーカー数は 1 以上を指定してください。")
+        self.size = size
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.restart_delay = restart_delay
+        self._workers = [_WorkerProcess(i, dict(options or {}), on_records) for i in range(size)]
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._started = False
+        self._closing = False
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            self._closing = False
+            await asyncio.gather(*(worker.start() for worker in self._workers))
+            self._tasks = [asyncio.ensure_future(self._supervise(worker)) for worker in self._workers]
+            if self.health_interval > 0:
+                self._tasks.append(asyncio.ensure_future(self._health_loop()))
+            self._started = True
+
+    async def close(self) -> None:
+        self._closing = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.gather(*(worker.stop() for worker in self._workers))
+        self._started = False
+
+    def _pick(self, key: Optional[str]) -> _WorkerProcess:
+        if key is not None:
+            return self._workers[zlib.crc32(key.encode()) % self.size]
+        return min(self._workers, key=lambda w: (not w.alive, w.inflight))
+
+    async def call(
+        self,
+        method: str,
+        kwargs: Dict[str, Any],
+        key: Optional[str] = None,
+        on_result: Optional[ResultCallback] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        ワーカーで ChouseisanClient のメソッドを実行し、結果を返します。
+
+        Args:
+            method: メソッド名 (WORKER_METHODS のいずれか)
+            kwargs: メソッドに渡すキーワード引数 (pickle 可能な値)
+            key: 振り分けに使うキー (正規化済みイベント URL)。None の場合は処理中の呼び出しが最も少ないワーカー
+            on_result: ワーカーから途中経過を受け取るコールバック (on_result 引数を持つメソッドのみ)
+            timeout: 応答を待つ最大秒数
+        """
+        await self.start()
+        return await self._pick(key).call(method, kwargs, on_result=on_result, timeout=timeout)
+
+    async def _supervise(self, worker: _WorkerProcess) -> None:
+        while True:
+            assert worker.process is not None
+            code = await worker.process.wait()
+            worker.mark_exited()
+            if self._closing:
+                return
+            logger.warning(f"Worker {worker.index} exited with code {code}; restarting in {self.restart_delay:g}s")
+            await asyncio.sleep(self.restart_delay)
+            while True:
+                try:
+                    await worker.start()
+                    break
+                except Exception:
+                    logger.exception(f"Failed to restart worker {worker.index}")
+                    await asyncio.sleep(self.restart_delay)
+            worker.restarts += 1
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await asyncio.gather(*(self._check(worker) for worker in self._workers if worker.alive))
+
+    async def _check(self, worker: _WorkerProcess) -> bool:
+        try:
+            await worker.call("ping", {}, timeout=self.health_timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"Worker {worker.index} failed health check; killing it: {e}")
+            worker.kill()
+            return False
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def broadcast(
+        self,
+        method: str,
+        kwargs: Dict[str, Any],
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """すべてのワーカーで同じメソッドを実行し、ワーカー順に結果を返します。"""
+        await self.start()
+        return await asyncio.gather(*(
+            worker.call(method, dict(kwargs), timeout=timeout) for worker in self._workers
+        ), return_exceptions=return_exceptions)
+
+    async def ping(self, return_exceptions: bool = False) -> List[Any]:
+        """各ワーカーの応答 (pid、ChouseisanClient.stats() と計測値の snapshot) を返します。"""
+        return await self.broadcast("ping", {}, timeout=self.health_timeout, return_exceptions=return_exceptions)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "alive": sum(1 for w in self._workers if w.alive),
+            "inflight": {str(w.index): w.inflight for w in self._workers},
+            "calls": {str(w.index): w.calls for w in self._workers},
+            "failures": {str(w.index): w.failures for w in self._workers},
+            "restarts": {str(w.index): w.restarts for w in self._workers},
+        }
+
+
+class WorkerClient:
+    """
+    ChouseisanClient と同じ操作を、ワーカープロセスで実行するクライアント。
+
+    ページ操作や HTML の解析はワーカーで行われるため、MCP サーバーのイベントループを占有しません。
+    ワーカーは自身の ChouseisanClient を環境変数 (と options) の設定で生成します。
+    イベントの記録 (EventIndex) は親プロセスにだけ持ち、ワーカーの ChouseisanClient が行った記録
+    (キャッシュを使わずに取得した場合のみ) を応答と一緒に受け取って再生します。
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        call_timeout: Optional[float] = None,
+        event_index: Optional[bool] = None,
+        **options: Any
+    ):
+        if call_timeout is None:
+            call_timeout = float(os.environ.get("CALL_TIMEOUT", str(options.get("timeout", 15000) / 1000)))
+        self.call_timeout = call_timeout
+        if event_index is None:
+            event_index = os.environ.get("EVENT_INDEX", "true").lower() in ("true", "1", "yes")
+        self.index: Optional[EventIndex] = EventIndex.from_env() if event_index else None
+        # BROWSER_MEMORY_LIMIT_MB はサーバー全体の上限のため、各ワーカーには等分した値を渡す
+        memory_limit = options.pop("browser_memory_limit", None)
+        if memory_limit is None:
+            memory_limit = int(float(os.environ.get("BROWSER_MEMORY_LIMIT_MB", "0")) * 2**20)
+        options["browser_memory_limit"] = memory_limit // max(workers, 1)
+        self.pool = WorkerPool(
+            workers,
+            dict(options, call_timeout=call_timeout, event_index=False),
+            health_interval=float(os.environ.get("WORKER_HEALTH_INTERVAL", "30")),
+            health_timeout=float(os.environ.get("WORKER_HEALTH_TIMEOUT", "10")),
+            on_records=self._replay_records if self.index is not None else None,
+        )
+        base_url = options.get("base_url") or os.environ.get("CHOUSEISAN_BASE_URL", ChouseisanClient.BASE_URL)
+        self.base_url = base_url.rstrip("/")
+        self.batch_concurrency = int(os.environ.get("BATCH_CONCURRENCY", "8"))
+        self.metrics = ClientMetrics(slow_call_threshold=float(os.environ.get("SLOW_CALL_THRESHOLD", "0")))
+
+    async def _replay_records(self, records: List[IndexRecord]) -> None:
+        assert self.index is not None
+        for method, args in records:
+            if method in _INDEX_RECORDS:
+                await self.index.run(getattr(self.index, method), *args)
+
+    async def start(self) -> None:
+        """ワーカープロセスを起動します。呼び出さなかった場合も、最初の操作時に自動で起動します。"""
+        await self.pool.start()
+
+    async def prewarm(self, browser: bool = True, http: Optional[bool] = None) -> None:
+        """ワーカープロセスを起動し、各ワーカーの共有ブラウザと HTTP 接続を事前に用意します。"""
+        with self.metrics.call("prewarm"):
+            await self.pool.broadcast("prewarm", {"browser": browser, "http": http})
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.pool.stats(),
+            "index": self.index.stats() if self.index is not None else None,
+        }
+
+    async def render_metrics(self, extra: Optional[Dict[str, Any]] = None) -> str:
+        """
+        計測値と統計情報を Prometheus のテキスト形式で返します。
+
+        起動済みのワーカーからは計測値と統計情報を取り寄せ、フェーズの所要時間と
+        各ワーカーの統計 (ブラウザ・キャッシュ等) の合計を親プロセスのものと併せて出力します。
+        応答しなかったワーカーの分は含めません。
+        """
+        replies: List[Any] = await self.pool.ping(return_exceptions=True) if self.pool.started else []
+        replies = [reply for reply in replies if isinstance(reply, dict)]
+        stats = _sum_stats([reply["stats"] for reply in replies])
+        stats.update(self.stats())
+        stats.update(extra or {})
+        return self.metrics.render(stats, [reply["metrics"] for reply in replies if "metrics" in reply])
+
+    async def __aenter__(self) -> "WorkerClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _call(
+        self,
+        method: str,
+        kwargs: Dict[str, Any],
+        event_url: Optional[str] = None,
+        on_result: Optional[ResultCallback] = None,
+        default_deadline: bool = True
+    ) -> Any:
+        # 外側 (get_events_info 等) の期限が先に来る場合はそれをワーカーに引き継ぐ
+        budget = kwargs.get("deadline")
+        outer = current_deadline()
+        if outer is not None:
+            budget = outer.remaining() if budget is None else min(budget, outer.remaining())
+            kwargs["deadline"] = budget
+        if budget is None and default_deadline:
+            budget = self.call_timeout
+        key = normalize_event_url(event_url) if event_url and event_url.startswith("http") else None
+        with self.metrics.call(method):
+            return await self.pool.call(
+                method, kwargs, key=key, on_result=on_result,
+                timeout=None if budget is None else budget + _DEADLINE_GRACE
+            )
+
+    async def create_event(self, title: str, memo: str = "", dates: str = "", deadline: Optional[float] = None) -> str:
+        return await self._call("create_event", {"title": title, "memo": memo, "dates": dates, "deadline": deadline})
+
+    async def get_event_info(
+        self,
+        event_url: str,
+        max_age: Optional[float] = None,
+        force_refresh: bool = False,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        return await self._call("get_event_info", {
+            "event_url": event_url, "max_age": max_age, "force_refresh": force_refresh, "deadline": deadline
+        }, event_url=event_url)
+
+    async def get_events_info(
+        self,
+        event_urls: Union[List[str], str],
+        max_age: Optional[float] = None,
+        force_refresh: bool = False,
+        concurrency: Optional[int] = None,
+        on_result: Optional[ResultCallback] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        # イベントごとに担当のワーカーへ振り分けるため、一括取得の制御は親プロセスで行う
+        with self.metrics.call("get_events_info"), deadline_scope(deadline):
+            return await fetch_events_info(
+                lambda url: self.get_event_info(url, max_age=max_age, force_refresh=force_refresh),
+                event_urls,
+                concurrency=concurrency or self.batch_concurrency,
+                on_result=on_result
+            )
+
+    async def get_responses(self, event_url: str, deadline: Optional[float] = None) -> Any:
+        return await self._call("get_responses", {"event_url": event_url, "deadline": deadline}, event_url=event_url)
+
+    async def watch_event(
+        self,
+        event_url: str,
+        cursor: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "watch_event", {"event_url": event_url, "cursor": cursor, "deadline": deadline}, event_url=event_url
+        )
+
+    async def list_events(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        created_only: bool = False,
+        limit: int = 50,
+        max_age: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        # 記録は親プロセスにあるため、取得し直しが必要なイベントだけをワーカーに依頼する
+        index = self._require_index()
+        with self.metrics.call("list_events"), deadline_scope(deadline):
+            entries = await index.run(index.list_events, since=since, until=until, created_only=created_only, limit=limit)
+            if max_age is not None and await refresh_stale_entries(
+                lambda url: self.get_event_info(url, max_age=max_age), entries, max_age, self.batch_concurrency
+            ):
+                entries = await index.run(index.list_events, since=since, until=until, created_only=created_only, limit=limit)
+            return entries
+
+    async def search_events(
+        self,
+        query: str = "",
+        date: Optional[str] = None,
+        limit: int = 50,
+        max_age: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        index = self._require_index()
+        with self.metrics.call("search_events"), deadline_scope(deadline):
+            entries = await index.run(index.search_events, query=query, date=date, limit=limit)
+            if max_age is not None and await refresh_stale_entries(
+                lambda url: self.get_event_info(url, max_age=max_age), entries, max_age, self.batch_concurrency
+            ):
+                entries = await index.run(index.search_events, query=query, date=date, limit=limit)
+            return entries
+
+    def _require_index(self) -> EventIndex:
+        if self.index is None:
+            raise ChouseisanError("イベントの記録が無効になっています (EVENT_INDEX=false)。")
+        return self.index
+
+    async def add_response(
+        self,
+        event_url: str,
+        name: str,
+        comment: str = "",
+        availability: Optional[Union[List[Any], str]] = None,
+        deadline: Optional[float] = None
+    ) -> ResponseResult:
+        return await self._call("add_response", {
+            "event_url": event_url, "name": name, "comment": comment,
+            "availability": availability, "deadline": deadline
+        }, event_url=event_url)
+
+    async def add_responses(
+        self,
+        event_url: str,
+        entries: Union[List[Dict[str, Any]], str],
+        on_result: Optional[ResultCallback] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._call(
+            "add_responses", {"event_url": event_url, "entries": entries, "deadline": deadline},
+            event_url=event_url, on_result=on_result, default_deadline=False
+        )
+
+
+class _ForwardingIndex:
+    """
+    ワーカー内の ChouseisanClient に EventIndex の代わりに渡し、記録の呼び出しを溜めておくもの。
+
+    溜まった記録は次に送る応答に添えて親プロセスへ送ります。
+    キャッシュから返した結果は記録されないため、親プロセスでも取得した場合だけが記録されます。
+    """
+
+    def __init__(self) -> None:
+        self._records: List[IndexRecord] = []
+
+    def record_created(self, url: str, title: str, memo: str = "", dates: Any = ()) -> None:
+        self._records.append(("record_created", (url, title, memo, list(dates))))
+
+    def record_info(self, info: Dict[str, Any]) -> None:
+        self._records.append(("record_info", (info,)))
+
+    def record_attendance(self, matrix: Any) -> None:
+        self._records.append(("record_attendance", (matrix,)))
+
+    async def run(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # 記録はメモリ上に溜めるだけなので、スレッドプールを使わずにそのまま実行する
+        return method(*args, **kwargs)
+
+    def drain(self) -> List[IndexRecord]:
+        records, self._records = self._records, []
+        return records
+
+    def stats(self) -> None:
+        # 記録は親プロセスの EventIndex にあるため、ワーカーには統計がない
+        return None
+
+
+def _sum_stats(stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """各ワーカーの stats() を、数値は足し合わせ、それ以外は最初の値を残してまとめます。"""
+    merged: Dict[str, Any] = {}
+    for item in stats:
+        for key, value in item.items():
+            current = merged.get(key)
+            if key not in merged:
+                merged[key] = _sum_stats([value]) if isinstance(value, dict) else value
+            elif isinstance(current, dict) and isinstance(value, dict):
+                merged[key] = _sum_stats([current, value])
+            elif isinstance(current, (int, float)) and isinstance(value, (int, float)):
+                merged[key] = current + value
+    return merged
+
+
+# 親プロセスで再生する EventIndex のメソッド
+_INDEX_RECORDS = frozenset({"record_created", "record_info", "record_attendance"})
+
+
+async def _serve() -> None:
+    """ワーカープロセスの本体。標準入力から要求を読み、ChouseisanClient で実行して応答を返します。"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    # 応答用に標準出力を複製し、print 等の出力が通信路に混ざらないよう fd 1 は標準エラーに向ける
+    channel = os.fdopen(os.dup(1), "wb", buffering=0)
+    os.dup2(2, 1)
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, channel)
+    writer = asyncio.StreamWriter(transport, protocol, None, loop)
+
+    init = await _read_frame(reader)
+    client = ChouseisanClient(**init["options"])
+    forwarding: Optional[_ForwardingIndex] = None
+    if init.get("records"):
+        forwarding = _ForwardingIndex()
+        client.index = forwarding  # type: ignore[assignment]
+    tasks: Dict[int, "asyncio.Task[None]"] = {}
+
+    async def reply(message: Dict[str, Any]) -> None:
+        _write_frame(writer, message)
+        await writer.drain()
+
+    async def handle(message: Dict[str, Any]) -> None:
+        call_id = message["id"]
+        method = message["method"]
+        kwargs = dict(message.get("kwargs") or {})
+        try:
+            if method == "ping":
+                result: Any = {"pid": os.getpid(), "stats": client.stats(), "metrics": client.metrics.snapshot()}
+            elif method not in WORKER_METHODS:
+                raise ChouseisanError(f"ワーカーで実行できない操作です: {method}")
+            else:
+                if message.get("progress"):
+                    async def on_result(result: Dict[str, Any]) -> None:
+                        await reply({"id": call_id, "progress": result})
+                    kwargs["on_result"] = on_result
+                result = await getattr(client, method)(**kwargs)
+            response = {"id": call_id, "ok": True, "result": result}
+        except Exception as e:
+            if not isinstance(e, ChouseisanError):
+                logger.exception(f"Unexpected error in worker call {method}")
+            response = {"id": call_id, "ok": False, "error": _encode_error(e)}
+        finally:
+            tasks.pop(call_id, None)
+        if forwarding is not None:
+            records = forwarding.drain()
+            if records:
+                response["records"] = records
+        await reply(response)
+
+    try:
+        # ブラウザは最初の操作時、または親プロセスからの prewarm で起動する
+        while True:
+            try:
+                message = await _read_frame(reader)
+            except asyncio.IncompleteReadError:
+                break
+            if message.get("cancel"):
+                task = tasks.get(message["id"])
+                if task is not None:
+                    task.cancel()
+                continue
+            tasks[message["id"]] = asyncio.ensure_future(handle(message))
+    finally:
+        for task in list(tasks.values()):
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        await client.close()
+
+
+def _worker_main() -> None:
+    log_level = getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
+    logging.basicConfig(
+        level=log_level,
+        format=f"%(asctime)s - worker[{os.getpid()}] - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr
+    )
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    _worker_main()
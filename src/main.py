@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+from chouseisan.startup import StartupTimer, process_age
+
+# 起動時間の計測はほかのモジュールの読み込みより前に開始する
+startup = StartupTimer(interpreter=process_age())
+
 import logging
 import json
 import argparse
+import asyncio
 import os
-from typing import List, Union, Any, Optional
-import uvicorn
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Union, Any, Optional, TYPE_CHECKING
 from dotenv import load_dotenv
 
-from chouseisan.client import ChouseisanClient, ChouseisanError, parse_availability_list
+from chouseisan.client import (
+    ChouseisanClient, ChouseisanError, group_event_urls, parse_availability_list, parse_event_urls, parse_response_entries
+)
+from chouseisan.watch import WatchSubscriptions
+
+# uvicorn (SSE モード) と WorkerClient (ワーカーモード) は利用する場合のみ読み込む
+if TYPE_CHECKING:
+    from chouseisan.workers import WorkerClient
 
 # 環境変数・ロギングの初期設定
 load_dotenv()
@@ -25,9 +39,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger("chouseisan-mcp")
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
 
+startup.mark("imports")
+
 # DNS Rebinding Protection の制御
 # コンテナ環境等、Host ヘッダーが 127.0.0.1/localhost 以外になる構成で SSE 転送を
 # 利用する場合、MCP_DISABLE_DNS_REBINDING_PROTECTION=1 を設定することで無効化できます。
@@ -44,10 +60,90 @@ mcp = FastMCP(
     instructions="調整さん (chouseisan.com) のイベント作成・管理・出欠登録を行う MCP サーバー",
     transport_security=_transport_security,
 )
-client = ChouseisanClient()
+def _create_client(workers: int) -> Union[ChouseisanClient, WorkerClient]:
+    """ワーカー数が 1 以上の場合はブラウザ操作を別プロセスで実行する WorkerClient を、それ以外は ChouseisanClient を生成します。"""
+    if workers > 0:
+        from chouseisan.workers import WorkerClient
+        logger.info(f"Running client operations in {workers} worker processes")
+        return WorkerClient(workers=workers)
+    return ChouseisanClient()
+
+# WORKERS の指定に応じて生成する (mcp dev 等で読み込まれた場合もこの設定で動作する)。
+# ワーカープロセスは最初の操作時に起動するため、生成時には起動しない
+default_workers = int(os.environ.get("WORKERS", "0"))
+client: Union[ChouseisanClient, WorkerClient] = _create_client(default_workers)
+
+# 起動直後にドライバ・ブラウザ・HTTP 接続をバックグラウンドで準備するか (--prewarm / PREWARM)
+prewarm = os.environ.get("PREWARM", "false").lower() in ("true", "1", "yes")
+# 起動 (MCP の待ち受け開始) までの目標秒数。超えた場合は内訳を警告ログに出力する (0 で無効)
+startup_budget = float(os.environ.get("STARTUP_BUDGET", "0"))
+
+# SSE モードで購読されたイベントリソースの差分を WATCH_INTERVAL 秒ごとに確認し、変化を通知する
+EVENT_RESOURCE_PREFIX = "chouseisan://events/"
+subscriptions = WatchSubscriptions(
+    lambda event_url, cursor: client.watch_event(event_url, cursor=cursor),
+    interval=float(os.environ.get("WATCH_INTERVAL", "60")),
+    concurrency=int(os.environ.get("BATCH_CONCURRENCY", "8")),
+)
+
+def _event_resource_url(key: str) -> str:
+    """イベントリソースのキー (URL の h パラメータ) からイベント URL を組み立てます。"""
+    return f"{client.base_url}/s?h={key}"
+
+def _format_watch_delta(delta: Dict[str, Any]) -> str:
+    """watch_event の差分を表示用のテキストに整形します。"""
+    lines = [f"■ イベント名: {delta['title']}", f"■ URL: {delta['url']}", f"■ カーソル: {delta['cursor']}"]
+    if not delta["changed"]:
+        lines.append("  (前回の確認から変更はありません)")
+        return "\n".join(lines)
+    if delta["reset"]:
+        lines.append("  (前回のカーソルが見つからないため、出欠表全体を返します)")
+
+    def respondent_line(r: Dict[str, Any]) -> str:
+        marks = " ".join({2: "○", 1: "△", 0: "×"}.get(s, "-") for s in r["availability"])
+        return f"  - {r['name']}: {marks}" + (f" ({r['comment']})" if r["comment"] else "")
+
+    if delta["dates_added"] or delta["dates_removed"] or delta["reset"]:
+        lines.append("■ 候補日程:")
+        lines.extend(f"  {i + 1}. {d}" for i, d in enumerate(delta["dates"]))
+    if delta["dates_added"] and not delta["reset"]:
+        lines.append("■ 追加された日程: " + ", ".join(delta["dates_added"]))
+    if delta["dates_removed"]:
+        lines.append("■ 削除された日程: " + ", ".join(delta["dates_removed"]))
+    if delta["respondents_added"]:
+        lines.append("■ 新しい回答 (日程順に ○/△/×, 未回答は -):")
+        lines.extend(respondent_line(r) for r in delta["respondents_added"])
+    if delta["respondents_changed"]:
+        lines.append("■ 変更された回答:")
+        lines.extend(respondent_line(r) for r in delta["respondents_changed"])
+    if delta["respondents_removed"]:
+        lines.append("■ 削除された回答: " + ", ".join(delta["respondents_removed"]))
+    return "\n".join(lines)
+
+def _format_index_entries(entries: List[Dict[str, Any]], empty: str) -> str:
+    """list_events / search_events の記録を表示用のテキストに整形します。"""
+    if not entries:
+        return empty
+
+    def when(ts: Optional[float]) -> str:
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(ts)) if ts is not None else "未取得"
+
+    blocks = [f"{len(entries)} 件のイベントが見つかりました。"]
+    for e in entries:
+        dates_str = "\n".join(f"  - {d}" for d in e["dates"]) or "  (候補日程の記録はありません)"
+        lines = [
+            f"■ イベント名: {e['title']}",
+            f"■ URL: {e['url']}",
+            f"■ {'作成日時' if e['created'] else '記録日時'}: {when(e['added_at'])} (最終取得: {when(e['fetched_at'])})",
+            f"■ 候補日程:\n{dates_str}",
+        ]
+        if e["respondents"] is not None:
+            lines.append(f"■ 回答者数: {e['respondents']} 名 ({when(e['responses_at'])} 時点)")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
 
 @mcp.tool()
-async def create_event(title: str, memo: str = "", dates: str = "") -> str:
+async def create_event(title: str, memo: str = "", dates: str = "", timeout: Optional[float] = None) -> str:
     """
     調整さんの日程調整イベントを新規作成します。
 
@@ -55,13 +151,14 @@ async def create_event(title: str, memo: str = "", dates: str = "") -> str:
         title: イベント名・タイトル (例: "プロジェクト打ち合わせ")
         memo: イベントの補足説明・メモ (例: "オンライン開催。アジェンダは後日連絡")
         dates: 候補日程 (改行区切りで指定。例: "3/1(土) 19:00-\n3/2(日) 15:00-\n3/3(月) 20:00-")
+        timeout: 処理全体の制限時間 (秒)。指定しない場合はサーバー設定 (CALL_TIMEOUT) に従う (例: 30)
 
     Returns:
         作成された調整さんイベントのURLおよび完了メッセージ
     """
     logger.info(f"Tool create_event invoked for title='{title}'")
     try:
-        url = await client.create_event(title=title, memo=memo, dates=dates)
+        url = await client.create_event(title=title, memo=memo, dates=dates, deadline=timeout)
         return f"イベントを作成しました。\nURL: {url}"
     except ChouseisanError as e:
         logger.error(f"Chouseisan client error in create_event: {e}")
@@ -71,19 +168,29 @@ async def create_event(title: str, memo: str = "", dates: str = "") -> str:
         return f"エラー: 予期せぬエラーが発生しました。詳細: {str(e)}"
 
 @mcp.tool()
-async def get_event_info(url: str) -> str:
+async def get_event_info(
+    url: str,
+    max_age: Optional[float] = None,
+    force_refresh: bool = False,
+    timeout: Optional[float] = None
+) -> str:
     """
     調整さんイベントの登録情報（イベント名、候補日程一覧）を取得します。
 
     Args:
         url: 取得対象の調整さんイベントURL (例: "https://chouseisan.com/s?h=...")
+        max_age: 許容するキャッシュの経過秒数。指定しない場合はサーバー設定の TTL まで (例: 0 で常に再取得)
+        force_refresh: true の場合はキャッシュを使わずに最新の情報を取得する
+        timeout: 処理全体の制限時間 (秒)。指定しない場合はサーバー設定 (CALL_TIMEOUT) に従う (例: 30)
 
     Returns:
         イベント名、URL、および候補日程一覧のフォーマットテキスト
     """
     logger.info(f"Tool get_event_info invoked for url='{url}'")
     try:
-        info = await client.get_event_info(url=url)
+        info = await client.get_event_info(
+            event_url=url, max_age=max_age, force_refresh=force_refresh, deadline=timeout
+        )
         dates_list = info.get("dates", [])
         if dates_list:
             dates_str = "\n".join(f"  - {d}" for d in dates_list)
@@ -98,12 +205,241 @@ async def get_event_info(url: str) -> str:
         logger.exception("Unexpected error in get_event_info")
         return f"エラー: 予期せぬエラーが発生しました。詳細: {str(e)}"
 
+@mcp.tool()
+async def get_events_info(
+    urls: Union[List[str], str],
+    ctx: Context,
+    max_age: Optional[float] = None,
+    force_refresh: bool = False,
+    timeout: Optional[float] = None
+) -> str:
+    """
+    複数の調整さんイベントの登録情報（イベント名、候補日程一覧）をまとめて取得します。
+    同じイベントの URL は 1 回だけ取得し、取得が終わった順に結果を並べます。
+    1 件の失敗で全体が中断されることはありません。
+
+    Args:
+        urls: 取得対象の調整さんイベントURLのリスト、または改行・カンマ区切りの文字列
+              (例: ["https://chouseisan.com/s?h=...", "https://chouseisan.com/s?h=..."])
+        max_age: 許容するキャッシュの経過秒数。指定しない場合はサーバー設定の TTL まで (例: 0 で常に再取得)
+        force_refresh: true の場合はキャッシュを使わずに最新の情報を取得する
+        timeout: 一括取得全体の制限時間 (秒)。指定しない場合は全体の制限を設けず、
+                 イベントごとにサーバー設定 (CALL_TIMEOUT) を適用する (例: 60)
+
+    Returns:
+        イベントごとのイベント名・候補日程、または失敗理由のフォーマットテキスト
+    """
+    logger.info("Tool get_events_info invoked")
+    try:
+        total = len(group_event_urls(parse_event_urls(urls)))
+        done = 0
+
+        async def on_result(result: Dict[str, Any]) -> None:
+            nonlocal done
+            done += 1
+            status = result["info"]["title"] if result["success"] else f"エラー: {result['error']}"
+            await ctx.report_progress(done, total, f"{result['url']}: {status}")
+
+        results = await client.get_events_info(
+            event_urls=urls, max_age=max_age, force_refresh=force_refresh,
+            on_result=on_result, deadline=timeout
+        )
+        succeeded = sum(1 for r in results if r["success"])
+        blocks = [f"{len(results)} 件中 {succeeded} 件のイベント情報を取得しました。"]
+        for r in results:
+            if r["success"]:
+                info = r["info"]
+                dates_str = "\n".join(f"  - {d}" for d in info["dates"]) or "  (候補日程が見つかりませんでした)"
+                blocks.append(f"■ イベント名: {info['title']}\n■ URL: {info['url']}\n■ 候補日程:\n{dates_str}")
+            else:
+                blocks.append(f"■ URL: {r['url']}\n■ エラー: {r['error']}")
+        return "\n\n".join(blocks)
+    except ChouseisanError as e:
+        logger.error(f"Chouseisan client error in get_events_info: {e}")
+        return f"エラー: 情報の一括取得に失敗しました。詳細: {str(e)}"
+    except Exception as e:
+        logger.exception("Unexpected error in get_events_info")
+        return f"エラー: 予期せぬエラーが発生しました。詳細: {str(e)}"
+
+@mcp.tool()
+async def get_responses(url: str, timeout: Optional[float] = None) -> str:
+    """
+    調整さんイベントの出欠表全体（回答者ごとの ○/△/× とコメント）を取得します。
+
+    Args:
+        url: 取得対象の調整さんイベントURL (例: "https://chouseisan.com/s?h=...")
+        timeout: 処理全体の制限時間 (秒)。指定しない場合はサーバー設定 (CALL_TIMEOUT) に従う (例: 30)
+
+    Returns:
+        候補日程一覧と、回答者ごとの出欠・コメントのフォーマットテキスト
+    """
+    logger.info(f"Tool get_responses invoked for url='{url}'")
+    try:
+        matrix = await client.get_responses(event_url=url, deadline=timeout)
+        dates_str = "\n".join(f"  {i + 1}. {d}" for i, d in enumerate(matrix.dates)) or "  (候補日程が見つかりませんでした)"
+        rows_str = matrix.format_table() or "  (回答者はいません)"
+        return (
+            f"■ イベント名: {matrix.title}\n■ URL: {matrix.url}\n"
+            f"■ 候補日程:\n{dates_str}\n"
+            f"■ 回答 ({len(matrix)} 名, 日程順に ○/△/×, 未回答は -):\n{rows_str}"
+        )
+    except ChouseisanError as e:
+        logger.error(f"Chouseisan client error in get_responses: {e}")
+        return f"エラー: 出欠表の取得に失敗しました。詳細: {str(e)}"
+    except Exception as e:
+        logger.exception("Unexpected error in get_responses")
+        return f"エラー: 予期せぬエラーが発生しました。詳細: {str(e)}"
+
+@mcp.tool()
+async def watch_event(url: str, cursor: Optional[str] = None, timeout: Optional[float] = None) -> str:
+    """
+    調整さんイベントの出欠表について、前回の確認以降に変化した部分 (回答・日程の追加/変更/削除) だけを返します。
+    定期的に新しい回答を確認する場合は、前回の結果に含まれるカーソルを cursor に指定してください。
+
+    Args:
+        url: 確認対象の調整さんイベントURL (例: "https://chouseisan.com/s?h=...")
+        cursor: 前回の watch_event の結果に含まれるカーソル。省略時は出欠表全体を返す (例: "3f2a9c0d1e4b5a67")
+        timeout: 処理全体の制限時間 (秒)。指定しない場合はサーバー設定 (CALL_TIMEOUT) に従う (例: 30)
+
+    Returns:
+        次回指定するカーソルと、変化した日程・回答者のフォーマットテキスト
+    """
+    logger.info(f"Tool watch_event invoked for url='{url}'")
+    try:
+        delta = await client.watch_event(event_url=url, cursor=cursor or None, deadline=timeout)
+        return _format_watch_delta(delta)
+    except ChouseisanError as e:
+        logger.error(f"Chouseisan client error in watch_event: {e}")
+        return f"エラー: 出欠表の変更確認に失敗しました。詳細: {str(e)}"
+    except Exception as e:
+        logger.exception("Unexpected error in watch_event")
+        return f"エラー: 予期せぬエラーが発生しました。詳細: {str(e)}"
+
+@mcp.tool()
+async def list_events(
+    days: Optional[float] = None,
+    created_only: bool = False,
+    limit: int = 20,
+    max_age: Optional[float] = None,
+    timeout: Optional[float] = None
+) -> str:
+    """
+    このサーバーで作成・取得した調整さんイベントの記録を、新しい順に一覧します (調整さんへの再アクセスは不要)。
+    「先週作成したイベントとその日程」のような問い合わせに使用します。
+
+    Args:
+        days: 直近何日以内に作成・記録されたイベントに限るか (例: 7)。省略時は期間を限定しない
+        created_only: true の場合はこのサーバーで作成したイベントに限る
+        limit: 表示する最大件数 (例: 20)
+        max_age: 指定した場合、最終取得からこの秒数を超えた記録だけを取得し直してから返す (例: 3600)
+        timeout: 取得し直す場合の全体の制限時間 (秒) (例: 60)
+
+    Returns:
+        イベントごとのイベント名・URL・作成日時・候補日程・回答者数のフォーマットテキスト
+    """
+    logger.info("Tool list_events invoked")
+    try:
+        since = time.time() - days * 86400 if days is not None else None
+        entries = await client.list_events(
+            since=since, created_only=created_only, limit=max(limit, 1), max_age=max_age, deadline=timeout
+        )
+        return _format_index_entries(entries, "記録されたイベントはありません。")
+    except ChouseisanError as e:
+        logger.error(f"Chouseisan client error in list_events: {e}")
+        return f"エラー: イベントの一覧に失敗しました。詳細: {str(e)}"
+    except Exception as e:
+        logger.exception("Unexpected error in list_events")
+        return f"エラー: 予期せぬエラーが発生しました。詳細: {str(e)}"
+
+@mcp.tool()
+async def search_events(
+    query: str = "",
+    date: Optional[str] = None,
+    limit: int = 20,
+    max_age: Optional[float] = None,
+    timeout: Optional[float] = None
+) -> str:
+    """
+    このサーバーで作成・取得した調整さんイベントの記録を、タイトルや候補日程で検索します。
+
+    Args:
+        query: イベント名または候補日程に含まれる文字列 (例: "打ち合わせ")
+        date: 候補日程の前方一致 (例: "3/1")
+        limit: 表示する最大件数 (例: 20)
+        max_age: 指定した場合、最終取得からこの秒数を超えた記録だけを取得し直してから返す (例: 3600)
+        timeout: 取得し直す場合の全体の制限時間 (秒) (例: 60)
+
+    Returns:
+        見つかったイベントごとのイベント名・URL・作成日時・候補日程・回答者数のフォーマットテキスト
+    """
+    logger.info(f"Tool search_events invoked for query='{query}', date='{date}'")
+    try:
+        entries = await client.search_events(
+            query=query, date=date or None, limit=max(limit, 1), max_age=max_age, deadline=timeout
+        )
+        return _format_index_entries(entries, "条件に一致するイベントは見つかりませんでした。")
+    except ChouseisanError as e:
+        logger.error(f"Chouseisan client error in search_events: {e}")
+        return f"エラー: イベントの検索に失敗しました。詳細: {str(e)}"
+    except Exception as e:
+        logger.exception("Unexpected error in search_events")
+        return f"エラー: 予期せぬエラーが発生しました。詳細: {str(e)}"
+
+@mcp.resource(
+    EVENT_RESOURCE_PREFIX + "{key}",
+    mime_type="application/json",
+    description="調整さんイベントの出欠表 (key は イベントURL の h パラメータ)。SSE モードでは購読すると回答の変化が通知されます。"
+)
+async def event_resource(key: str) -> str:
+    delta = await client.watch_event(event_url=_event_resource_url(key))
+    return json.dumps(delta, ensure_ascii=False)
+
+@mcp.tool()
+async def summarize_event(url: str, top: int = 3, timeout: Optional[float] = None) -> str:
+    """
+    調整さんイベントの出欠を日程ごとに集計し、参加しやすい候補日程のランキングを返します。
+
+    Args:
+        url: 集計対象の調整さんイベントURL (例: "https://chouseisan.com/s?h=...")
+        top: ランキングとして表示する候補日程の件数 (例: 3)
+        timeout: 処理全体の制限時間 (秒)。指定しない場合はサーバー設定 (CALL_TIMEOUT) に従う (例: 30)
+
+    Returns:
+        日程ごとの ○/△/× の人数と、おすすめ日程のランキング
+    """
+    logger.info(f"Tool summarize_event invoked for url='{url}'")
+    try:
+        matrix = await client.get_responses(event_url=url, deadline=timeout)
+        if not matrix.dates:
+            return f"■ イベント名: {matrix.title}\n■ URL: {matrix.url}\n  (候補日程が見つかりませんでした)"
+
+        totals_str = "\n".join(
+            f"  - {t['date']}: ○ {t['ok']} / △ {t['maybe']} / × {t['ng']} (未回答 {t['no_answer']})"
+            for t in matrix.totals()
+        )
+        ranking_str = "\n".join(
+            f"  {rank}. {t['date']} (○ {t['ok']} / △ {t['maybe']} / × {t['ng']})"
+            for rank, t in enumerate(matrix.rank_dates(top=max(top, 1)), start=1)
+        )
+        return (
+            f"■ イベント名: {matrix.title}\n■ URL: {matrix.url}\n■ 回答者数: {len(matrix)} 名\n"
+            f"■ 日程ごとの集計:\n{totals_str}\n"
+            f"■ おすすめ日程:\n{ranking_str}"
+        )
+    except ChouseisanError as e:
+        logger.error(f"Chouseisan client error in summarize_event: {e}")
+        return f"エラー: 出欠の集計に失敗しました。詳細: {str(e)}"
+    except Exception as e:
+        logger.exception("Unexpected error in summarize_event")
+        return f"エラー: 予期せぬエラーが発生しました。詳細: {str(e)}"
+
 @mcp.tool()
 async def add_response(
     url: str,
     name: str,
     comment: str = "",
-    availability: Union[List[Union[int, str]], str] = []
+    availability: Union[List[Union[int, str]], str] = [],
+    timeout: Optional[float] = None
 ) -> str:
     """
     調整さんイベントに出欠回答を登録・更新します。
@@ -116,6 +452,7 @@ async def add_response(
                       数値 (2: ○, 1: △, 0: ×) や 記号 ("○", "△", "×"),
                       または JSON 文字列 '[2, 1, 0]' や カンマ区切り '○, △, ×' の形式で指定可能。
                       例: ["○", "△", "×"] または [2, 1, 0]
+        timeout: 処理全体の制限時間 (秒)。指定しない場合はサーバー設定 (CALL_TIMEOUT) に従う (例: 30)
 
     Returns:
         出欠登録の結果メッセージ
@@ -123,14 +460,18 @@ async def add_response(
     logger.info(f"Tool add_response invoked for name='{name}', url='{url}'")
     try:
         parsed_avail = parse_availability_list(availability)
-        success = await client.add_response(
+        result = await client.add_response(
             event_url=url,
             name=name,
             comment=comment,
-            availability=parsed_avail
+            availability=parsed_avail,
+            deadline=timeout
         )
-        if success:
-            return f"'{name}' さんの出欠回答を正常に登録しました。"
+        if result:
+            message = f"'{name}' さんの出欠回答を正常に登録しました。"
+            if result.warnings:
+                message += "\n■ 入力できなかった日程:\n" + "\n".join(f"  - {warning}" for warning in result.warnings)
+            return message
         else:
             return "エラー: 出欠の登録に失敗しました。"
     except ChouseisanError as e:
@@ -140,20 +481,169 @@ async def add_response(
         logger.exception("Unexpected error in add_response")
         return f"エラー: 予期せぬ例外が発生しました。詳細: {str(e)}"
 
+@mcp.tool()
+async def add_responses(
+    url: str,
+    entries: Union[List[Dict[str, Any]], str],
+    ctx: Context,
+    timeout: Optional[float] = None
+) -> str:
+    """
+    調整さんイベントに複数人の出欠回答をまとめて登録します (スプレッドシートからの取り込み等)。
+    1 件の失敗で全体が中断されることはなく、エントリごとの結果を返します。
+
+    Args:
+        url: 回答対象の調整さんイベントURL (例: "https://chouseisan.com/s?h=...")
+        entries: 回答エントリのリスト、またはその JSON 文字列。
+                 各エントリは name (必須), comment, availability を持つオブジェクトで、
+                 availability は add_response と同じ形式で指定可能。
+                 例: [{"name": "山田太郎", "comment": "", "availability": ["○", "△", "×"]},
+                      {"name": "佐藤花子", "availability": [2, 2, 0]}]
+        timeout: 一括登録全体の制限時間 (秒)。指定しない場合は全体の制限を設けず、
+                 エントリごとにサーバー設定 (CALL_TIMEOUT) を適用する (例: 120)
+
+    Returns:
+        登録件数の集計と、失敗したエントリの一覧
+    """
+    logger.info(f"Tool add_responses invoked for url='{url}'")
+    try:
+        total = len(parse_response_entries(entries))
+        done = 0
+
+        async def on_result(result: Dict[str, Any]) -> None:
+            nonlocal done
+            done += 1
+            await ctx.report_progress(done, total)
+
+        results = await client.add_responses(event_url=url, entries=entries, on_result=on_result, deadline=timeout)
+        succeeded = sum(1 for r in results if r["success"])
+        lines = [f"{len(results)} 件中 {succeeded} 件の出欠回答を登録しました。"]
+        failures = [r for r in results if not r["success"]]
+        if failures:
+            lines.append("■ 登録に失敗したエントリ:")
+            lines.extend(f"  - [{r['index']}] {r['name'] or '(名前なし)'}: {r['error']}" for r in failures)
+        partial = [r for r in results if r["success"] and r.get("warnings")]
+        if partial:
+            lines.append("■ 一部の日程を入力できなかったエントリ:")
+            for r in partial:
+                lines.extend(f"  - [{r['index']}] {r['name']}: {warning}" for warning in r["warnings"])
+        return "\n".join(lines)
+    except ChouseisanError as e:
+        logger.error(f"Chouseisan client error in add_responses: {e}")
+        return f"エラー: 出欠の一括登録に失敗しました。詳細: {str(e)}"
+    except Exception as e:
+        logger.exception("Unexpected error in add_responses")
+        return f"エラー: 予期せぬ例外が発生しました。詳細: {str(e)}"
+
+startup.mark("setup")
+
+async def _prewarm_client() -> None:
+    with startup.phase("prewarm"):
+        await client.prewarm()
+    logger.info(f"Prewarm finished: {startup.report()}")
+
+@asynccontextmanager
+async def _client_lifespan(app: Any = None):
+    """
+    サーバーの起動・終了に合わせてクライアントを準備・終了します。
+
+    prewarm が有効な場合は MCP の初期化と並行してドライバ・ブラウザ・HTTP 接続を準備し、
+    無効な場合は最初のツール呼び出し時に起動します。
+    """
+    startup.mark("transport")
+    elapsed = startup.elapsed()
+    if startup_budget and elapsed > startup_budget:
+        logger.warning(f"Startup took {elapsed:.3f}s (budget {startup_budget:g}s): {startup.report()}")
+    else:
+        logger.info(f"Startup: {startup.report()}")
+    task = asyncio.ensure_future(_prewarm_client()) if prewarm else None
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await client.close()
+
+async def _metrics_endpoint(request: Any) -> Any:
+    """操作・フェーズごとの所要時間と各種統計を Prometheus のテキスト形式で返します。"""
+    from starlette.responses import PlainTextResponse
+    return PlainTextResponse(
+        await client.render_metrics({"startup": startup.stats()}),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+def _enable_resource_subscriptions() -> None:
+    """イベントリソースの購読を受け付け、サーバーの機能として購読対応を通知します。"""
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def subscribe(uri: Any) -> None:
+        uri = str(uri)
+        if not uri.startswith(EVENT_RESOURCE_PREFIX):
+            raise ValueError(f"購読できないリソースです: {uri}")
+        subscriptions.subscribe(uri, _event_resource_url(uri[len(EVENT_RESOURCE_PREFIX):]), server.request_context.session)
+        logger.info(f"Subscribed to {uri} ({len(subscriptions)} resources watched)")
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: Any) -> None:
+        subscriptions.unsubscribe(str(uri), server.request_context.session)
+
+    get_capabilities = server.get_capabilities
+
+    def get_capabilities_with_subscribe(*args: Any, **kwargs: Any) -> Any:
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities_with_subscribe
+
+@asynccontextmanager
+async def _sse_lifespan(app: Any = None):
+    """共有ブラウザに加えて、購読中のリソースの定期確認を実行します。"""
+    async with _client_lifespan(app):
+        task = asyncio.ensure_future(subscriptions.run())
+        try:
+            yield
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+def _build_sse_app():
+    """共有ブラウザのライフサイクル、リソース購読の通知、/metrics を組み込んだ SSE アプリを生成します。"""
+    from starlette.routing import Route
+    _enable_resource_subscriptions()
+    app = mcp.sse_app()
+    app.router.lifespan_context = _sse_lifespan
+    app.router.routes.append(Route("/metrics", _metrics_endpoint, methods=["GET"]))
+    return app
+
+async def _run_stdio() -> None:
+    async with _client_lifespan():
+        await mcp.run_stdio_async()
+
 if __name__ == "__main__":
     default_host = os.environ.get("HOST", "0.0.0.0")
     default_port = int(os.environ.get("PORT", "8000"))
     default_transport = os.environ.get("TRANSPORT", "stdio").lower()
-
     parser = argparse.ArgumentParser(description="調整さん MCP サーバー")
     parser.add_argument("--host", type=str, default=default_host, help="バインドIPアドレス (SSE 転送モード時)")
     parser.add_argument("--port", type=int, default=default_port, help="待機ポート番号 (SSE 転送モード時)")
     parser.add_argument("--transport", type=str, default=default_transport, choices=["stdio", "sse"], help="通信モード (stdio または sse)")
+    parser.add_argument("--workers", type=int, default=default_workers, help="ブラウザ操作を実行するワーカープロセス数 (0 の場合はサーバーと同じプロセスで実行)")
+    parser.add_argument("--prewarm", action="store_true", default=prewarm, help="起動直後にブラウザと HTTP 接続をバックグラウンドで準備する")
     args = parser.parse_args()
+    prewarm = args.prewarm
+
+    # --workers が WORKERS と異なる場合だけ作り直す
+    if args.workers != default_workers:
+        client = _create_client(args.workers)
 
     if args.transport == "sse":
+        import uvicorn
         logger.info(f"Starting Chouseisan MCP SSE Server on {args.host}:{args.port}")
-        uvicorn.run(mcp.sse_app, host=args.host, port=args.port)
+        uvicorn.run(_build_sse_app, factory=True, host=args.host, port=args.port)
     else:
         logger.info("Starting Chouseisan MCP Server in STDIO mode")
-        mcp.run(transport="stdio")
+        asyncio.run(_run_stdio())
@@ -0,0 +1,82 @@
+import os
+import unittest
+from unittest import mock
+
+from benchmarks.standin import StandinServer, render_event_page
+from chouseisan import attendance
+from chouseisan.attendance import MAYBE, NG, NO_ANSWER, OK, AttendanceMatrix, extract_attendance, extract_event_info_markup
+from chouseisan.parser import extract_event_info, parse_html
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+class TestExtractAttendance(unittest.TestCase):
+    def test_attendance_table(self):
+        matrix = extract_attendance(load_fixture("event_page.html"))
+        self.assertEqual(matrix.title, "プロジェクト打ち合わせ")
+        self.assertEqual(matrix.dates, ["3/1(土) 19:00-", "3/2(日) 15:00-", "3/3(月) 20:00-"])
+        self.assertEqual(matrix.respondents, ["山田太郎", "佐藤花子", "鈴木一郎"])
+        self.assertEqual(matrix.comments, ["遅れる可能性があります", "", "オンラインなら参加"])
+        self.assertEqual(matrix.row(0), [OK, OK, NG])
+        self.assertEqual(matrix.row(1), [OK, MAYBE, MAYBE])
+        self.assertEqual(list(matrix.column(0)), [OK, OK, NG])
+
+    def test_header_only_table(self):
+        matrix = extract_attendance(load_fixture("event_page_attendance_only.html"))
+        self.assertEqual(matrix.shape, (0, 2))
+        self.assertEqual([t["ok"] for t in matrix.totals()], [0, 0])
+
+    def test_missing_table(self):
+        self.assertIsNone(extract_attendance(load_fixture("event_page_no_dates.html")))
+
+    def test_icon_cells(self):
+        markup = (
+            "<table id='attendance-table'><tr><th>名前</th><th>コメント</th><th>A</th><th>B</th><th>C</th></tr>"
+            "<tr><td>X</td><td></td><td><img alt='○'></td><td><span class='oax-1'></span></td><td></td></tr></table>"
+        )
+        self.assertEqual(extract_attendance(markup).row(0), [OK, MAYBE, NO_ANSWER])
+
+class TestExtractEventInfoMarkup(unittest.TestCase):
+    def test_same_result_as_full_tree(self):
+        for name in ("event_page.html", "event_page_attendance_only.html", "event_page_no_dates.html"):
+            markup = load_fixture(name)
+            self.assertEqual(extract_event_info_markup(markup), extract_event_info(parse_html(markup)), name)
+
+    def test_tree_size_does_not_grow_with_respondents(self):
+        server = StandinServer()
+        parsed = []
+
+        def recording_parse(markup):
+            parsed.append(len(markup))
+            return parse_html(markup)
+
+        for respondents in (1, 200):
+            server.seed_event(30, respondents)
+        small, large = [render_event_page(event, "token") for event in server.events.values()]
+        with mock.patch.object(attendance, "parse_html", side_effect=recording_parse):
+            self.assertEqual(len(extract_event_info_markup(large)["dates"]), 30)
+            extract_event_info_markup(small)
+        self.assertGreater(len(large), 4 * len(small))
+        # 出欠表の行は要素ツリーに含めないため、解析する量は回答者数によらずほぼ一定
+        self.assertLess(parsed[0], len(small) * 1.1)
+
+class TestAttendanceMatrix(unittest.TestCase):
+    def test_totals_and_ranking(self):
+        matrix = AttendanceMatrix.from_rows(
+            ["A", "B", "C"],
+            [("p1", "", [OK, MAYBE, OK]), ("p2", "", [NG, OK, OK]), ("p3", "", [OK, OK])],
+        )
+        totals = matrix.totals()
+        self.assertEqual(
+            [(t["ok"], t["maybe"], t["ng"], t["no_answer"]) for t in totals],
+            [(2, 0, 1, 0), (2, 1, 0, 0), (2, 0, 0, 1)]
+        )
+        self.assertEqual([t["date"] for t in matrix.rank_dates()], ["B", "C", "A"])
+        self.assertEqual([t["date"] for t in matrix.rank_dates(top=1)], ["B"])
+        self.assertEqual(matrix.to_dict()["respondents"][2]["availability"], [OK, OK, NO_ANSWER])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from benchmarks.standin import StandinServer
+from chouseisan.client import ChouseisanClient, group_event_urls, parse_event_urls
+
+class TestParseEventUrls(unittest.TestCase):
+    def test_formats(self):
+        urls = ["https://chouseisan.com/s?h=a", "https://chouseisan.com/s?h=b"]
+        self.assertEqual(parse_event_urls(urls), urls)
+        self.assertEqual(parse_event_urls('["https://chouseisan.com/s?h=a", "https://chouseisan.com/s?h=b"]'), urls)
+        self.assertEqual(parse_event_urls("https://chouseisan.com/s?h=a,\n https://chouseisan.com/s?h=b"), urls)
+        self.assertEqual(parse_event_urls(None), [])
+
+    def test_group_duplicates(self):
+        groups = group_event_urls([
+            "https://chouseisan.com/s?h=a",
+            "https://chouseisan.com/s?h=b",
+            "https://Chouseisan.com/s?h=a#top",
+        ])
+        self.assertEqual([(g["index"], g["indices"]) for g in groups], [(0, [0, 2]), (1, [1])])
+
+class TestGetEventsInfo(unittest.IsolatedAsyncioTestCase):
+    async def test_batch(self):
+        with StandinServer(latency=0.02) as server:
+            urls = [server.seed_event(2, 3), server.seed_event(4, 1)]
+            client = ChouseisanClient(base_url=server.base_url, read_mode="http", cache_ttl=30)
+            streamed = []
+
+            async def on_result(result):
+                streamed.append(result["index"])
+
+            try:
+                results = await client.get_events_info(
+                    [urls[0], "not-a-url", urls[1], urls[0]], concurrency=2, on_result=on_result
+                )
+            finally:
+                await client.close()
+
+            self.assertEqual(streamed, [r["index"] for r in results])
+            by_index = {r["index"]: r for r in results}
+            self.assertEqual(sorted(by_index), [0, 1, 2])
+            self.assertEqual(by_index[0]["indices"], [0, 3])
+            self.assertEqual(len(by_index[0]["info"]["dates"]), 2)
+            self.assertEqual(len(by_index[2]["info"]["dates"]), 4)
+            self.assertFalse(by_index[1]["success"])
+            self.assertIn("無効なURL", by_index[1]["error"])
+            # 無効な URL は最初に失敗するため、完了順では先頭に並ぶ
+            self.assertEqual(results[0]["index"], 1)
+            self.assertEqual(len(server.phase_stats()["event"]), 2)
+
+if __name__ == "__main__":
+    unittest.main()
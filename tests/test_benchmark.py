@@ -0,0 +1,86 @@
+import unittest
+
+from benchmarks.run import _parse_args, compare, parse_sizes, percentile, run_benchmark
+from benchmarks.standin import StandinServer
+from chouseisan.client import ChouseisanClient
+
+class TestBenchmarkHelpers(unittest.TestCase):
+    def test_percentile(self):
+        samples = [float(i) for i in range(1, 101)]
+        self.assertAlmostEqual(percentile(samples, 50), 50.5)
+        self.assertAlmostEqual(percentile(samples, 99), 99.01)
+        self.assertEqual(percentile([3.0], 95), 3.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_parse_sizes_and_compare(self):
+        self.assertEqual(parse_sizes("5x10, 30X200"), [(5, 10), (30, 200)])
+        row = {"operation": "get_event_info", "concurrency": 1, "dates": 5, "respondents": 10,
+               "latency_ms": {"p50": 10.0, "p95": 20.0, "p99": 40.0}, "throughput_rps": 100.0}
+        faster = dict(row, latency_ms={"p50": 5.0, "p95": 20.0, "p99": 30.0}, throughput_rps=150.0)
+        result = compare({"results": [faster]}, {"results": [row]})
+        self.assertEqual(result[0]["p50_change"], -50.0)
+        self.assertEqual(result[0]["p99_change"], -25.0)
+        self.assertEqual(result[0]["throughput_change"], 50.0)
+
+class TestRunBenchmark(unittest.IsolatedAsyncioTestCase):
+    async def test_report_includes_client_phase_breakdown(self):
+        args = _parse_args([
+            "--concurrency", "1", "--sizes", "2x3", "--requests", "3", "--warmup", "1",
+            "--latency-ms", "0", "--operations", "get_event_info,add_response",
+        ])
+        report = await run_benchmark(args)
+        by_operation = {r["operation"]: r for r in report["results"]}
+        read = by_operation["get_event_info"]["client_phases"]
+        self.assertEqual(read["parse"]["count"], 3)
+        self.assertLessEqual(read["parse"]["p50_ms"], read["parse"]["p99_ms"])
+        write = by_operation["add_response"]["client_phases"]
+        self.assertEqual(write["submit"]["per_request"], 1.0)
+        self.assertIn("load_form", write)
+
+class TestStandinServer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = StandinServer().start()
+        self.client = ChouseisanClient(
+            base_url=self.server.base_url, read_mode="http", write_mode="http", cache_ttl=0
+        )
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.server.stop()
+
+    async def test_http_round_trip(self):
+        url = await self.client.create_event("送別会", "駅前集合", "3/1(土) 19:00-\n3/2(日) 15:00-")
+        self.assertTrue(url.startswith(self.server.base_url + "/s?h="))
+
+        info = await self.client.get_event_info(url)
+        self.assertEqual(info["title"], "送別会")
+        self.assertEqual(info["dates"], ["3/1(土) 19:00-", "3/2(日) 15:00-"])
+
+        self.assertTrue(await self.client.add_response(url, "山田", "よろしく", ["○", "×"]))
+        matrix = await self.client.get_responses(url)
+        self.assertEqual(matrix.respondents, ["山田"])
+        self.assertEqual(matrix.comments, ["よろしく"])
+        self.assertEqual(matrix.row(0), [2, 0])
+
+        phases = self.server.phase_stats()
+        self.assertEqual(len(phases["create"]), 1)
+        self.assertEqual(len(phases["member_update"]), 1)
+
+        metrics = self.client.metrics.render()
+        self.assertIn('chouseisan_phase_duration_seconds_count{tool="create_event",phase="submit",outcome="success"} 1', metrics)
+        self.assertIn('chouseisan_phase_duration_seconds_count{tool="get_responses",phase="parse",outcome="success"} 1', metrics)
+
+    async def test_seed_event(self):
+        url = self.server.seed_event(4, 25)
+        matrix = await self.client.get_responses(url)
+        self.assertEqual(matrix.shape, (25, 4))
+
+    def test_rejects_url_outside_base_host(self):
+        self.assertTrue(self.client._is_service_url(self.server.event_url("abc")))
+        self.assertFalse(self.client._is_service_url("https://chouseisan.com/s?h=abc"))
+        default = ChouseisanClient()
+        self.assertTrue(default._is_service_url("https://chouseisan.com/s?h=abc"))
+        self.assertFalse(default._is_service_url("https://example.com/chouseisan.com"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import unittest
+from unittest import mock
+
+from chouseisan.blocking import ResourceBlocker
+
+class TestResourceBlocker(unittest.TestCase):
+    def test_default_rules(self):
+        blocker = ResourceBlocker()
+        self.assertIsNone(blocker.should_block("https://chouseisan.com/s?h=abc", "document"))
+        self.assertIsNone(blocker.should_block("https://chouseisan.com/js/app.js", "script"))
+        self.assertEqual(blocker.should_block("https://chouseisan.com/img/logo.png", "image"), "type")
+        self.assertEqual(blocker.should_block("https://chouseisan.com/css/style.css", "stylesheet"), "type")
+        self.assertEqual(blocker.should_block("https://www.googletagmanager.com/gtm.js", "script"), "domain")
+        self.assertIsNone(blocker.should_block("https://notgoogletagmanager.com/x.js", "script"))
+
+    def test_from_env(self):
+        env = {
+            "BLOCK_RESOURCE_TYPES": "image",
+            "BLOCK_DOMAINS": "tracker.example",
+            "ALLOW_DOMAINS": "cdn.chouseisan.com",
+        }
+        with mock.patch.dict(os.environ, env):
+            blocker = ResourceBlocker.from_env()
+        self.assertIsNone(blocker.should_block("https://chouseisan.com/css/style.css", "stylesheet"))
+        self.assertEqual(blocker.should_block("https://a.tracker.example/t.js", "script"), "domain")
+        self.assertIsNone(blocker.should_block("https://cdn.chouseisan.com/logo.png", "image"))
+        self.assertEqual(blocker.should_block("https://chouseisan.com/logo.png", "image"), "type")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,260 @@
+import asyncio
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from chouseisan import memory
+from chouseisan.browser import BrowserPool
+from chouseisan.deadline import deadline_scope
+from chouseisan.errors import DeadlineExceededError, OverloadedError
+from chouseisan.metrics import ClientMetrics
+from chouseisan.profile import StorageState
+
+MB = 2 ** 20
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    def is_closed(self):
+        return self.context.closed
+
+class FakeContext:
+    def __init__(self):
+        self._cookies = []
+        self.closed = False
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def add_cookies(self, cookies):
+        self._cookies.extend(cookies)
+
+    async def cookies(self):
+        return list(self._cookies)
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def __init__(self, args):
+        self.args = args
+        self.closed = False
+        self.contexts = []
+
+    def is_connected(self):
+        return not self.closed
+
+    def on(self, event, handler):
+        pass
+
+    async def new_context(self):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, headless, timeout, args):
+        browser = FakeBrowser(args)
+        self.launched.append(browser)
+        return browser
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+class TestBrowserPoolLifecycle(unittest.IsolatedAsyncioTestCase):
+    def make_pool(self, **kwargs):
+        pool = BrowserPool(**kwargs)
+        pool._playwright = FakePlaywright()
+        return pool, pool._playwright
+
+    async def test_prewarmed_contexts_are_leased_from_one_browser(self):
+        pool, playwright = self.make_pool(size=2)
+        await pool.start()
+        [browser] = playwright.chromium.launched
+        prewarmed = list(browser.contexts)
+        self.assertEqual(len(prewarmed), 2)
+
+        async with pool.page("a") as page:
+            # 事前に用意したコンテキストを新たに作らずに貸し出す
+            self.assertIn(page.context, prewarmed)
+            self.assertEqual(len(browser.contexts), 2)
+        for _ in range(3):
+            async with pool.page("b"):
+                pass
+        self.assertEqual(len(playwright.chromium.launched), 1)
+        await pool.close()
+
+    async def test_each_lease_gets_a_fresh_context(self):
+        pool, playwright = self.make_pool(size=1)
+        async with pool.page("a") as page:
+            first = page.context
+            await first.add_cookies([{"name": "session", "value": "1"}])
+        # 返却したコンテキストは破棄され、状態は次の貸し出しに持ち越されない
+        self.assertTrue(first.closed)
+        await settle()
+        async with pool.page("b") as page:
+            self.assertIsNot(page.context, first)
+            self.assertEqual(await page.context.cookies(), [])
+        await pool.close()
+
+    async def test_close_shuts_down_contexts_browser_and_driver(self):
+        pool, playwright = self.make_pool(size=2)
+        await pool.start()
+        [browser] = playwright.chromium.launched
+        await pool.close()
+        self.assertTrue(all(c.closed for c in browser.contexts))
+        self.assertTrue(browser.closed)
+        self.assertTrue(playwright.stopped)
+        self.assertFalse(pool.started)
+        self.assertEqual(pool._idle, [])
+
+    async def test_disconnected_browser_is_relaunched(self):
+        pool, playwright = self.make_pool(size=1)
+        await pool.start()
+        playwright.chromium.launched[0].closed = True
+        async with pool.page("a"):
+            pass
+        self.assertEqual(len(playwright.chromium.launched), 2)
+        await pool.close()
+
+    async def test_waiting_for_a_slot_is_bounded_by_the_deadline(self):
+        pool, playwright = self.make_pool(size=1)
+        metrics = ClientMetrics()
+        async with pool.page("a"):
+            with metrics.call("get_event_info"), deadline_scope(0.05):
+                with self.assertRaises(DeadlineExceededError):
+                    async with pool.page("b"):
+                        pass
+        self.assertIn(
+            'chouseisan_phase_duration_seconds_count{tool="get_event_info",phase="queue_wait",'
+            'outcome="TimeoutError"} 1',
+            metrics.render()
+        )
+        # 枠は解放されており、次の貸し出しは待たずに行える
+        async with pool.page("c"):
+            pass
+        await pool.close()
+
+class TestBrowserRecycling(unittest.IsolatedAsyncioTestCase):
+    def make_pool(self, **kwargs):
+        pool = BrowserPool(**kwargs)
+        pool._playwright = FakePlaywright()
+        return pool, pool._playwright.chromium.launched
+
+    async def test_recycle_after_page_count_waits_for_inflight_calls(self):
+        pool, launched = self.make_pool(size=2, max_pages=2)
+        async with pool.page("a"):
+            async with pool.page("b"):
+                pass
+            await settle()
+            self.assertEqual(pool.stats()["draining"], 1)
+            self.assertFalse(launched[0].closed)
+            async with pool.page("c"):
+                self.assertEqual(len(launched), 2)
+        await settle()
+        self.assertTrue(launched[0].closed)
+        self.assertFalse(launched[1].closed)
+        self.assertEqual(pool.stats()["recycled"]["pages"], 1)
+        await pool.close()
+
+    async def test_recycle_by_memory(self):
+        pool, launched = self.make_pool(size=1, max_memory=200 * MB)
+        async with pool.page("a"):
+            pass
+        with mock.patch.object(memory, "tree_memory", side_effect=lambda markers: {m: 300 * MB for m in markers}):
+            await pool.check_memory()
+        self.assertEqual(pool.stats()["recycled"]["memory"], 1)
+        await settle()
+        self.assertTrue(launched[0].closed)
+        self.assertTrue(launched[0].args[0].startswith("--chouseisan-browser="))
+        await pool.close()
+
+    @unittest.skipUnless(memory.available(), "/proc が利用できない環境")
+    async def test_memory_monitor_starts_with_the_first_lease(self):
+        pool, launched = self.make_pool(size=1, max_memory=200 * MB, memory_check_interval=0.01)
+        with mock.patch.object(memory, "tree_memory", side_effect=lambda markers: {m: 300 * MB for m in markers}):
+            # start() / prewarm を呼ばずに貸し出しだけを行う
+            async with pool.page("a"):
+                pass
+            for _ in range(50):
+                if pool.stats()["recycled"]["memory"]:
+                    break
+                await asyncio.sleep(0.01)
+        self.assertGreaterEqual(pool.stats()["recycled"]["memory"], 1)
+        await settle()
+        self.assertTrue(launched[0].closed)
+        await pool.close()
+        self.assertIsNone(pool._monitor_task)
+
+    async def test_memory_limit_rejects_new_leases(self):
+        pool, launched = self.make_pool(size=2, memory_limit=100 * MB)
+        with mock.patch.object(memory, "tree_memory", side_effect=lambda markers: {m: 300 * MB for m in markers}):
+            async with pool.page("a"):
+                await pool.check_memory()
+                self.assertEqual(pool.stats()["memory_bytes"], 300 * MB)
+                with self.assertRaises(OverloadedError):
+                    async with pool.page("b"):
+                        pass
+            await settle()
+            # 上限を超えたブラウザは処理の終了後に終了し、次の貸し出しは新しいブラウザで行う
+            async with pool.page("c"):
+                self.assertEqual(len(launched), 2)
+        self.assertEqual(pool.stats()["recycled"]["limit"], 1)
+        await pool.close()
+
+class TestStorageStateSharing(unittest.IsolatedAsyncioTestCase):
+    async def test_write_operations_never_see_or_save_cookies(self):
+        state = StorageState(os.devnull + ".missing")
+        state._cookies = [{"name": "consent", "value": "1", "domain": "chouseisan.com", "path": "/", "expires": -1}]
+        saved = []
+
+        async def capture(context):
+            saved.append(await context.cookies())
+
+        state.capture = capture
+        pool = BrowserPool(size=1, storage_state=state)
+        pool._playwright = FakePlaywright()
+        async with pool.page("add_response"):
+            pass
+        self.assertEqual(saved, [])
+        async with pool.page("get_event_info"):
+            pass
+        self.assertEqual([c["name"] for c in saved[0]], ["consent"])
+        await pool.close()
+
+@unittest.skipUnless(memory.available(), "/proc が利用できない環境")
+class TestTreeMemory(unittest.TestCase):
+    def test_process_tree_memory(self):
+        marker = "--chouseisan-test-marker"
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(10)", marker])
+        try:
+            usage = memory.tree_memory([marker, "--missing-marker"])
+        finally:
+            child.kill()
+            child.wait()
+        self.assertGreater(usage[marker], 1 * MB)
+        self.assertEqual(usage["--missing-marker"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
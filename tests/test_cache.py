@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+
+from chouseisan.cache import EventInfoCache, normalize_event_url
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestNormalizeEventUrl(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(
+            normalize_event_url(" HTTPS://Chouseisan.com:443/s?h=abc&b=1#top "),
+            "https://chouseisan.com/s?b=1&h=abc"
+        )
+        self.assertEqual(normalize_event_url("http://localhost:8080"), "http://localhost:8080/")
+
+class TestEventInfoCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = EventInfoCache(ttl=10, max_size=2, clock=self.clock)
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return {"title": f"v{self.calls}", "dates": []}
+
+    async def test_ttl_and_max_age(self):
+        self.assertEqual((await self.cache.get_or_fetch("a", self.fetch))["title"], "v1")
+        self.clock.now = 5
+        self.assertEqual((await self.cache.get_or_fetch("a", self.fetch))["title"], "v1")
+        self.assertEqual((await self.cache.get_or_fetch("a", self.fetch, max_age=1))["title"], "v2")
+        self.clock.now = 16
+        self.assertEqual((await self.cache.get_or_fetch("a", self.fetch))["title"], "v3")
+        self.assertEqual((await self.cache.get_or_fetch("a", self.fetch, force_refresh=True))["title"], "v4")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 4)
+
+    async def test_lru_eviction(self):
+        for key in ("a", "b"):
+            await self.cache.get_or_fetch(key, self.fetch)
+        await self.cache.get_or_fetch("a", self.fetch)  # a を最近使用にする
+        await self.cache.get_or_fetch("c", self.fetch)  # b が破棄される
+        await self.cache.get_or_fetch("a", self.fetch)
+        await self.cache.get_or_fetch("b", self.fetch)
+        self.assertEqual(self.calls, 4)
+
+    async def test_singleflight(self):
+        results = await asyncio.gather(*(self.cache.get_or_fetch("a", self.fetch) for _ in range(5)))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual({r["title"] for r in results}, {"v1"})
+        self.assertEqual(self.cache.stats()["coalesced"], 4)
+
+    async def test_follower_gets_result_when_first_caller_is_cancelled(self):
+        release = asyncio.Event()
+
+        async def slow_fetch():
+            await release.wait()
+            return await self.fetch()
+
+        leader = asyncio.ensure_future(self.cache.get_or_fetch("a", slow_fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(self.cache.get_or_fetch("a", slow_fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        release.set()
+        self.assertEqual((await follower)["title"], "v1")
+        self.assertEqual(self.calls, 1)
+        # 取得結果はキャッシュにも保存される
+        self.assertEqual((await self.cache.get_or_fetch("a", self.fetch))["title"], "v1")
+
+    async def test_fetch_is_cancelled_when_no_caller_is_waiting(self):
+        cancelled = asyncio.Event()
+
+        async def hanging_fetch():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.ensure_future(self.cache.get_or_fetch("a", hanging_fetch))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1.0)
+        self.assertEqual(self.cache.stats()["inflight"], 0)
+        self.assertEqual((await self.cache.get_or_fetch("a", self.fetch))["title"], "v1")
+
+    async def test_invalidate_discards_inflight_result(self):
+        task = asyncio.ensure_future(self.cache.get_or_fetch("a", self.fetch))
+        await asyncio.sleep(0)
+        self.cache.invalidate("a")
+        await task
+        await self.cache.get_or_fetch("a", self.fetch)
+        self.assertEqual(self.calls, 2)
+
+    async def test_errors_are_not_cached(self):
+        async def failing():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            await self.cache.get_or_fetch("a", failing)
+        self.assertEqual((await self.cache.get_or_fetch("a", self.fetch))["title"], "v1")
+
+if __name__ == "__main__":
+    unittest.main()
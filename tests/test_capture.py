@@ -0,0 +1,140 @@
+import unittest
+
+from chouseisan.client import ChouseisanClient
+from chouseisan.errors import ScrapingError
+
+class FakeRequest:
+    def __init__(self, url, method="POST", navigation=True):
+        self.url = url
+        self.method = method
+        self._navigation = navigation
+
+    def is_navigation_request(self):
+        return self._navigation
+
+class FakeResponse:
+    def __init__(self, status, headers=None, body="", url=""):
+        self.status = status
+        self.headers = headers or {}
+        self.url = url
+        self._body = body
+
+    async def text(self):
+        return self._body
+
+class FakeRoute:
+    def __init__(self, request, response):
+        self.request = request
+        self._response = response
+        self.fetches = 0
+        self.outcome = None
+
+    async def fetch(self, max_redirects=None, timeout=None):
+        assert max_redirects == 0
+        self.fetches += 1
+        return self._response
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def fulfill(self, status=None, response=None):
+        self.outcome = ("fulfill", status if response is None else response.status)
+
+class FakeApiRequest:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    async def get(self, url, timeout=None):
+        self.requested.append(url)
+        return FakeResponse(200, body=self.pages[url], url=url)
+
+class FakePage:
+    def __init__(self, pages=None):
+        self.handler = None
+        self.unrouted = False
+        self.request = FakeApiRequest(pages or {})
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    async def unroute(self, pattern, handler):
+        if handler is self.handler:
+            self.handler = None
+            self.unrouted = True
+
+class TestCaptureCreatedEventUrl(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = ChouseisanClient()
+
+    async def test_redirect_to_event_page(self):
+        page = FakePage()
+        async with self.client._capture_created_event_url(page) as captured:
+            subresource = FakeRoute(FakeRequest("https://chouseisan.com/js/app.js", "GET", False), None)
+            await page.handler(subresource)
+            self.assertEqual(subresource.outcome, "fallback")
+
+            submit = FakeRoute(
+                FakeRequest("https://chouseisan.com/schedule/newEvent/create"),
+                FakeResponse(302, {"location": "/s?h=abc123"})
+            )
+            await page.handler(submit)
+            self.assertEqual(await captured, "https://chouseisan.com/s?h=abc123")
+        self.assertEqual(submit.outcome, ("fulfill", 204))
+        self.assertEqual(page.request.requested, [])
+        self.assertTrue(page.unrouted)
+
+    async def test_redirect_to_completion_page(self):
+        complete = "https://chouseisan.com/schedule/newEvent/complete?h=abc123"
+        page = FakePage({complete: '<input class="new-event-url-input" value="https://chouseisan.com/s?h=abc123">'})
+        async with self.client._capture_created_event_url(page) as captured:
+            submit = FakeRoute(
+                FakeRequest("https://chouseisan.com/schedule/newEvent/create"),
+                FakeResponse(302, {"location": "/schedule/newEvent/complete?h=abc123"})
+            )
+            await page.handler(submit)
+            self.assertEqual(await captured, "https://chouseisan.com/s?h=abc123")
+        self.assertEqual(page.request.requested, [complete])
+
+    async def test_unrecognized_response_is_passed_to_browser(self):
+        page = FakePage()
+        async with self.client._capture_created_event_url(page) as captured:
+            submit = FakeRoute(
+                FakeRequest("https://chouseisan.com/schedule/newEvent/create"),
+                FakeResponse(200, body="<p>入力内容を確認してください</p>")
+            )
+            await page.handler(submit)
+            with self.assertRaises(ScrapingError):
+                await captured
+        self.assertEqual(submit.outcome, ("fulfill", 200))
+        self.assertEqual(submit.fetches, 1)
+
+    async def test_route_and_future_are_released_when_the_block_fails(self):
+        page = FakePage()
+        with self.assertRaises(RuntimeError):
+            async with self.client._capture_created_event_url(page) as captured:
+                raise RuntimeError("click failed")
+        self.assertTrue(captured.cancelled())
+        self.assertTrue(page.unrouted)
+
+    async def test_unawaited_failure_is_consumed(self):
+        page = FakePage()
+        handler = None
+        async with self.client._capture_created_event_url(page) as captured:
+            handler = page.handler
+            # 他の合図が先に来たため、送信の応答の失敗は誰にも待たれない
+            submit = FakeRoute(
+                FakeRequest("https://chouseisan.com/schedule/newEvent/create"),
+                FakeResponse(200, body="<p>入力内容を確認してください</p>")
+            )
+            await handler(submit)
+        self.assertTrue(captured.done())
+        # 例外は回収済みのため、破棄時に "Future exception was never retrieved" は出ない
+        self.assertFalse(captured._log_traceback)
+        self.assertTrue(page.unrouted)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from chouseisan.client import parse_availability_status, parse_availability_list
+from chouseisan.client import ChouseisanClient, parse_availability_status, parse_availability_list
 
 class TestChouseisanClientUtils(unittest.TestCase):
     def test_parse_availability_status(self):
@@ -43,5 +43,69 @@ class TestChouseisanClientUtils(unittest.TestCase):
         self.assertEqual(parse_availability_list(None), [])
         self.assertEqual(parse_availability_list(""), [])
 
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    @property
+    def first(self):
+        return self
+
+    async def count(self):
+        return 1
+
+    async def click(self, timeout=None):
+        self.page.clicked.append(self.selector)
+
+class FakeFormPage:
+    """出欠フォームの操作を記録し、evaluate には指定した結果を返す Page"""
+
+    def __init__(self, applied):
+        self.applied = applied
+        self.clicked = []
+        self.filled = {}
+        self.evaluated = []
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        pass
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    async def wait_for_load_state(self, state, timeout=None):
+        pass
+
+    async def fill(self, selector, value, timeout=None):
+        self.filled[selector] = value
+
+    async def evaluate(self, script, arg):
+        self.evaluated.append(arg)
+        return self.applied
+
+class TestFillResponseForm(unittest.IsolatedAsyncioTestCase):
+    async def test_all_fields_applied_in_one_evaluate(self):
+        page = FakeFormPage({"applied": [0, 1], "missingInput": [], "missingButton": []})
+        warnings = await ChouseisanClient()._fill_response_form(
+            page, "https://chouseisan.com/s?h=x", "山田", "よろしく", [2, 0]
+        )
+        self.assertEqual(warnings, [])
+        self.assertEqual(page.evaluated, [{"statuses": [2, 0], "classes": {"2": "oax-0", "1": "oax-1", "0": "oax-2"}}])
+        self.assertEqual(page.filled, {'input[name="name"]': "山田", 'input[name="hitokoto"]': "よろしく"})
+
+    async def test_missing_fields_are_reported_per_date(self):
+        page = FakeFormPage({"applied": [0], "missingInput": [2], "missingButton": [1]})
+        warnings = await ChouseisanClient()._submit_response_on_page(
+            page, "https://chouseisan.com/s?h=x", "山田", "", [2, 1, 0]
+        )
+        self.assertEqual(len(warnings), 2)
+        self.assertIn("kouho3", warnings[0])
+        self.assertIn("入力欄", warnings[0])
+        self.assertIn("kouho2", warnings[1])
+        self.assertIn(".oax-1", warnings[1])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import time
+import unittest
+
+from benchmarks.standin import StandinServer
+from chouseisan.client import ChouseisanClient
+from chouseisan.deadline import check, current, deadline_scope, first_success, step_timeout_ms
+from chouseisan.errors import ChouseisanError, DeadlineExceededError
+from chouseisan.scheduler import OperationScheduler
+
+class TestDeadlineScope(unittest.IsolatedAsyncioTestCase):
+    async def test_nested_scopes_keep_earliest_deadline(self):
+        self.assertIsNone(current())
+        self.assertEqual(step_timeout_ms(15000), 15000)
+        with deadline_scope(1.0) as outer:
+            with deadline_scope(10.0) as inner:
+                self.assertIs(inner, outer)
+            with deadline_scope(0.5) as inner:
+                self.assertIsNot(inner, outer)
+                self.assertLessEqual(step_timeout_ms(15000), 500)
+            self.assertIs(current(), outer)
+        self.assertIsNone(current())
+
+    async def test_check_and_minimum_step_timeout(self):
+        with deadline_scope(0.01):
+            await asyncio.sleep(0.02)
+            self.assertEqual(step_timeout_ms(15000), 1.0)
+            with self.assertRaises(DeadlineExceededError):
+                check("テスト")
+        check("テスト")
+
+    async def test_first_success(self):
+        async def after(delay, value=None, error=None):
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+            return value
+
+        slow = after(1.0, "slow")
+        self.assertEqual(await first_success([slow, after(0.01, "fast")]), (1, "fast"))
+        self.assertEqual(await first_success([after(0, error=TimeoutError()), after(0.01, "url")]), (1, "url"))
+        with self.assertRaises(KeyError):
+            await first_success([after(0, error=TimeoutError()), after(0.01, error=KeyError())])
+
+    async def test_first_success_when_every_awaitable_is_cancelled(self):
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future(), loop.create_future()]
+        loop.call_soon(futures[0].cancel)
+        loop.call_later(0.01, futures[1].cancel)
+        with self.assertRaises(ChouseisanError):
+            await first_success(futures)
+
+    async def test_scheduler_wait_is_bounded_by_deadline(self):
+        scheduler = OperationScheduler(max_concurrency=1, max_queue=4, max_wait=5)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.admit("op"):
+                await release.wait()
+
+        task = asyncio.ensure_future(holder())
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        with deadline_scope(0.05):
+            with self.assertRaises(DeadlineExceededError):
+                async with scheduler.admit("op"):
+                    pass
+        self.assertLess(time.monotonic() - started, 1.0)
+        release.set()
+        await task
+
+class TestClientDeadline(unittest.IsolatedAsyncioTestCase):
+    async def test_http_read_stops_at_deadline(self):
+        with StandinServer(latency=0.5) as server:
+            url = server.seed_event(3, 2)
+            client = ChouseisanClient(base_url=server.base_url, read_mode="http", cache_ttl=0)
+            try:
+                started = time.monotonic()
+                with self.assertRaises(DeadlineExceededError):
+                    await client.get_event_info(url, deadline=0.1)
+                self.assertLess(time.monotonic() - started, 0.4)
+            finally:
+                await client.close()
+
+if __name__ == "__main__":
+    unittest.main()
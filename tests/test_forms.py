@@ -0,0 +1,233 @@
+import os
+import unittest
+from urllib.parse import parse_qsl
+
+import httpx
+
+from chouseisan.client import ChouseisanClient
+from chouseisan.errors import FormShapeError, ScrapingError
+from chouseisan.forms import availability_value, find_csrf_token, find_form
+from chouseisan.parser import parse_html
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+class TestFindForm(unittest.TestCase):
+    def test_create_form(self):
+        doc = parse_html(load_fixture("top_page.html"))
+        form = find_form(doc, "https://chouseisan.com/", ("name", "comment", "kouho"))
+        self.assertEqual(form.action, "https://chouseisan.com/schedule/newEvent/create")
+        self.assertEqual(
+            form.build({"name": "送別会", "kouho": "3/1\n3/2"}),
+            [("_token", "create-token-001"), ("name", "送別会"), ("comment", ""),
+             ("kouho", "3/1\n3/2"), ("timezone", "Asia/Tokyo")]
+        )
+        self.assertEqual(find_csrf_token(doc), "meta-token-789")
+
+    def test_availability_value(self):
+        doc = parse_html(load_fixture("event_page.html"))
+        form = find_form(doc, "https://chouseisan.com/s?h=abc", ("name", "kouho1"))
+        self.assertEqual(availability_value(form, "kouho1", 2), "1")
+        self.assertEqual(availability_value(form, "kouho2", 1), "2")
+        self.assertEqual(availability_value(form, "kouho3", 0), "3")
+
+    def test_missing_form(self):
+        doc = parse_html(load_fixture("event_page.html"))
+        with self.assertRaises(FormShapeError):
+            find_form(doc, "https://chouseisan.com/s?h=abc", ("name", "kouho4"))
+
+class TestHttpWriteMode(unittest.IsolatedAsyncioTestCase):
+    def make_client(self, handler) -> ChouseisanClient:
+        client = ChouseisanClient(write_mode="http")
+        client._http._transport = httpx.MockTransport(handler)
+        self.browser_calls = []
+
+        self.browser_warnings = []
+
+        async def fake_browser(*args):
+            self.browser_calls.append(args)
+            return True
+
+        async def fake_browser_response(*args):
+            self.browser_calls.append(args)
+            return list(self.browser_warnings)
+
+        client._add_response_browser = fake_browser_response
+        client._create_event_browser = fake_browser
+        self.addAsyncCleanup(client.close)
+        return client
+
+    async def test_create_event_from_redirect(self):
+        posted = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("top_page.html"))
+            posted.append((str(request.url), request.headers.get("x-csrf-token"), dict(parse_qsl(request.content.decode()))))
+            return httpx.Response(302, headers={"Location": "/s?h=newevent"})
+
+        client = self.make_client(handler)
+        url = await client.create_event("送別会", memo="memo", dates="3/1\n3/2")
+        self.assertEqual(url, "https://chouseisan.com/s?h=newevent")
+        action, token, data = posted[0]
+        self.assertEqual(action, "https://chouseisan.com/schedule/newEvent/create")
+        self.assertEqual(token, "meta-token-789")
+        self.assertEqual(data["_token"], "create-token-001")
+        self.assertEqual(data["kouho"], "3/1\n3/2")
+        self.assertEqual(self.browser_calls, [])
+
+    async def test_add_response_posts_form(self):
+        posted = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("event_page.html"))
+            posted.append(dict(parse_qsl(request.content.decode(), keep_blank_values=True)))
+            return httpx.Response(302, headers={"Location": "/s?h=abc"})
+
+        client = self.make_client(handler)
+        ok = await client.add_response("https://chouseisan.com/s?h=abc", "山田", "よろしく", ["○", "△", "×"])
+        self.assertTrue(ok)
+        self.assertEqual(posted, [{
+            "h": "abc", "_token": "form-token-123", "name": "山田", "hitokoto": "よろしく",
+            "kouho1": "1", "kouho2": "2", "kouho3": "3",
+        }])
+        self.assertEqual(self.browser_calls, [])
+
+    async def test_add_response_rejected_form_is_an_error(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("event_page.html"))
+            # 入力エラーでフォームが再表示された (回答者は出欠表に含まれない)
+            return httpx.Response(200, text=load_fixture("event_page_rejected.html"))
+
+        client = self.make_client(handler)
+        with self.assertRaises(ScrapingError):
+            await client.add_response("https://chouseisan.com/s?h=abc", "山田", "", [2])
+        self.assertEqual(self.browser_calls, [])
+
+    async def test_add_response_redirect_away_from_event_is_an_error(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("event_page.html"))
+            return httpx.Response(302, headers={"Location": "/"})
+
+        client = self.make_client(handler)
+        with self.assertRaises(ScrapingError):
+            await client.add_response("https://chouseisan.com/s?h=abc", "山田", "", [2])
+
+    async def test_add_response_accepts_page_listing_respondent(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            # 送信の応答として、回答者を含む出欠表が直接返される
+            return httpx.Response(200, text=load_fixture("event_page.html"))
+
+        client = self.make_client(handler)
+        self.assertTrue(await client.add_response("https://chouseisan.com/s?h=abc", "佐藤花子", "", [2]))
+
+    async def test_rejected_update_of_existing_respondent_is_an_error(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("event_page.html"))
+            # 更新が拒否され、以前の行 (○, ○, ×) のままフォームが再表示された
+            return httpx.Response(200, text=load_fixture("event_page_rejected.html"))
+
+        client = self.make_client(handler)
+        with self.assertRaises(ScrapingError):
+            await client.add_response("https://chouseisan.com/s?h=abc", "山田太郎", "", [0, 0, 0])
+
+    async def test_add_response_falls_back_when_form_does_not_match(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("event_page_no_dates.html"))
+            raise AssertionError("form must not be posted")
+
+        client = self.make_client(handler)
+        self.browser_warnings = ["2 番目の日程の入力欄が見つかりませんでした。"]
+        result = await client.add_response("https://chouseisan.com/s?h=abc", "山田", "", [2])
+        self.assertEqual(len(self.browser_calls), 1)
+        # ブラウザで入力できなかった日程は 1 件の登録でも結果に含める
+        self.assertTrue(result)
+        self.assertEqual(result.warnings, ["2 番目の日程の入力欄が見つかりませんでした。"])
+
+    async def test_add_responses_collects_per_entry_results(self):
+        posted = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("event_page.html"))
+            data = dict(parse_qsl(request.content.decode(), keep_blank_values=True))
+            posted.append(data["name"])
+            if data["name"] == "失敗":
+                return httpx.Response(500)
+            return httpx.Response(302, headers={"Location": "/s?h=abc"})
+
+        client = self.make_client(handler)
+        streamed = []
+
+        async def on_result(result):
+            streamed.append(result["index"])
+
+        results = await client.add_responses(
+            "https://chouseisan.com/s?h=abc",
+            '[{"name": "山田", "availability": "○,○,×"}, {"comment": "名前なし"},'
+            ' {"name": "失敗", "availability": [0]}, {"name": "佐藤", "availability": [1, 1, 1]}]',
+            on_result=on_result,
+        )
+        self.assertEqual([r["success"] for r in results], [True, False, False, True])
+        self.assertEqual([r["index"] for r in results], [0, 1, 2, 3])
+        self.assertEqual(sorted(streamed), [0, 1, 2, 3])
+        self.assertEqual(posted, ["山田", "失敗", "佐藤"])
+        self.assertEqual(self.browser_calls, [])
+
+    async def test_add_responses_rejects_entries_with_too_many_values(self):
+        posted = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("event_page.html"))
+            posted.append(dict(parse_qsl(request.content.decode(), keep_blank_values=True))["name"])
+            return httpx.Response(302, headers={"Location": "/s?h=abc"})
+
+        client = self.make_client(handler)
+        results = await client.add_responses("https://chouseisan.com/s?h=abc", [
+            {"name": "山田", "availability": [2, 2, 2, 2]},
+            {"name": "佐藤", "availability": [1, 1, 1]},
+            {"name": "鈴木", "availability": [0]},
+        ])
+        self.assertEqual([r["success"] for r in results], [False, True, True])
+        self.assertIn("候補日程の数 (3)", results[0]["error"])
+        # 1 件の不正なエントリで残りのエントリをブラウザに切り替えない
+        self.assertEqual(posted, ["佐藤", "鈴木"])
+        self.assertEqual(self.browser_calls, [])
+
+    async def test_add_responses_falls_back_for_whole_batch_without_form(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(200, text=load_fixture("event_page_no_dates.html"))
+            raise AssertionError("form must not be posted")
+
+        client = self.make_client(handler)
+        browser_batches = []
+
+        async def no_browser_read(event_url):
+            raise ScrapingError("browser is not available")
+
+        client._get_event_info_browser = no_browser_read
+
+        async def fake_browser_batch(event_url, items, report):
+            browser_batches.append([name for _, name, _, _ in items])
+            for index, name, _, _ in items:
+                await report(index, name)
+
+        client._add_responses_browser = fake_browser_batch
+        results = await client.add_responses(
+            "https://chouseisan.com/s?h=abc", [{"name": "山田", "availability": [2]}, {"name": "佐藤"}]
+        )
+        self.assertEqual([r["success"] for r in results], [True, True])
+        self.assertEqual(browser_batches, [["山田", "佐藤"]])
+
+if __name__ == "__main__":
+    unittest.main()
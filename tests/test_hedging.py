@@ -0,0 +1,144 @@
+import asyncio
+import unittest
+
+from chouseisan.client import ChouseisanClient
+from chouseisan.deadline import deadline_scope
+from chouseisan.errors import ChouseisanError, NotSubmittedError, ScrapingError
+from chouseisan.hedging import HedgePolicy
+
+class Attempts:
+    """呼び出しごとに指定した秒数だけ待ってから結果 (または例外) を返す試行"""
+
+    def __init__(self, *plans):
+        self.plans = list(plans)
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        delay, outcome = self.plans[self.started]
+        self.started += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+class TestHedge(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_first_attempt_is_hedged(self):
+        policy = HedgePolicy(initial_delay=0.05, min_delay=0.01)
+        attempt = Attempts((1.0, "first"), (0.01, "second"))
+        self.assertEqual(await policy.hedge("get_event_info", attempt), "second")
+        self.assertEqual(attempt.started, 2)
+        self.assertEqual(attempt.cancelled, 1)
+        stats = policy.stats()
+        self.assertEqual(stats["hedged"], {"get_event_info": 1})
+        self.assertEqual(stats["hedge_wins"], {"get_event_info": 1})
+
+    async def test_cancelled_and_failed_attempts_are_observed(self):
+        policy = HedgePolicy(initial_delay=0.05, min_delay=0.01)
+        await policy.hedge("get_event_info", Attempts((1.0, "first"), (0.01, "second")))
+        samples = sorted(policy._samples["get_event_info"])
+        # 取り消された 1 つ目の試行も、ヘッジまでの経過時間 (下限) として記録する
+        self.assertEqual(len(samples), 2)
+        self.assertGreaterEqual(samples[1], 0.05)
+
+        await policy.hedge("get_responses", Attempts((0.01, ScrapingError("timeout")), (0.01, "second")))
+        self.assertEqual(len(policy._samples["get_responses"]), 2)
+
+    async def test_fast_attempt_is_not_hedged(self):
+        policy = HedgePolicy(initial_delay=0.2)
+        attempt = Attempts((0.01, "first"))
+        self.assertEqual(await policy.hedge("get_event_info", attempt), "first")
+        self.assertEqual(attempt.started, 1)
+        self.assertEqual(policy.stats()["hedged"], {})
+
+    async def test_failed_attempt_is_retried_immediately(self):
+        policy = HedgePolicy(initial_delay=5.0)
+        attempt = Attempts((0.01, ScrapingError("timeout")), (0.01, "second"))
+        self.assertEqual(await asyncio.wait_for(policy.hedge("get_responses", attempt), 1.0), "second")
+        self.assertEqual(policy.stats()["read_retries"], {"get_responses": 1})
+
+    async def test_first_result_is_used_when_hedge_fails(self):
+        policy = HedgePolicy(initial_delay=0.02, min_delay=0.01)
+        attempt = Attempts((0.1, "first"), (0.01, ScrapingError("boom")))
+        self.assertEqual(await policy.hedge("get_responses", attempt), "first")
+
+    async def test_no_hedge_without_capacity_or_when_disabled(self):
+        policy = HedgePolicy(initial_delay=0.01, min_delay=0.01)
+        attempt = Attempts((0.05, "first"))
+        self.assertEqual(await policy.hedge("get_event_info", attempt, can_hedge=lambda: False), "first")
+        self.assertEqual(attempt.started, 1)
+
+        disabled = HedgePolicy(enabled=False, initial_delay=0.01, min_delay=0.01)
+        attempt = Attempts((0.05, ScrapingError("boom")))
+        with self.assertRaises(ScrapingError):
+            await disabled.hedge("get_event_info", attempt)
+        self.assertEqual(attempt.started, 1)
+
+    async def test_hedges_are_limited_by_ratio(self):
+        policy = HedgePolicy(initial_delay=0.01, min_delay=0.01, max_ratio=0.0)
+        for _ in range(3):
+            await policy.hedge("get_event_info", Attempts((0.03, "first"), (0.03, "second")))
+        self.assertEqual(policy.stats()["hedged"], {"get_event_info": 1})
+
+    def test_delay_follows_recent_quantile(self):
+        policy = HedgePolicy(initial_delay=2.0, min_samples=10, quantile=0.9, max_delay=5.0)
+        self.assertEqual(policy.delay("goto"), 2.0)
+        for i in range(1, 11):
+            policy.observe("goto", i / 10)
+        self.assertAlmostEqual(policy.delay("goto"), 1.0)
+        # 遅い試行が分位点に達すると、上限 (max_delay) で打ち切る
+        policy.observe("goto", 60.0)
+        policy.observe("goto", 60.0)
+        self.assertEqual(policy.delay("goto"), 5.0)
+
+class TestRetry(unittest.IsolatedAsyncioTestCase):
+    async def test_not_submitted_failures_are_retried(self):
+        policy = HedgePolicy(max_retries=1)
+        attempt = Attempts((0, NotSubmittedError("goto timeout")), (0, True))
+        self.assertTrue(await policy.retry("add_response", attempt))
+        self.assertEqual(policy.stats()["write_retries"], {"add_response": 1})
+        self.assertEqual(policy.stats()["write_retry_successes"], {"add_response": 1})
+
+        attempt = Attempts((0, NotSubmittedError("a")), (0, NotSubmittedError("b")), (0, True))
+        with self.assertRaises(NotSubmittedError):
+            await policy.retry("add_response", attempt)
+        self.assertEqual(attempt.started, 2)
+
+    async def test_other_failures_are_not_retried(self):
+        policy = HedgePolicy(max_retries=3)
+        attempt = Attempts((0, ChouseisanError("maybe submitted")), (0, True))
+        with self.assertRaises(ChouseisanError):
+            await policy.retry("create_event", attempt)
+        self.assertEqual(attempt.started, 1)
+
+    async def test_no_retry_after_deadline(self):
+        policy = HedgePolicy(max_retries=3)
+        attempt = Attempts((0.05, NotSubmittedError("late")), (0, True))
+        with deadline_scope(0.01):
+            with self.assertRaises(NotSubmittedError):
+                await policy.retry("create_event", attempt)
+        self.assertEqual(attempt.started, 1)
+
+class FailingPage:
+    async def goto(self, url, wait_until=None, timeout=None):
+        raise RuntimeError("net::ERR_TIMED_OUT")
+
+class TestClientRetries(unittest.IsolatedAsyncioTestCase):
+    async def test_navigation_failure_is_reported_as_not_submitted(self):
+        client = ChouseisanClient()
+        with self.assertRaises(NotSubmittedError):
+            await client._submit_response_on_page(FailingPage(), "https://chouseisan.com/s?h=x", "山田", "", [2])
+
+    async def test_add_response_retries_unsubmitted_attempt(self):
+        client = ChouseisanClient()
+        attempt = Attempts((0, NotSubmittedError("goto timeout")), (0, []))
+        client._add_response_once = lambda *args: attempt()
+        self.assertTrue(await client.add_response("https://chouseisan.com/s?h=x", "山田", "", [2]))
+        self.assertEqual(client.stats()["hedging"]["write_retries"], {"add_response": 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from benchmarks.standin import StandinServer
+from chouseisan.attendance import AttendanceMatrix
+from chouseisan.client import ChouseisanClient
+from chouseisan.errors import ChouseisanError
+from chouseisan.index import EventIndex
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestEventIndex(unittest.TestCase):
+    def test_list_and_search(self):
+        clock = FakeClock()
+        index = EventIndex(clock=clock)
+        index.record_created("https://chouseisan.com/s?h=a", "定例打ち合わせ", "memo", ["3/1(土) 19:00-", "3/2(日) 15:00-"])
+        clock.now += 100
+        index.record_info({"url": "https://chouseisan.com/s?h=b", "title": "送別会", "dates": ["3/10(月)", "3/1(土)*"]})
+        clock.now += 100
+        index.record_attendance(AttendanceMatrix.from_rows(
+            ["4/1"], [("山田", "", [2]), ("佐藤", "遅刻", [1])], title="定例打ち合わせ 2", url="https://Chouseisan.com/s?h=c#x"
+        ))
+
+        self.assertEqual([e["title"] for e in index.list_events()], ["定例打ち合わせ 2", "送別会", "定例打ち合わせ"])
+        created = index.list_events(created_only=True)
+        self.assertEqual([e["url"] for e in created], ["https://chouseisan.com/s?h=a"])
+        self.assertEqual(created[0]["dates"], ["3/1(土) 19:00-", "3/2(日) 15:00-"])
+        self.assertIsNone(created[0]["fetched_at"])
+        self.assertEqual([e["title"] for e in index.list_events(since=1050, until=1150)], ["送別会"])
+
+        self.assertEqual([e["title"] for e in index.search_events("打ち合わせ")], ["定例打ち合わせ 2", "定例打ち合わせ"])
+        self.assertEqual([e["title"] for e in index.search_events(date="3/1")], ["送別会", "定例打ち合わせ"])
+        # GLOB の特殊文字は文字どおりに扱う
+        self.assertEqual([e["title"] for e in index.search_events(date="3/1(土)*")], ["送別会"])
+        self.assertEqual([e["title"] for e in index.search_events("3/10")], ["送別会"])
+
+        entry = index.get("https://chouseisan.com/s?h=c")
+        self.assertEqual(entry["respondents"], 2)
+        self.assertEqual(entry["fetched_at"], 1200)
+        snapshot = index.responses("https://chouseisan.com/s?h=c")
+        self.assertEqual(snapshot["respondents"][1], {"name": "佐藤", "comment": "遅刻", "availability": [1]})
+
+    def test_created_event_keeps_creation_time_when_fetched_later(self):
+        clock = FakeClock()
+        index = EventIndex(clock=clock)
+        index.record_created("https://chouseisan.com/s?h=a", "会議", dates=["3/1"])
+        clock.now += 500
+        index.record_info({"url": "https://chouseisan.com/s?h=a", "title": "会議 (変更)", "dates": ["3/1", "3/2"]})
+        [entry] = index.list_events()
+        self.assertTrue(entry["created"])
+        self.assertEqual(entry["added_at"], 1000)
+        self.assertEqual(entry["fetched_at"], 1500)
+        self.assertEqual(entry["title"], "会議 (変更)")
+        self.assertEqual(entry["dates"], ["3/1", "3/2"])
+
+    def test_prune_least_recently_updated(self):
+        clock = FakeClock()
+        index = EventIndex(max_events=2, clock=clock)
+        for key in "abc":
+            clock.now += 1
+            index.record_info({"url": f"https://chouseisan.com/s?h={key}", "title": key, "dates": [key]})
+        self.assertEqual([e["title"] for e in index.list_events()], ["c", "b"])
+        self.assertEqual(index.stats()["pruned"], 1)
+        self.assertEqual(index.search_events(date="a"), [])
+
+    def test_persists_to_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index", "events.db")
+            index = EventIndex(path)
+            index.record_created("https://chouseisan.com/s?h=a", "会議", dates=["3/1"])
+            index.close()
+            reopened = EventIndex(path)
+            self.assertEqual([e["title"] for e in reopened.list_events()], ["会議"])
+            reopened.close()
+
+class TestClientIndex(unittest.IsolatedAsyncioTestCase):
+    async def test_created_and_read_events_are_listed(self):
+        with StandinServer() as server:
+            seeded = server.seed_event(3, 2, title="既存イベント")
+            client = ChouseisanClient(
+                base_url=server.base_url, read_mode="http", write_mode="http", cache_ttl=0, event_index=True
+            )
+            try:
+                created = await client.create_event("送別会", "駅前集合", "3/1(土) 19:00-\n\n3/2(日) 15:00-")
+                await client.get_responses(seeded)
+
+                listed = await client.list_events()
+                self.assertEqual([e["url"] for e in listed], [seeded, created])
+                self.assertEqual(listed[0]["respondents"], 2)
+                self.assertEqual(listed[1]["dates"], ["3/1(土) 19:00-", "3/2(日) 15:00-"])
+                found = await client.search_events(date="3/2")
+                self.assertEqual([e["title"] for e in found], ["送別会"])
+
+                # 未取得の作成済みイベントだけを取得し直す
+                refreshed = await client.list_events(created_only=True, max_age=3600)
+                self.assertIsNotNone(refreshed[0]["fetched_at"])
+                self.assertIn(
+                    'chouseisan_call_duration_seconds_count{tool="get_event_info",outcome="success"} 1',
+                    client.metrics.render()
+                )
+                self.assertEqual(len(refreshed), 1)
+            finally:
+                await client.close()
+
+    async def test_index_is_accessed_off_the_event_loop(self):
+        with StandinServer() as server:
+            url = server.seed_event(2, 1)
+            client = ChouseisanClient(base_url=server.base_url, read_mode="http", cache_ttl=0, event_index=True)
+            threads = []
+            for name in ("record_info", "search_events"):
+                method = getattr(client.index, name)
+
+                def traced(*args, _method=method, **kwargs):
+                    threads.append(threading.get_ident())
+                    return _method(*args, **kwargs)
+
+                setattr(client.index, name, traced)
+            try:
+                await client.get_event_info(url)
+                self.assertEqual(len(await client.search_events("ベンチ")), 1)
+            finally:
+                await client.close()
+            self.assertEqual(len(threads), 2)
+            self.assertNotIn(threading.get_ident(), threads)
+
+    def test_unused_title_index_is_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.db")
+            conn = sqlite3.connect(path)
+            conn.executescript(
+                "CREATE TABLE events (key TEXT PRIMARY KEY, url TEXT NOT NULL, title TEXT NOT NULL DEFAULT '', "
+                "memo TEXT NOT NULL DEFAULT '', created INTEGER NOT NULL DEFAULT 0, added_at REAL NOT NULL, "
+                "updated_at REAL NOT NULL, fetched_at REAL, respondents INTEGER, responses TEXT, responses_at REAL);"
+                "CREATE INDEX events_title ON events(title);"
+            )
+            conn.close()
+            index = EventIndex(path)
+            try:
+                names = {row[0] for row in index._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            finally:
+                index.close()
+            self.assertNotIn("events_title", names)
+
+    async def test_disabled_index(self):
+        client = ChouseisanClient(event_index=False)
+        with self.assertRaises(ChouseisanError):
+            await client.list_events()
+        self.assertIsNone(client.stats()["index"])
+
+if __name__ == "__main__":
+    unittest.main()
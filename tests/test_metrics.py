@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+
+from chouseisan.metrics import ClientMetrics, Histogram, phase
+
+class TestHistogram(unittest.TestCase):
+    def test_render_cumulative_buckets(self):
+        hist = Histogram("op_seconds", "Operation duration.", ("tool",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            hist.observe(value, "get_event_info")
+        self.assertEqual(hist.render(), [
+            "# HELP op_seconds Operation duration.",
+            "# TYPE op_seconds histogram",
+            'op_seconds_bucket{tool="get_event_info",le="0.1"} 1',
+            'op_seconds_bucket{tool="get_event_info",le="1"} 3',
+            'op_seconds_bucket{tool="get_event_info",le="+Inf"} 4',
+            'op_seconds_sum{tool="get_event_info"} 4.05',
+            'op_seconds_count{tool="get_event_info"} 4',
+        ])
+
+class TestClientMetrics(unittest.IsolatedAsyncioTestCase):
+    async def test_phases_are_attributed_to_current_call(self):
+        metrics = ClientMetrics()
+        with phase("ignored"):
+            pass
+        with metrics.call("add_response") as record:
+            with phase("goto"):
+                await asyncio.sleep(0)
+            with self.assertRaises(ValueError):
+                with phase("submit"):
+                    raise ValueError("boom")
+        self.assertEqual([(name, outcome) for name, _, outcome in record.phases],
+                         [("goto", "success"), ("submit", "ValueError")])
+
+        text = metrics.render()
+        self.assertIn('chouseisan_call_duration_seconds_count{tool="add_response",outcome="success"} 1', text)
+        self.assertIn(
+            'chouseisan_phase_duration_seconds_count{tool="add_response",phase="submit",outcome="ValueError"} 1', text
+        )
+        self.assertNotIn("ignored", text)
+
+    async def test_slow_call_log(self):
+        metrics = ClientMetrics(slow_call_threshold=0.01)
+        with self.assertLogs("chouseisan.metrics", level="WARNING") as logs:
+            with self.assertRaises(RuntimeError):
+                with metrics.call("create_event"):
+                    with phase("wait_result"):
+                        await asyncio.sleep(0.02)
+                    raise RuntimeError("timeout")
+        self.assertIn("create_event", logs.output[0])
+        self.assertIn("wait_result=", logs.output[0])
+        self.assertIn("RuntimeError", logs.output[0])
+        self.assertIn('chouseisan_slow_calls_total{tool="create_event"} 1', metrics.render())
+
+    async def test_render_merges_worker_phases(self):
+        parent, worker = ClientMetrics(), ClientMetrics()
+        for metrics in (parent, worker):
+            with metrics.call("get_responses"):
+                with phase("parse"):
+                    pass
+        snapshot = worker.snapshot()
+        text = parent.render(snapshots=[snapshot, snapshot])
+        self.assertIn('chouseisan_phase_duration_seconds_count{tool="get_responses",phase="parse",outcome="success"} 3', text)
+        # 操作全体は呼び出し元で計測したものだけを数える
+        self.assertIn('chouseisan_call_duration_seconds_count{tool="get_responses",outcome="success"} 1', text)
+        # 出力のための合算で元の計測値は変わらない
+        self.assertIn(
+            'chouseisan_phase_duration_seconds_count{tool="get_responses",phase="parse",outcome="success"} 1',
+            parent.render()
+        )
+
+    def test_render_stats(self):
+        text = ClientMetrics().render({
+            "scheduler": {"running": 1, "admitted": {"add_response": 3}},
+            "resources": {"blocked": {"get_event_info": {"image": 4}}},
+            "cache": None,
+        })
+        self.assertIn("chouseisan_scheduler_running 1", text)
+        self.assertIn('chouseisan_scheduler_admitted{operation="add_response"} 3', text)
+        self.assertIn('chouseisan_resources_blocked{operation="get_event_info",type="image"} 4', text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import unittest
+
+import httpx
+
+from chouseisan.client import ChouseisanClient
+from chouseisan.parser import extract_event_info, parse_html
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+class TestParseHtml(unittest.TestCase):
+    def test_implied_end_tags(self):
+        doc = parse_html("<table><tr><td>a<td>b<tr><td>c</table>")
+        rows = doc.find_all("tr")
+        self.assertEqual(len(rows), 2)
+        self.assertEqual([td.text() for td in rows[0].elements], ["a", "b"])
+        self.assertEqual([td.text() for td in rows[1].elements], ["c"])
+
+    def test_text_normalizes_whitespace_and_entities(self):
+        doc = parse_html("<div class='event-name'>\n  忘年会 &amp;\n 打ち上げ <script>x()</script></div>")
+        self.assertEqual(doc.find(cls="event-name").text(), "忘年会 & 打ち上げ")
+
+class TestExtractEventInfo(unittest.TestCase):
+    def test_nittei_table(self):
+        info = extract_event_info(parse_html(load_fixture("event_page.html")))
+        self.assertEqual(info["title"], "プロジェクト打ち合わせ")
+        self.assertEqual(info["dates"], ["3/1(土) 19:00-", "3/2(日) 15:00-", "3/3(月) 20:00-"])
+
+    def test_attendance_table_fallback(self):
+        info = extract_event_info(parse_html(load_fixture("event_page_attendance_only.html")))
+        self.assertEqual(info["title"], "忘年会 & 打ち上げ")
+        self.assertEqual(info["dates"], ["12/20(金)", "12/21(土)"])
+
+    def test_no_dates(self):
+        info = extract_event_info(parse_html(load_fixture("event_page_no_dates.html")))
+        self.assertEqual(info["dates"], [])
+
+class TestHttpReadMode(unittest.IsolatedAsyncioTestCase):
+    def make_client(self, fixture: str) -> ChouseisanClient:
+        client = ChouseisanClient(read_mode="http")
+        body = load_fixture(fixture)
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+        client._http._client = httpx.AsyncClient(transport=transport)
+        self.browser_calls = []
+
+        async def fake_browser(event_url):
+            self.browser_calls.append(event_url)
+            return {"title": "browser", "dates": ["fallback"], "url": event_url}
+
+        client._get_event_info_browser = fake_browser
+        self.addAsyncCleanup(client.close)
+        return client
+
+    async def test_fast_path(self):
+        client = self.make_client("event_page.html")
+        info = await client.get_event_info("https://chouseisan.com/s?h=abc")
+        self.assertEqual(info["title"], "プロジェクト打ち合わせ")
+        self.assertEqual(len(info["dates"]), 3)
+        self.assertEqual(info["url"], "https://chouseisan.com/s?h=abc")
+        self.assertEqual(self.browser_calls, [])
+
+    async def test_falls_back_to_browser_without_dates(self):
+        client = self.make_client("event_page_no_dates.html")
+        info = await client.get_event_info("https://chouseisan.com/s?h=abc")
+        self.assertEqual(info["dates"], ["fallback"])
+        self.assertEqual(self.browser_calls, ["https://chouseisan.com/s?h=abc"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from chouseisan.profile import AssetCache, StorageState
+
+class FakeRequest:
+    def __init__(self, url, resource_type="script", method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+class FakeResponse:
+    def __init__(self, status=200, headers=None, body=b"x"):
+        self.status = status
+        self.headers = headers or {"content-type": "text/javascript"}
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+class FakeRoute:
+    def __init__(self, request, response=None):
+        self.request = request
+        self._response = response or FakeResponse()
+        self.fetches = 0
+        self.outcome = None
+
+    async def fetch(self):
+        self.fetches += 1
+        return self._response
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def fulfill(self, status=None, headers=None, body=None, response=None):
+        self.outcome = ("fulfill", status if response is None else response.status, body)
+
+class FakeContext:
+    def __init__(self, cookies=None):
+        self._cookies = list(cookies or [])
+
+    async def add_cookies(self, cookies):
+        self._cookies.extend(cookies)
+
+    async def cookies(self):
+        return list(self._cookies)
+
+class TestAssetCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_second_request_is_served_from_disk_after_restart(self):
+        url = "https://chouseisan.com/app.js"
+        cache = AssetCache(self.directory)
+        first = FakeRoute(FakeRequest(url), FakeResponse(body=b"console.log(1)"))
+        await cache.handle_route(first)
+        self.assertEqual(first.fetches, 1)
+        self.assertEqual(first.outcome, ("fulfill", 200, b"console.log(1)"))
+
+        # 新しいプロセスを想定し、ディスクの内容だけから応答する
+        restarted = AssetCache(self.directory)
+        second = FakeRoute(FakeRequest(url))
+        await restarted.handle_route(second)
+        self.assertEqual(second.fetches, 0)
+        self.assertEqual(second.outcome, ("fulfill", 200, b"console.log(1)"))
+        self.assertEqual(restarted.stats()["hits"], 1)
+        self.assertEqual(restarted.stats()["entries"], 1)
+
+    async def test_uncacheable_requests_are_passed_through(self):
+        cache = AssetCache(self.directory)
+        document = FakeRoute(FakeRequest("https://chouseisan.com/s?h=x", resource_type="document"))
+        await cache.handle_route(document)
+        self.assertEqual(document.outcome, "fallback")
+        post = FakeRoute(FakeRequest("https://chouseisan.com/app.js", method="POST"))
+        await cache.handle_route(post)
+        self.assertEqual(post.outcome, "fallback")
+
+        for headers in (
+            {"cache-control": "no-store"},
+            {"cache-control": "private, max-age=600"},
+            {"set-cookie": "session=1"},
+        ):
+            route = FakeRoute(FakeRequest("https://chouseisan.com/user.js"), FakeResponse(headers=headers))
+            await cache.handle_route(route)
+            self.assertEqual(route.outcome[0], "fulfill")
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    async def test_expired_entry_is_refetched(self):
+        url = "https://chouseisan.com/app.css"
+        cache = AssetCache(self.directory)
+        cache.store(url, 200, {"cache-control": "max-age=1"}, b"a{}")
+        self.assertIsNotNone(cache.load(url))
+        meta_path = cache._paths(cache._key(url))[1]
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta["expires_at"] = time.time() - 1
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+        route = FakeRoute(FakeRequest(url, resource_type="stylesheet"))
+        await cache.handle_route(route)
+        self.assertEqual(route.fetches, 1)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = AssetCache(self.directory, max_bytes=40)
+        cache.store("https://chouseisan.com/a.js", 200, {}, b"a" * 10)
+        cache.store("https://chouseisan.com/b.js", 200, {}, b"b" * 10)
+        cache.store("https://chouseisan.com/c.js", 200, {}, b"c" * 10)
+        cache.load("https://chouseisan.com/a.js")
+        cache.store("https://chouseisan.com/d.js", 200, {}, b"d" * 10)
+        cache.store("https://chouseisan.com/e.js", 200, {}, b"e" * 10)
+        self.assertIsNone(cache.load("https://chouseisan.com/b.js"))
+        self.assertIsNotNone(cache.load("https://chouseisan.com/a.js"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["size_bytes"], 40)
+        self.assertEqual(len([n for n in os.listdir(self.directory) if n.endswith(".body")]), 4)
+
+class TestStorageState(unittest.IsolatedAsyncioTestCase):
+    async def test_cookies_are_shared_between_read_operations_only(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "storage_state.json")
+            state = StorageState(path, hosts=["chouseisan.com"])
+            self.assertTrue(state.shares("get_event_info"))
+            self.assertFalse(state.shares("add_response"))
+            self.assertFalse(state.shares("create_event"))
+
+            await state.capture(FakeContext([
+                {"name": "consent", "value": "1", "domain": ".chouseisan.com", "path": "/", "expires": -1},
+                {"name": "ad", "value": "x", "domain": ".ads.example", "path": "/", "expires": -1},
+            ]))
+            with open(path) as f:
+                self.assertEqual([c["name"] for c in json.load(f)["cookies"]], ["consent"])
+
+            restored = StorageState(path, hosts=["chouseisan.com"])
+            context = FakeContext()
+            await restored.apply(context)
+            self.assertEqual([c["name"] for c in await context.cookies()], ["consent"])
+
+    async def test_expired_cookies_are_not_applied(self):
+        with tempfile.TemporaryDirectory() as directory:
+            state = StorageState(os.path.join(directory, "storage_state.json"))
+            await state.capture(FakeContext([
+                {"name": "old", "value": "1", "domain": "chouseisan.com", "path": "/", "expires": time.time() - 10},
+            ]))
+            context = FakeContext()
+            await state.apply(context)
+            self.assertEqual(await context.cookies(), [])
+
+if __name__ == "__main__":
+    unittest.main()
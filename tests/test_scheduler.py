@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+
+from chouseisan.errors import OverloadedError
+from chouseisan.scheduler import OperationScheduler
+
+class TestOperationScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_limits_concurrency(self):
+        scheduler = OperationScheduler(max_concurrency=2, max_queue=10, max_wait=5)
+        peak = 0
+
+        async def job():
+            nonlocal peak
+            async with scheduler.admit("op"):
+                peak = max(peak, scheduler.running)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(job() for _ in range(6)))
+        self.assertEqual(peak, 2)
+        self.assertEqual(scheduler.stats()["admitted"], {"op": 6})
+        self.assertEqual(scheduler.stats()["waiting"], 0)
+
+    async def test_rejects_when_queue_is_full(self):
+        scheduler = OperationScheduler(max_concurrency=1, max_queue=1, max_wait=5)
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.admit("op"):
+                await release.wait()
+
+        tasks = [asyncio.ensure_future(holder()), asyncio.ensure_future(holder())]
+        await asyncio.sleep(0)
+        self.assertEqual(scheduler.waiting, 1)
+        with self.assertRaises(OverloadedError):
+            async with scheduler.admit("op"):
+                pass
+        release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(scheduler.stats()["rejected"], {"op": 1})
+
+    async def test_max_wait(self):
+        scheduler = OperationScheduler(max_concurrency=1, max_queue=10, max_wait=0.01)
+        async with scheduler.admit("op"):
+            with self.assertRaises(OverloadedError):
+                async with scheduler.admit("op"):
+                    pass
+        self.assertEqual(scheduler.stats()["timed_out"], {"op": 1})
+        # 期限切れ後も枠が失われていないこと
+        async with scheduler.admit("op"):
+            self.assertEqual(scheduler.running, 1)
+
+    async def test_exclusive_serializes_same_key(self):
+        scheduler = OperationScheduler(max_concurrency=4, max_queue=10, max_wait=5)
+        active = {"a": 0, "b": 0}
+        overlap = {"a": 0, "b": 0}
+
+        async def write(key):
+            async with scheduler.exclusive(key, "write"):
+                active[key] += 1
+                overlap[key] = max(overlap[key], active[key])
+                await asyncio.sleep(0.005)
+                active[key] -= 1
+
+        await asyncio.gather(*(write(k) for k in ("a", "b", "a", "b", "a")))
+        self.assertEqual(overlap, {"a": 1, "b": 1})
+        self.assertEqual(scheduler.stats()["locked_keys"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
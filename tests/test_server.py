@@ -0,0 +1,34 @@
+import importlib
+import os
+import unittest
+from unittest import mock
+
+from benchmarks.standin import StandinServer
+from chouseisan.client import ResponseResult
+
+class TestServerModule(unittest.IsolatedAsyncioTestCase):
+    async def test_tools_work_when_imported(self):
+        # mcp dev / mcp run と同じく、__main__ 以外として読み込んだ場合もツールを実行できる
+        with StandinServer() as server:
+            url = server.seed_event(2, 1)
+            env = {"CHOUSEISAN_BASE_URL": server.base_url, "READ_MODE": "http", "WORKERS": "0"}
+            with mock.patch.dict(os.environ, env):
+                main = importlib.reload(importlib.import_module("main"))
+            try:
+                text = await main.get_event_info(url)
+                self.assertIn("■ 候補日程:", text)
+                self.assertNotIn("エラー", text)
+            finally:
+                await main.client.close()
+
+    async def test_add_response_reports_skipped_dates(self):
+        main = importlib.import_module("main")
+        fake = mock.Mock()
+        fake.add_response = mock.AsyncMock(return_value=ResponseResult(True, ["3/2 の入力欄が見つかりませんでした。"]))
+        with mock.patch.object(main, "client", fake):
+            text = await main.add_response("https://chouseisan.com/s?h=abc", "山田", availability=[2, 2])
+        self.assertIn("正常に登録しました", text)
+        self.assertIn("■ 入力できなかった日程:\n  - 3/2 の入力欄が見つかりませんでした。", text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import time
+import unittest
+
+from benchmarks.standin import StandinServer
+from chouseisan.client import ChouseisanClient
+from chouseisan.startup import StartupTimer, process_age
+
+class TestStartupTimer(unittest.TestCase):
+    def test_phases(self):
+        timer = StartupTimer(interpreter=0.5)
+        time.sleep(0.01)
+        self.assertGreaterEqual(timer.mark("imports"), 0.01)
+        with timer.phase("prewarm"):
+            time.sleep(0.01)
+        timer.mark("ready")
+
+        names = [name for name, _ in timer.phases]
+        self.assertEqual(names, ["interpreter", "imports", "prewarm", "ready"])
+        stats = timer.stats()
+        self.assertGreaterEqual(stats["prewarm_seconds"], 0.01)
+        # バックグラウンドのフェーズは起動までの合計に含めない
+        self.assertAlmostEqual(
+            stats["total_seconds"], 0.5 + stats["imports_seconds"] + stats["ready_seconds"], places=5
+        )
+        self.assertIn("imports=", timer.report())
+
+    def test_process_age(self):
+        age = process_age()
+        if age is not None:
+            self.assertGreaterEqual(age, 0.0)
+
+class TestPrewarm(unittest.IsolatedAsyncioTestCase):
+    async def test_http_prewarm(self):
+        with StandinServer() as server:
+            client = ChouseisanClient(base_url=server.base_url, read_mode="http")
+            try:
+                await client.prewarm(browser=False)
+            finally:
+                await client.close()
+        metrics = client.metrics.render()
+        self.assertIn('chouseisan_phase_duration_seconds_count{tool="prewarm",phase="http_connect",outcome="success"} 1', metrics)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+from benchmarks.standin import StandinServer
+from chouseisan.attendance import AttendanceMatrix
+from chouseisan.client import ChouseisanClient
+from chouseisan.watch import EventFingerprint, EventWatcher, WatchSubscriptions
+
+DATES = ["3/1(土)", "3/2(日)"]
+
+def matrix(rows, dates=DATES):
+    return AttendanceMatrix.from_rows(dates, rows, title="飲み会", url="https://chouseisan.com/s?h=abc")
+
+class TestEventWatcher(unittest.TestCase):
+    def setUp(self):
+        self.watcher = EventWatcher(max_events=2, history=2)
+        self.base = matrix([("山田", "", [2, 0]), ("佐藤", "遅れます", [1, 2])])
+
+    def test_initial_and_unchanged(self):
+        first = self.watcher.observe("a", self.base)
+        self.assertTrue(first["reset"])
+        self.assertEqual([r["name"] for r in first["respondents_added"]], ["山田", "佐藤"])
+
+        again = self.watcher.observe("a", self.base, first["cursor"])
+        self.assertFalse(again["changed"])
+        self.assertEqual(again["cursor"], first["cursor"])
+        self.assertEqual(again["respondents_added"], [])
+
+    def test_delta(self):
+        cursor = self.watcher.observe("a", self.base)["cursor"]
+        updated = matrix(
+            [("佐藤", "遅れます", [1, 2, 3]), ("山田", "", [2, 2, 3]), ("鈴木", "", [0, 0, 2])],
+            dates=DATES + ["3/3(月)"]
+        )
+        delta = self.watcher.observe("a", updated, cursor)
+        self.assertTrue(delta["changed"])
+        self.assertFalse(delta["reset"])
+        self.assertEqual(delta["dates_added"], ["3/3(月)"])
+        self.assertEqual(delta["dates_removed"], [])
+        self.assertEqual(delta["respondents_added"], [{"name": "鈴木", "comment": "", "availability": [0, 0, 2]}])
+        # 佐藤さんは日程の追加だけなので変更扱いにならない
+        self.assertEqual([r["name"] for r in delta["respondents_changed"]], ["山田"])
+
+        removed = self.watcher.observe("a", matrix([("山田", "", [2, 2])]), delta["cursor"])
+        self.assertEqual(removed["dates_removed"], ["3/3(月)"])
+        self.assertEqual(sorted(removed["respondents_removed"]), ["佐藤", "鈴木"])
+
+    def test_unknown_cursor_and_eviction(self):
+        cursor = self.watcher.observe("a", self.base)["cursor"]
+        self.watcher.observe("b", self.base)
+        self.watcher.observe("c", self.base)
+        self.assertTrue(self.watcher.observe("a", matrix([("山田", "", [2, 2])]), cursor)["reset"])
+        self.assertTrue(self.watcher.observe("a", self.base, "unknown")["reset"])
+        self.assertEqual(self.watcher.stats()["events"], 2)
+
+    def test_fingerprint_ignores_row_order(self):
+        swapped = matrix([("佐藤", "遅れます", [1, 2]), ("山田", "", [2, 0])])
+        self.assertEqual(EventFingerprint.from_matrix(self.base).cursor, EventFingerprint.from_matrix(swapped).cursor)
+
+class FakeSession:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.updated = []
+
+    async def send_resource_updated(self, uri):
+        if self.fail:
+            raise ConnectionError("closed")
+        self.updated.append(uri)
+
+class TestWatchSubscriptions(unittest.IsolatedAsyncioTestCase):
+    async def test_notifies_changed_resources(self):
+        state = {"changed": False}
+
+        async def watch(event_url, cursor):
+            return {"cursor": "c1", "changed": cursor is None or state["changed"]}
+
+        subscriptions = WatchSubscriptions(watch)
+        session, closed = FakeSession(), FakeSession(fail=True)
+        subscriptions.subscribe("chouseisan://events/a", "https://chouseisan.com/s?h=a", session)
+        subscriptions.subscribe("chouseisan://events/a", "https://chouseisan.com/s?h=a", closed)
+
+        self.assertEqual(await subscriptions.poll_once(), 0)
+        self.assertEqual(await subscriptions.poll_once(), 0)
+        state["changed"] = True
+        self.assertEqual(await subscriptions.poll_once(), 1)
+        self.assertEqual(session.updated, ["chouseisan://events/a"])
+
+        subscriptions.unsubscribe("chouseisan://events/a", session)
+        self.assertEqual(len(subscriptions), 0)
+
+class TestClientWatchEvent(unittest.IsolatedAsyncioTestCase):
+    async def test_watch_event(self):
+        with StandinServer() as server:
+            url = server.seed_event(3, 2)
+            client = ChouseisanClient(base_url=server.base_url, read_mode="http", write_mode="http")
+            try:
+                first = await client.watch_event(url)
+                self.assertTrue(first["reset"])
+                self.assertEqual(len(first["respondents_added"]), 2)
+
+                unchanged = await client.watch_event(url, cursor=first["cursor"])
+                self.assertFalse(unchanged["changed"])
+
+                await client.add_response(url, "新人", "", [2, 2, 0])
+                delta = await client.watch_event(url, cursor=first["cursor"])
+                self.assertEqual([r["name"] for r in delta["respondents_added"]], ["新人"])
+                self.assertEqual(delta["respondents_changed"], [])
+            finally:
+                await client.close()
+            self.assertEqual(client.stats()["watch"]["unchanged"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
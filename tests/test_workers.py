@@ -0,0 +1,118 @@
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+from benchmarks.standin import StandinServer
+from chouseisan.client import ChouseisanClient
+from chouseisan.errors import ChouseisanError, ScrapingError
+from chouseisan.workers import WorkerClient, WorkerPool, _decode_error, _encode_error
+
+class TestErrorEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        error = _decode_error(*_encode_error(ScrapingError("出欠表が見つかりませんでした。")))
+        self.assertIsInstance(error, ScrapingError)
+        self.assertEqual(str(error), "出欠表が見つかりませんでした。")
+        self.assertIs(type(_decode_error(*_encode_error(KeyError("x")))), ChouseisanError)
+        self.assertIs(type(_decode_error("ValueError", "x")), ChouseisanError)
+
+class TestWorkerClient(unittest.IsolatedAsyncioTestCase):
+    async def test_calls_run_in_workers(self):
+        with StandinServer() as server:
+            url = server.seed_event(3, 2)
+            client = WorkerClient(2, base_url=server.base_url, read_mode="http", write_mode="http")
+            try:
+                info = await client.get_event_info(url)
+                self.assertEqual(len(info["dates"]), 3)
+
+                self.assertTrue(await client.add_response(url, "新人", "", [2, 1, 0]))
+                matrix = await client.get_responses(url)
+                self.assertEqual(matrix.shape, (3, 3))
+                self.assertEqual(matrix.row(2), [2, 1, 0])
+
+                with self.assertRaises(ChouseisanError) as cm:
+                    await client.get_responses("not-a-url")
+                self.assertIn("無効なURL", str(cm.exception))
+
+                streamed = []
+
+                async def on_result(result):
+                    streamed.append(result["index"])
+
+                results = await client.add_responses(
+                    url, [{"name": "A", "availability": [2, 2, 2]}, {"name": ""}], on_result=on_result
+                )
+                self.assertEqual(sorted(streamed), [0, 1])
+                self.assertEqual([r["success"] for r in results], [True, False])
+
+                batch = await client.get_events_info([url, "not-a-url"])
+                self.assertEqual(sorted(r["success"] for r in batch), [False, True])
+
+                # イベントの記録は親プロセスで行う
+                [entry] = await client.list_events()
+                self.assertEqual((entry["url"], entry["respondents"]), (url, 3))
+                self.assertIsNone((await client.pool.ping())[0]["stats"]["index"])
+
+                pids = {reply["pid"] for reply in await client.pool.ping()}
+                self.assertEqual(len(pids), 2)
+                # ワーカーで計測したフェーズと統計も親プロセスの /metrics に含める
+                metrics = await client.render_metrics({"startup": {"total_seconds": 1.5}})
+                self.assertIn('chouseisan_call_duration_seconds_count{tool="get_responses",outcome="success"} 1', metrics)
+                self.assertIn('chouseisan_phase_duration_seconds_count{tool="get_responses",phase="parse",outcome="success"} 1',
+                              metrics)
+                self.assertIn("chouseisan_cache_", metrics)
+                self.assertIn("chouseisan_workers_alive 2", metrics)
+                self.assertIn("chouseisan_startup_total_seconds 1.5", metrics)
+            finally:
+                await client.close()
+
+    async def test_index_records_only_what_workers_fetched(self):
+        with StandinServer() as server:
+            url = server.seed_event(2, 3)
+            client = WorkerClient(1, base_url=server.base_url, read_mode="http", write_mode="http")
+            recorded = []
+            record_info = client.index.record_info
+            client.index.record_info = lambda info: (recorded.append(info["url"]), record_info(info))
+            try:
+                await client.get_event_info(url)
+                # ワーカーのキャッシュから返した結果は記録し直さない
+                await client.get_event_info(url)
+                self.assertEqual(recorded, [url])
+
+                delta = await client.watch_event(url)
+                self.assertEqual(len(delta["respondents_added"]), 3)
+                snapshot = client.index.responses(url)
+                self.assertEqual(len(snapshot["respondents"]), 3)
+                self.assertEqual(client.index.get(url)["respondents"], 3)
+            finally:
+                await client.close()
+
+    def test_browser_memory_limit_is_split_across_workers(self):
+        with mock.patch.dict(os.environ, {"BROWSER_MEMORY_LIMIT_MB": "1200"}):
+            client = WorkerClient(3)
+        limits = {w.options["browser_memory_limit"] for w in client.pool._workers}
+        self.assertEqual(limits, {400 * 2**20})
+        # ワーカー内の ChouseisanClient は渡された値をそのまま使う
+        worker_client = ChouseisanClient(**client.pool._workers[0].options)
+        self.assertEqual(worker_client._pool.memory_limit, 400 * 2**20)
+
+class TestWorkerPool(unittest.IsolatedAsyncioTestCase):
+    async def test_restart_after_crash(self):
+        pool = WorkerPool(1, restart_delay=0.05, health_interval=0)
+        try:
+            first = (await pool.ping())[0]["pid"]
+            worker = pool._workers[0]
+            worker.kill()
+            await asyncio.wait_for(worker.process.wait(), 5)
+            # 再起動を待ってから呼び出しを書き込む (終了したプロセスには書き込まない)
+            second = (await pool.ping())[0]["pid"]
+            self.assertNotEqual(first, second)
+            self.assertEqual(pool.stats()["restarts"], {"0": 1})
+            with self.assertRaises(ChouseisanError):
+                await pool.call("close", {})
+        finally:
+            await pool.close()
+        self.assertEqual(pool.stats()["alive"], 0)
+
+if __name__ == "__main__":
+    unittest.main()